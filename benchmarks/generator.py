@@ -0,0 +1,156 @@
+import random
+
+from faker import Faker
+
+from mmlib.constants import GameResult
+from mmlib.handicap import calculate_handicap
+from mmlib.models import Game, Parameters, Player, Tournament
+
+PARAMETERS = Parameters(hd_bar=-20, hd_adj=-1, hd_max=9)
+
+# 30 kyu is -29, 1 kyu is 0, 1 dan is 1
+MIN_RANK = -29
+MAX_RANK = 8
+MEAN_RANK = -8
+RANK_DEVIATION = 7
+
+# McMahon bar and floor
+BAR = 3
+FLOOR = -20
+
+ABSENCE_PROBABILITY = 0.02
+DRAW_PROBABILITY = 0.01
+
+BYE_ID = "bye"
+
+
+def make_tournament(
+    n_players: int,
+    n_rounds: int,
+    seed: int = 0,
+    parameters: Parameters = PARAMETERS,
+) -> Tournament:
+    """
+    Synthetic tournament with a realistic field.
+
+    Ranks follow a normal distribution centred on single-digit kyu players
+    and starting scores are cut at a McMahon bar and floor. In every round
+    a few players are absent, and a bye is added when an odd number of
+    players is present. Players with similar scores meet, handicaps follow
+    `parameters` and the stronger player is more likely to win.
+    """
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+
+    players = [
+        _make_player(fake.unique.user_name(), rng) for _ in range(n_players)
+    ]
+    bye = Player(player_id=BYE_ID, rank=MIN_RANK, is_bye=True)
+    points = {player.player_id: 0.0 for player in players + [bye]}
+
+    games = []
+    for _ in range(n_rounds):
+        present = [
+            player for player in players if rng.random() >= ABSENCE_PROBABILITY
+        ]
+        if len(present) % 2:
+            present.append(bye)
+
+        # players with similar scores meet, with some noise
+        present.sort(
+            key=lambda p: p.smms + points[p.player_id] + rng.random() * 2,
+            reverse=True,
+        )
+
+        round_games = []
+        for black, white in zip(present[::2], present[1::2]):
+            game = _make_game(black, white, rng, parameters)
+            points[black.player_id] += _points(game, black)
+            points[white.player_id] += _points(game, white)
+            round_games.append(game)
+        games.append(round_games)
+
+    return Tournament(
+        players=players + [bye], games=games, parameters=parameters
+    )
+
+
+def present_players(tournament: Tournament) -> list[str]:
+    """Players to pair in the next round, with the bye if they are odd."""
+    player_ids = [
+        player.player_id for player in tournament.players if not player.is_bye
+    ]
+    if len(player_ids) % 2:
+        player_ids.append(BYE_ID)
+    return player_ids
+
+
+def _make_player(player_id: str, rng: random.Random) -> Player:
+    rank = round(rng.gauss(MEAN_RANK, RANK_DEVIATION))
+    rank = min(max(rank, MIN_RANK), MAX_RANK)
+    return Player(
+        player_id=player_id,
+        rank=rank,
+        smms=min(max(rank, FLOOR), BAR) - FLOOR,
+    )
+
+
+def _make_game(
+    p1: Player,
+    p2: Player,
+    rng: random.Random,
+    parameters: Parameters,
+) -> Game:
+    if p1.is_bye or p2.is_bye:
+        return Game(black_id=p1.player_id, white_id=p2.player_id)
+
+    if p1.rank > p2.rank:
+        p1, p2 = p2, p1
+    handicap = calculate_handicap(
+        r1=p1.rank,
+        r2=p2.rank,
+        hd_bar=parameters.hd_bar,
+        hd_adj=parameters.hd_adj,
+        hd_max=parameters.hd_max,
+    )
+
+    # the weaker player takes black
+    black, white = p1, p2
+    if not handicap and rng.random() < 0.5:
+        black, white = white, black
+
+    # rank difference not compensated by the handicap favours the stronger
+    advantage = white.rank - black.rank - handicap
+    white_wins = 1 / (1 + 10 ** (-advantage / 4))
+
+    roll = rng.random()
+    if roll < DRAW_PROBABILITY:
+        result = GameResult.DRAW
+    elif roll < DRAW_PROBABILITY + (1 - DRAW_PROBABILITY) * white_wins:
+        result = GameResult.WHITE_WINS
+    else:
+        result = GameResult.BLACK_WINS
+
+    return Game(
+        black_id=black.player_id,
+        white_id=white.player_id,
+        handicap=handicap,
+        result=result,
+    )
+
+
+def _points(game: Game, player: Player) -> float:
+    if player.is_bye:
+        return 0
+    if BYE_ID in (game.black_id, game.white_id):
+        return 1
+
+    match game.result:
+        case GameResult.WHITE_WINS if game.white_id == player.player_id:
+            return 1
+        case GameResult.BLACK_WINS if game.black_id == player.player_id:
+            return 1
+        case GameResult.DRAW:
+            return 0.5
+    return 0
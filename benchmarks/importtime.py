@@ -0,0 +1,96 @@
+r"""
+Import-time benchmarks of mmlib modules.
+
+Imports every module in a fresh interpreter under `python -X importtime`
+and prints the cumulative import times, in microseconds, as JSON:
+
+    python -m benchmarks.importtime --modules mmlib.macmahon \
+        --repeat 10 --output importtime.json
+
+Every result also lists the modules that took longest on their own, to
+find what a slow import pulls in.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+from benchmarks.run import git_revision
+
+MODULES = ["mmlib.models", "mmlib.scoring", "mmlib.macmahon"]
+HEAVIEST = 10
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Self and cumulative import times of everything importing `module`
+    loads, by module name, from one fresh interpreter.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stderr
+
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            times[name.strip()] = int(own), int(cumulative)
+    return times
+
+
+def run_benchmark(module: str, repeat: int = 5) -> dict[str, Any]:
+    runs = [import_times(module) for _ in range(repeat)]
+    cumulative = [times[module][1] for times in runs]
+    last = runs[-1]
+    heaviest = sorted(last, key=lambda name: last[name][0], reverse=True)
+
+    return {
+        "module": module,
+        "modules_loaded": len(last),
+        "cumulative_us": {
+            "min": min(cumulative),
+            "median": statistics.median(cumulative),
+            "max": max(cumulative),
+        },
+        "heaviest_us": {name: last[name][0] for name in heaviest[:HEAVIEST]},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON here, not to stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [
+            run_benchmark(module, args.repeat) for module in args.modules
+        ],
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+r"""
+Pairing benchmarks on synthetic tournaments.
+
+Times every phase of a pairing separately and prints the results as JSON,
+so that runs of different commits can be compared:
+
+    python -m benchmarks.run --players 50 200 1000 --rounds 5 \
+        --engine numpy --backend blossom --band-size 100 --output bench.json
+
+The defaults keep to the pure Python engine and networkx, which are slow
+beyond a few hundred players.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.generator import make_tournament, present_players
+from mmlib.constants import CostEngine, MatchingBackend
+from mmlib.context import PairingContext
+from mmlib.costs import CostModel
+from mmlib.macmahon import MacMahon
+from mmlib.matching import max_weight_matching
+from mmlib.scoring import ScoresRepository, make_scored_players
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+
+
+def run_benchmark(
+    n_players: int,
+    n_rounds: int,
+    engine: CostEngine,
+    backend: MatchingBackend,
+    seed: int = 0,
+    repeat: int = 3,
+    band_size: int | None = None,
+    radius: int | None = None,
+) -> dict[str, Any]:
+    tournament = make_tournament(n_players, n_rounds, seed=seed)
+    players, games = tournament.players, tournament.games
+    to_match = present_players(tournament)
+
+    scores = ScoresRepository(players, games)
+    costs = CostModel(tournament.parameters)
+    ctx = PairingContext.from_scores(scores, to_match)
+    weights = costs.make_weights(ctx, engine)
+
+    phases = {
+        "make_scored_players": lambda: make_scored_players(players, games),
+        "scores_repository": lambda: ScoresRepository(players, games),
+        "scored_players": lambda: ScoresRepository(players, games).data,
+        "pairing_context": lambda: PairingContext.from_scores(
+            scores, to_match
+        ),
+        "weights": lambda: costs.make_weights(ctx, engine),
+        "matching": lambda: max_weight_matching(weights, backend),
+        "make_pairing": lambda: MacMahon(
+            players,
+            games,
+            tournament.parameters,
+            engine=engine,
+            backend=backend,
+        ).make_pairing(to_match, band_size=band_size, radius=radius),
+    }
+
+    return {
+        "players": n_players,
+        "rounds": n_rounds,
+        "games": sum(len(round_games) for round_games in games),
+        "to_match": len(to_match),
+        "edges": len(to_match) * (len(to_match) - 1) // 2,
+        "engine": str(engine),
+        "backend": str(backend),
+        "band_size": band_size,
+        "radius": radius,
+        "seed": seed,
+        "phases": {
+            name: measure(func, repeat) for name, func in phases.items()
+        },
+    }
+
+
+def git_revision() -> str | None:
+    """The checked out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[50, 100, 200]
+    )
+    parser.add_argument("--rounds", type=int, nargs="+", default=[5])
+    parser.add_argument(
+        "--engine",
+        type=CostEngine,
+        choices=list(CostEngine),
+        default=CostEngine.PYTHON,
+    )
+    parser.add_argument(
+        "--backend",
+        type=MatchingBackend,
+        choices=list(MatchingBackend),
+        default=MatchingBackend.NETWORKX,
+    )
+    parser.add_argument(
+        "--band-size", type=int, help="pair score bands of this size"
+    )
+    parser.add_argument(
+        "--radius", type=int, help="pair on a sparse score-group graph"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write JSON here, not to stdout")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_benchmark(
+            n_players,
+            n_rounds,
+            engine=args.engine,
+            backend=args.backend,
+            seed=args.seed,
+            repeat=args.repeat,
+            band_size=args.band_size,
+            radius=args.radius,
+        )
+        for n_players in args.players
+        for n_rounds in args.rounds
+    ]
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
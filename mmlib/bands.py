@@ -0,0 +1,91 @@
+from mmlib.constants import CostEngine, MatchingBackend
+from mmlib.context import PairingContext
+from mmlib.costs import CostModel
+from mmlib.instrumentation import Instrumentation
+from mmlib.matching import max_weight_matching
+
+
+def make_bands(
+    ctx: PairingContext,
+    costs: CostModel,
+    engine: CostEngine,
+    band_size: int,
+) -> list[list[int]]:
+    """
+    Split the players into bands of adjacent score groups.
+
+    Groups are added to a band until it holds at least `band_size` players.
+    A full band with an odd number of players takes one floater from the
+    next group: the player with the most valuable edge into the lowest
+    score group of the band.
+    """
+    if band_size < 2:
+        raise ValueError("Band size must be at least 2.")
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(ctx)):
+        groups.setdefault(ctx.group[i], []).append(i)
+
+    bands = []
+    band = []
+    for group in sorted(groups):
+        members = groups[group]
+
+        if len(band) >= band_size:
+            floater = _choose_floater(ctx, costs, engine, band, members)
+            bands.append(band + [floater])
+            band = []
+            members = [i for i in members if i != floater]
+
+        band += members
+        if len(band) >= band_size and len(band) % 2 == 0:
+            bands.append(band)
+            band = []
+
+    if band:
+        bands.append(band)
+
+    return bands
+
+
+def _choose_floater(
+    ctx: PairingContext,
+    costs: CostModel,
+    engine: CostEngine,
+    band: list[int],
+    candidates: list[int],
+) -> int:
+    partners = [i for i in band if ctx.group[i] == ctx.group[band[-1]]]
+    weights = costs.make_weights(ctx.subset(partners + candidates), engine)
+
+    best_edges = [
+        max(weights[len(partners) + k][: len(partners)])
+        for k in range(len(candidates))
+    ]
+    return candidates[best_edges.index(max(best_edges))]
+
+
+def pair_band(
+    ctx: PairingContext,
+    costs: CostModel,
+    engine: CostEngine,
+    backend: MatchingBackend,
+    instrumentation: Instrumentation | None = None,
+) -> list[tuple[int, int]] | None:
+    """
+    Pair a single band. Returns None if the band cannot be paired on its
+    own: an odd band, or a pairing that repeats an already played game.
+    """
+    if len(ctx) % 2:
+        return None
+
+    pairs = max_weight_matching(
+        costs.make_weights(ctx, engine), backend, instrumentation
+    )
+
+    if 2 * len(pairs) != len(ctx):
+        return None
+    if any(j in ctx.opponents[i] for i, j in pairs):
+        return None
+
+    return pairs
@@ -0,0 +1,108 @@
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from concurrent.futures import Executor
+from functools import partial
+from typing import TypeVar
+
+from mmlib.constants import (
+    ColorTieBreak,
+    CostEngine,
+    GameResult,
+    MatchingBackend,
+)
+from mmlib.executors import map_with_executor
+from mmlib.macmahon import MacMahon
+from mmlib.models import Game, Player, Tournament
+
+K = TypeVar("K", bound=Hashable)
+
+
+def pair_tournaments(
+    tournaments: Mapping[K, Tournament] | Sequence[Tournament],
+    engine: CostEngine = CostEngine.PYTHON,
+    backend: MatchingBackend = MatchingBackend.NETWORKX,
+    executor: Executor | None = None,
+    workers: int | None = None,
+    chunksize: int = 1,
+    color_tie_break: ColorTieBreak = ColorTieBreak.SEEDED,
+) -> dict[K, list[Game]]:
+    """
+    Pair the next round of many tournaments, e.g. the divisions of a league.
+
+    Results are keyed like `tournaments`: by key for a mapping, by position
+    for a sequence. Every tournament pairs all its players, with its bye
+    player when they are odd.
+
+    By default the tournaments are paired one after another in this
+    process. With `executor` or `workers` they are sent to worker
+    processes in chunks of `chunksize` tournaments: a worker imports the
+    library once and pairs a whole chunk per task, and the models cross
+    the process boundary pickled, without being validated again. Pairing
+    keeps no global state, so a thread pool works as well.
+    """
+    if isinstance(tournaments, Mapping):
+        items = list(tournaments.items())
+    else:
+        items = list(enumerate(tournaments))
+    chunks = [
+        items[start : start + chunksize]
+        for start in range(0, len(items), chunksize)
+    ]
+    pair_chunk = partial(
+        _pair_chunk,
+        engine=engine,
+        backend=backend,
+        color_tie_break=color_tie_break,
+    )
+
+    results = map_with_executor(pair_chunk, chunks, executor, workers)
+    return {key: games for chunk in results for key, games in chunk}
+
+
+def tournament_player_ids(tournament: Tournament) -> list[str]:
+    """Players to pair in the next round, with a bye if they are odd."""
+    player_ids = [p.player_id for p in tournament.players if not p.is_bye]
+    byes = [p.player_id for p in tournament.players if p.is_bye]
+    if len(player_ids) % 2 and byes:
+        player_ids.append(byes[0])
+    return player_ids
+
+
+def pending_games(
+    players: Iterable[Player], games: Sequence[Sequence[Game]]
+) -> list[Game]:
+    """
+    Games of the last round whose result is still UNKNOWN. Games against
+    the bye are scored without their result, so they are never pending.
+    """
+    if not games:
+        return []
+    byes = {p.player_id for p in players if p.is_bye}
+    return [
+        game
+        for game in games[-1]
+        if game.result == GameResult.UNKNOWN
+        and game.black_id not in byes
+        and game.white_id not in byes
+    ]
+
+
+def _pair_chunk(
+    chunk: list[tuple[K, Tournament]],
+    engine: CostEngine,
+    backend: MatchingBackend,
+    color_tie_break: ColorTieBreak,
+) -> list[tuple[K, list[Game]]]:
+    results = []
+    for key, tournament in chunk:
+        mm = MacMahon(
+            tournament.players,
+            tournament.games,
+            tournament.parameters,
+            engine=engine,
+            backend=backend,
+            color_tie_break=color_tie_break,
+        )
+        results.append(
+            (key, mm.make_pairing(tournament_player_ids(tournament)))
+        )
+    return results
@@ -0,0 +1,12 @@
+from types import ModuleType
+
+
+def import_numpy() -> ModuleType:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for the vectorized cost engine. "
+            "Install mmlib with the `numpy` extra."
+        ) from e
+    return numpy
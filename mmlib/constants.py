@@ -38,3 +38,68 @@ class SeedingMode(StrEnum):
     CROSS = "cross"
     FOLD = "fold"
     ADJACENT = "adjacent"
+
+
+class CostEngine(StrEnum):
+    """
+    If set to PYTHON the costs are evaluated edge by edge.
+    If set to NUMPY the whole cost matrix is computed with NumPy.
+    """
+
+    PYTHON = "python"
+    NUMPY = "numpy"
+
+
+class CostArithmetic(StrEnum):
+    """
+    If set to FLOAT the costs are floats; next to the unique game weight
+    their fractional terms keep a precision of about 1/16.
+    If set to FIXED_POINT the costs are deterministic fixed-point integers
+    in units of 2**-10, i.e. 1 / `FIXED_POINT_SCALE`, with their fractional
+    terms rounded half up, see `mmlib.costs`.
+    """
+
+    FLOAT = "float"
+    FIXED_POINT = "fixed_point"
+
+
+class MatchingBackend(StrEnum):
+    """
+    If set to NETWORKX the pairing graph is matched with networkx.
+    If set to BLOSSOM the dense cost matrix is matched with `DenseBlossom`.
+    """
+
+    NETWORKX = "networkx"
+    BLOSSOM = "blossom"
+
+
+class ColorTieBreak(StrEnum):
+    """
+    How colours are chosen between players with the same colour balance.
+    If set to SEEDED a `random.Random` seeded with the two player ids picks
+    them, as the pairings always have.
+    If set to HASH a stable hash of the two ids picks them, independently of
+    their order.
+    """
+
+    SEEDED = "seeded"
+    HASH = "hash"
+
+
+class Criterion(StrEnum):
+    """
+    Standings criteria. SOS sums the scores of the opponents, SOSOS the SOS
+    of the opponents and SODOS the scores of the defeated opponents; a game
+    against the bye counts with the player's own score or SOS. SOSM-1 and
+    SOSM-2 are SOS without the lowest one or two opponent scores. DC, the
+    direct confrontation, counts the half points scored against the
+    players tied on every criterion before it.
+    """
+
+    MMS = "mms"
+    SOS = "sos"
+    SOSOS = "sosos"
+    SODOS = "sodos"
+    SOSM1 = "sosm-1"
+    SOSM2 = "sosm-2"
+    DC = "dc"
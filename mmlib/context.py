@@ -0,0 +1,113 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from mmlib.scoring import ScoresRepository
+
+
+@dataclass(slots=True)
+class PairingContext:
+    """
+    Flat per-player state used by the cost model.
+
+    Players are addressed by their index in `player_ids`. Score groups and
+    places in group are computed over the whole repository, so a context
+    built for a subset of players yields the same costs as the full one.
+    Forbidden pairs get no edge in the pairing graph.
+    """
+
+    player_ids: list[str]
+    index: dict[str, int]
+    rank: list[int]
+    score: list[int]
+    group: list[int]
+    place: list[int]
+    group_size: list[int]
+    color_balance: list[int]
+    draw_ups: list[int]
+    draw_downs: list[int]
+    opponents: list[set[int]]
+    forbidden: list[set[int]]
+    n_groups: int
+
+    @classmethod
+    def from_scores(
+        cls,
+        scores: ScoresRepository,
+        player_ids: list[str],
+        forbidden: Iterable[tuple[str, str]] = (),
+    ) -> "PairingContext":
+        store = scores.store
+        score_groups = scores.score_groups
+
+        index = {player_id: i for i, player_id in enumerate(player_ids)}
+        remap = {store.index[player_id]: i for player_id, i in index.items()}
+        ctx = cls(
+            player_ids=list(player_ids),
+            index=index,
+            rank=[],
+            score=[],
+            group=[],
+            place=[],
+            group_size=[],
+            color_balance=[],
+            draw_ups=[],
+            draw_downs=[],
+            opponents=[],
+            forbidden=[set() for _ in player_ids],
+            n_groups=len(score_groups),
+        )
+        for player1_id, player2_id in forbidden:
+            if player1_id in index and player2_id in index:
+                i, j = index[player1_id], index[player2_id]
+                ctx.forbidden[i].add(j)
+                ctx.forbidden[j].add(i)
+
+        for player_id in player_ids:
+            k = store.index[player_id]
+            group = scores.group_of(player_id)
+            ctx.rank.append(store.rank[k])
+            ctx.score.append(store.score(k))
+            ctx.group.append(group)
+            ctx.place.append(scores.place_in_group(player_id))
+            ctx.group_size.append(
+                len(scores.score_group_indices(score_groups[group]))
+            )
+            ctx.color_balance.append(store.color_balance[k])
+            ctx.draw_ups.append(store.draw_ups[k])
+            ctx.draw_downs.append(store.draw_downs[k])
+            ctx.opponents.append(
+                {remap[j] for j in store.opponents[k] if j in remap}
+            )
+
+        return ctx
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def subset(self, indices: list[int]) -> "PairingContext":
+        index = {
+            self.player_ids[i]: position for position, i in enumerate(indices)
+        }
+        remap = {i: position for position, i in enumerate(indices)}
+
+        return PairingContext(
+            player_ids=[self.player_ids[i] for i in indices],
+            index=index,
+            rank=[self.rank[i] for i in indices],
+            score=[self.score[i] for i in indices],
+            group=[self.group[i] for i in indices],
+            place=[self.place[i] for i in indices],
+            group_size=[self.group_size[i] for i in indices],
+            color_balance=[self.color_balance[i] for i in indices],
+            draw_ups=[self.draw_ups[i] for i in indices],
+            draw_downs=[self.draw_downs[i] for i in indices],
+            opponents=[
+                {remap[j] for j in self.opponents[i] if j in remap}
+                for i in indices
+            ],
+            forbidden=[
+                {remap[j] for j in self.forbidden[i] if j in remap}
+                for i in indices
+            ],
+            n_groups=self.n_groups,
+        )
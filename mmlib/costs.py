@@ -0,0 +1,648 @@
+import bisect
+import itertools
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from mmlib.compat import import_numpy
+from mmlib.constants import CostArithmetic, CostEngine, FloatingMode, Weight
+from mmlib.context import PairingContext
+from mmlib.floating import (
+    floating_coefficient,
+    floating_coefficient_array,
+    floating_ratio,
+    floating_ratio_array,
+)
+from mmlib.handicap import calculate_handicap, calculate_handicap_array
+from mmlib.instrumentation import COST_COMPONENTS, Instrumentation
+from mmlib.models import Parameters
+from mmlib.seeding import (
+    seeding_coefficient,
+    seeding_coefficient_array,
+    seeding_ratio,
+    seeding_ratio_array,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Fixed-point costs are deterministic integers in units of 2**-10, i.e.
+# 1 / FIXED_POINT_SCALE: every fractional term is computed from integer
+# ratios and rounded half up to a unit, so it is off by at most half a unit
+# and the same on every platform and engine. The largest cost, 1 + unique
+# game + score + colour + draw-up/down weights, is below 5.002e14 units of
+# 1, i.e. below 2**59 fixed-point units: NumPy int64 matrices keep a factor
+# of 16 of headroom, and the blossom solver, which adds offsets, runs on
+# Python integers.
+FIXED_POINT_SCALE = 2**10
+
+
+class CostModel:
+    """
+    Pairing costs between two players of a `PairingContext`.
+
+    Every term only reads precomputed context state, so evaluating the cost
+    of an edge is O(1). The `*_matrix` counterparts compute the same terms
+    for all pairs at once with NumPy and are bit-identical to the scalar
+    ones.
+
+    With FIXED_POINT `arithmetic` every cost is a deterministic fixed-point
+    integer with a resolution of 2**-10, scaled by `FIXED_POINT_SCALE` and
+    rounded half up, so matching runs on integers only.
+    """
+
+    def __init__(
+        self,
+        parameters: Parameters,
+        arithmetic: CostArithmetic = CostArithmetic.FLOAT,
+    ):
+        self.parameters = parameters
+        self.arithmetic = arithmetic
+        match arithmetic:
+            case CostArithmetic.FLOAT:
+                self.unit = 1
+            case CostArithmetic.FIXED_POINT:
+                self.unit = FIXED_POINT_SCALE
+            case _:
+                raise ValueError(f"Unknown cost arithmetic: {arithmetic}")
+
+    @property
+    def _fixed_point(self) -> bool:
+        return self.arithmetic == CostArithmetic.FIXED_POINT
+
+    def make_weights(
+        self, ctx: PairingContext, engine: CostEngine
+    ) -> "list[list[float]] | np.ndarray":
+        """
+        Weight matrix of the complete pairing graph; forbidden pairs get 0,
+        i.e. no edge.
+        """
+        match engine:
+            case CostEngine.PYTHON:
+                weights = [[0] * len(ctx) for _ in range(len(ctx))]
+                for i, j, cost in self.make_edges(ctx, engine):
+                    weights[i][j] = weights[j][i] = cost
+                return weights
+            case CostEngine.NUMPY:
+                weights = self.cost_matrix(ctx)
+                for i, forbidden in enumerate(ctx.forbidden):
+                    weights[i, list(forbidden)] = 0
+                return weights
+            case _:
+                raise ValueError(f"Unknown cost engine: {engine}")
+
+    def make_edges(
+        self,
+        ctx: PairingContext,
+        engine: CostEngine,
+        radius: int | None = None,
+    ) -> list[tuple[int, int, float]]:
+        """
+        Edges `(i, j, cost)` of the pairing graph, with `i < j`, in order.
+
+        With `radius`, only players at most `radius` score groups apart are
+        connected, and only those costs are computed. Forbidden pairs are
+        never connected.
+        """
+        match engine:
+            case CostEngine.PYTHON:
+                return [
+                    (i, j, self.calculate_cost(ctx, i, j))
+                    for i, j in sorted(self._edges(ctx, radius))
+                    if j not in ctx.forbidden[i]
+                ]
+            case CostEngine.NUMPY:
+                rows, cols = self._edge_arrays(ctx, radius)
+                allowed = [
+                    j not in ctx.forbidden[i]
+                    for i, j in zip(rows.tolist(), cols.tolist())
+                ]
+                rows, cols = rows[allowed], cols[allowed]
+                costs = self.edge_costs(ctx, rows, cols)
+                return list(zip(rows.tolist(), cols.tolist(), costs.tolist()))
+            case _:
+                raise ValueError(f"Unknown cost engine: {engine}")
+
+    def _edges(
+        self, ctx: PairingContext, radius: int | None
+    ) -> Iterator[tuple[int, int]]:
+        if radius is None:
+            yield from itertools.combinations(range(len(ctx)), 2)
+            return
+
+        # players sorted by group; the partners of a player are the ones
+        # after it, up to the end of the group `radius` groups higher
+        order = sorted(range(len(ctx)), key=ctx.group.__getitem__)
+        groups = [ctx.group[i] for i in order]
+        for p, i in enumerate(order):
+            end = bisect.bisect_right(groups, groups[p] + radius)
+            for j in order[p + 1 : end]:
+                yield min(i, j), max(i, j)
+
+    def _edge_arrays(
+        self, ctx: PairingContext, radius: int | None
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """`_edges` as index arrays, in order."""
+        np = import_numpy()
+        n = len(ctx)
+        group = np.asarray(ctx.group, dtype=np.int64)
+        if radius is None:
+            radius = int(group.max(initial=0) - group.min(initial=0))
+
+        order = np.argsort(group, kind="stable")
+        groups = group[order]
+        start = np.arange(1, n + 1)
+        end = np.searchsorted(groups, groups + radius, side="right")
+        counts = end - start
+        first = np.repeat(start - np.cumsum(counts) + counts, counts)
+        i = np.repeat(order, counts)
+        j = order[np.arange(counts.sum()) + first]
+
+        rows, cols = np.minimum(i, j), np.maximum(i, j)
+        sort = np.lexsort((cols, rows))
+        return rows[sort], cols[sort]
+
+    def calculate_cost(self, ctx: PairingContext, i: int, j: int) -> float:
+        cost = self.unit
+        cost += self.unique_game_cost(ctx, i, j)
+        cost += self.balance_color_cost(ctx, i, j)
+        cost += self.score_difference_cost(ctx, i, j)
+        cost += self.balance_seeding_cost(ctx, i, j)
+        return cost
+
+    def cost_bound(self, ctx: PairingContext, distance: int) -> float:
+        """
+        Upper bound of `calculate_cost` for two players `distance` > 0 score
+        groups apart, summed in the same order so that float rounding keeps
+        it an upper bound.
+        """
+        cost = self.unit
+        cost += Weight.unique_game_weight.value * self.unit
+        cost += self._scaled(2, 2, Weight.color_weight)
+        if self._fixed_point:
+            cost += self._fixed_score_difference_cost(distance, ctx.n_groups)
+        else:
+            x = distance / ctx.n_groups
+            cost += (1 - x) * (1 + x / 2) * Weight.score_weight.value
+        # only players of adjacent groups can have adjacent scores
+        if distance == 1:
+            w = Weight.dudd_weight
+            if self._fixed_point:
+                cost += self._scaled(8, 10, w) + 2 * self._scaled(1, 10, w)
+            else:
+                cost += w.value
+        return cost
+
+    def handicap(self, ctx: PairingContext, i: int, j: int) -> int:
+        r1, r2 = ctx.rank[i], ctx.rank[j]
+        if r1 > r2:
+            r1, r2 = r2, r1
+
+        return calculate_handicap(
+            r1=r1,
+            r2=r2,
+            hd_bar=self.parameters.hd_bar,
+            hd_adj=self.parameters.hd_adj,
+            hd_max=self.parameters.hd_max,
+        )
+
+    def unique_game_cost(self, ctx: PairingContext, i: int, j: int) -> int:
+        if j not in ctx.opponents[i]:
+            return Weight.unique_game_weight.value * self.unit
+        return 0
+
+    def balance_color_cost(self, ctx: PairingContext, i: int, j: int) -> float:
+        if self.handicap(ctx, i, j):
+            return 0
+
+        p1_cb = ctx.color_balance[i]
+        p2_cb = ctx.color_balance[j]
+
+        if p1_cb * p2_cb < 0:
+            # color balance corrected for both players
+            halves = 2
+        elif p1_cb * p2_cb == 0 and (p1_cb > 1 or p2_cb > 1):
+            # color balance corrected for one player
+            halves = 1
+        else:
+            halves = 0
+
+        return self._scaled(halves, 2, Weight.color_weight)
+
+    def score_difference_cost(
+        self, ctx: PairingContext, i: int, j: int
+    ) -> float:
+        if self._fixed_point:
+            return self._fixed_score_difference_cost(
+                abs(ctx.group[i] - ctx.group[j]), ctx.n_groups
+            )
+        x = abs(ctx.group[i] - ctx.group[j]) / ctx.n_groups
+        return (1 - x) * (1 + x / 2) * Weight.score_weight.value
+
+    def _fixed_score_difference_cost(self, distance: int, n: int) -> int:
+        # (1 - x) * (1 + x / 2) with x = distance / n
+        return self._scaled(
+            (n - distance) * (2 * n + distance),
+            2 * n * n,
+            Weight.score_weight,
+        )
+
+    def balance_seeding_cost(
+        self, ctx: PairingContext, i: int, j: int
+    ) -> float:
+        if ctx.score[i] == ctx.score[j]:
+            if self._fixed_point:
+                numerator, denominator = seeding_ratio(
+                    ctx.place[i],
+                    ctx.place[j],
+                    ctx.group_size[i],
+                    self.parameters.seeding_mode,
+                )
+                return self._scaled(
+                    numerator, denominator, Weight.seeding_weight
+                )
+            k = self._seeding_coefficient(ctx, i, j)
+            return k * Weight.seeding_weight.value
+
+        if abs(ctx.score[i] - ctx.score[j]) >= 1.5:
+            return 0
+
+        if ctx.score[i] > ctx.score[j]:
+            i, j = j, i
+
+        scenario_coef = self._dudd_scenario(ctx, i, j)
+        if self._fixed_point:
+            up = floating_ratio(
+                self.parameters.float_up_mode, ctx.place[i], ctx.group_size[i]
+            )
+            down = floating_ratio(
+                self.parameters.float_down_mode,
+                ctx.place[j],
+                ctx.group_size[j],
+            )
+            # each tenth of the coefficient is rounded on its own
+            return (
+                self._scaled(scenario_coef, 10, Weight.dudd_weight)
+                + self._scaled(up[0], 10 * up[1], Weight.dudd_weight)
+                + self._scaled(down[0], 10 * down[1], Weight.dudd_weight)
+            )
+        float_up_coef = self._floating_coef(
+            ctx, i, self.parameters.float_up_mode
+        )
+        float_down_coef = self._floating_coef(
+            ctx, j, self.parameters.float_down_mode
+        )
+
+        k = (scenario_coef + float_up_coef + float_down_coef) / 10
+
+        return k * Weight.dudd_weight.value
+
+    def _scaled(
+        self, numerator: int, denominator: int, weight: Weight
+    ) -> float:
+        """`numerator / denominator` of `weight`, in cost units."""
+        if self._fixed_point:
+            scaled = numerator * weight.value * FIXED_POINT_SCALE
+            return (2 * scaled + denominator) // (2 * denominator)
+        return numerator / denominator * weight.value
+
+    def _scaled_array(
+        self,
+        numerator: "np.ndarray",
+        denominator: "np.ndarray",
+        weight: Weight,
+    ) -> "np.ndarray":
+        if self._fixed_point:
+            scaled = numerator * (weight.value * FIXED_POINT_SCALE)
+            return (2 * scaled + denominator) // (2 * denominator)
+        return numerator / denominator * weight.value
+
+    def _seeding_coefficient(
+        self, ctx: PairingContext, i: int, j: int
+    ) -> float:
+        return seeding_coefficient(
+            ctx.place[i],
+            ctx.place[j],
+            ctx.group_size[i],
+            self.parameters.seeding_mode,
+        )
+
+    def _floating_coef(
+        self, ctx: PairingContext, i: int, mode: FloatingMode
+    ) -> float:
+        return floating_coefficient(mode, ctx.place[i], ctx.group_size[i])
+
+    def _dudd_scenario(self, ctx: PairingContext, i: int, j: int) -> int:
+        scenario = 2  # normal conditions
+        if ctx.draw_ups[i]:
+            scenario -= 1  # avoid drawing up the same player
+        if ctx.draw_downs[j]:
+            scenario -= 1  # avoid drawing down the same player
+
+        if scenario != 0 and self.parameters.dudd_compensate:
+            if ctx.draw_ups[i] < ctx.draw_downs[i]:
+                scenario += 1  # correct draw-ups for sp1
+            if ctx.draw_downs[j] < ctx.draw_ups[j]:
+                scenario += 1  # correct draw-downs for sp2
+
+        return scenario * 2
+
+    def cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        np = import_numpy()
+
+        if self._fixed_point:
+            cost = np.full((len(ctx), len(ctx)), self.unit, dtype=np.int64)
+        else:
+            cost = np.ones((len(ctx), len(ctx)))
+        cost += self.unique_game_cost_matrix(ctx)
+        cost += self.balance_color_cost_matrix(ctx)
+        cost += self.score_difference_cost_matrix(ctx)
+        cost += self.balance_seeding_cost_matrix(ctx)
+        np.fill_diagonal(cost, 0)
+        return cost
+
+    def edge_costs(
+        self, ctx: PairingContext, rows: "np.ndarray", cols: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        Costs of the pairs `(rows[k], cols[k])` with NumPy, bit-identical to
+        `calculate_cost`; unlike `cost_matrix`, only these pairs are
+        evaluated.
+        """
+        np = import_numpy()
+        n = len(ctx)
+
+        if self._fixed_point:
+            cost = np.full(len(rows), self.unit, dtype=np.int64)
+        else:
+            cost = np.ones(len(rows))
+
+        played = [i * n + j for i, js in enumerate(ctx.opponents) for j in js]
+        cost += np.where(
+            np.isin(rows * n + cols, played),
+            0,
+            Weight.unique_game_weight.value * self.unit,
+        )
+
+        cb = np.asarray(ctx.color_balance)
+        cb1, cb2 = cb[rows], cb[cols]
+        product = cb1 * cb2
+        corrected_one = (product == 0) & ((cb1 > 1) | (cb2 > 1))
+        halves = np.where(product < 0, 2, np.where(corrected_one, 1, 0))
+        rank = np.asarray(ctx.rank)
+        handicap = calculate_handicap_array(
+            r1=np.minimum(rank[rows], rank[cols]),
+            r2=np.maximum(rank[rows], rank[cols]),
+            hd_bar=self.parameters.hd_bar,
+            hd_adj=self.parameters.hd_adj,
+            hd_max=self.parameters.hd_max,
+        )
+        cost += np.where(
+            handicap != 0,
+            0,
+            self._scaled_array(halves, 2, Weight.color_weight),
+        )
+
+        group = np.asarray(ctx.group)
+        distance = np.abs(group[rows] - group[cols])
+        if self._fixed_point:
+            costs = [
+                self._fixed_score_difference_cost(d, ctx.n_groups)
+                for d in range(distance.max(initial=0) + 1)
+            ]
+            cost += np.array(costs, dtype=np.int64)[distance]
+        else:
+            x = distance / ctx.n_groups
+            cost += (1 - x) * (1 + x / 2) * Weight.score_weight.value
+
+        cost += self._balance_seeding_array(ctx, rows, cols)
+        return cost
+
+    def handicap_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        np = import_numpy()
+        rank = np.asarray(ctx.rank)
+
+        return calculate_handicap_array(
+            r1=np.minimum.outer(rank, rank),
+            r2=np.maximum.outer(rank, rank),
+            hd_bar=self.parameters.hd_bar,
+            hd_adj=self.parameters.hd_adj,
+            hd_max=self.parameters.hd_max,
+        )
+
+    def unique_game_cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        np = import_numpy()
+
+        rows = np.repeat(
+            np.arange(len(ctx)),
+            [len(opponents) for opponents in ctx.opponents],
+        )
+        cols = np.fromiter(
+            itertools.chain.from_iterable(ctx.opponents),
+            dtype=int,
+            count=len(rows),
+        )
+        played = np.zeros((len(ctx), len(ctx)), dtype=bool)
+        played[rows, cols] = True
+
+        return np.where(played, 0, Weight.unique_game_weight.value * self.unit)
+
+    def balance_color_cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        np = import_numpy()
+        cb = np.asarray(ctx.color_balance)
+
+        product = np.multiply.outer(cb, cb)
+        corrected_one = (product == 0) & np.logical_or.outer(cb > 1, cb > 1)
+        halves = np.where(product < 0, 2, np.where(corrected_one, 1, 0))
+
+        return np.where(
+            self.handicap_matrix(ctx) != 0,
+            0,
+            self._scaled_array(halves, 2, Weight.color_weight),
+        )
+
+    def score_difference_cost_matrix(
+        self, ctx: PairingContext
+    ) -> "np.ndarray":
+        np = import_numpy()
+        group = np.asarray(ctx.group)
+
+        if self._fixed_point:
+            distance = np.abs(np.subtract.outer(group, group))
+            costs = [
+                self._fixed_score_difference_cost(d, ctx.n_groups)
+                for d in range(distance.max(initial=0) + 1)
+            ]
+            return np.array(costs, dtype=np.int64)[distance]
+
+        x = np.abs(np.subtract.outer(group, group)) / ctx.n_groups
+        return (1 - x) * (1 + x / 2) * Weight.score_weight.value
+
+    def balance_seeding_cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        np = import_numpy()
+        score = np.asarray(ctx.score)
+
+        dtype = np.int64 if self._fixed_point else float
+        cost = np.zeros((len(ctx), len(ctx)), dtype=dtype)
+        # only players with the same or adjacent scores have a cost
+        close = np.abs(np.subtract.outer(score, score)) <= 1
+        np.fill_diagonal(close, False)
+        rows, cols = np.nonzero(close)
+        cost[rows, cols] = self._balance_seeding_array(ctx, rows, cols)
+        return cost
+
+    def _balance_seeding_array(
+        self, ctx: PairingContext, rows: "np.ndarray", cols: "np.ndarray"
+    ) -> "np.ndarray":
+        """`balance_seeding_cost` of the pairs `(rows[k], cols[k])`."""
+        np = import_numpy()
+        score = np.asarray(ctx.score)
+        place = np.asarray(ctx.place)
+        group_size = np.asarray(ctx.group_size)
+        draw_ups = np.asarray(ctx.draw_ups)
+        draw_downs = np.asarray(ctx.draw_downs)
+
+        dtype = np.int64 if self._fixed_point else float
+        cost = np.zeros(len(rows), dtype=dtype)
+        score_diff = score[rows] - score[cols]
+
+        same = np.nonzero(score_diff == 0)[0]
+        first, second = rows[same], cols[same]
+        if self._fixed_point:
+            cost[same] = self._scaled_array(
+                *seeding_ratio_array(
+                    place[first],
+                    place[second],
+                    group_size[first],
+                    self.parameters.seeding_mode,
+                ),
+                Weight.seeding_weight,
+            )
+        else:
+            k = seeding_coefficient_array(
+                place[first],
+                place[second],
+                group_size[first],
+                self.parameters.seeding_mode,
+            )
+            cost[same] = k * Weight.seeding_weight.value
+
+        # up are the players drawn up, down the players drawn down
+        adjacent = np.nonzero(np.abs(score_diff) == 1)[0]
+        lower = score_diff[adjacent] < 0
+        up = np.where(lower, rows[adjacent], cols[adjacent])
+        down = np.where(lower, cols[adjacent], rows[adjacent])
+        scenario_coef = self._dudd_scenario_array(
+            draw_ups[up], draw_downs[up], draw_ups[down], draw_downs[down]
+        )
+        if self._fixed_point:
+            up_ratio, up_denominator = floating_ratio_array(
+                self.parameters.float_up_mode, place[up], group_size[up]
+            )
+            down_ratio, down_denominator = floating_ratio_array(
+                self.parameters.float_down_mode,
+                place[down],
+                group_size[down],
+            )
+            w = Weight.dudd_weight
+            cost[adjacent] = (
+                self._scaled_array(scenario_coef, 10, w)
+                + self._scaled_array(up_ratio, 10 * up_denominator, w)
+                + self._scaled_array(down_ratio, 10 * down_denominator, w)
+            )
+        else:
+            float_up_coef = floating_coefficient_array(
+                self.parameters.float_up_mode, place[up], group_size[up]
+            )
+            float_down_coef = floating_coefficient_array(
+                self.parameters.float_down_mode, place[down], group_size[down]
+            )
+
+            k = (scenario_coef + float_up_coef + float_down_coef) / 10
+
+            cost[adjacent] = k * Weight.dudd_weight.value
+        return cost
+
+    def _dudd_scenario_array(
+        self,
+        up_draw_ups: "np.ndarray",
+        up_draw_downs: "np.ndarray",
+        down_draw_ups: "np.ndarray",
+        down_draw_downs: "np.ndarray",
+    ) -> "np.ndarray":
+        np = import_numpy()
+
+        scenario = 2 - (up_draw_ups > 0) - (down_draw_downs > 0)
+
+        if self.parameters.dudd_compensate:
+            compensation = (up_draw_ups < up_draw_downs).astype(int) + (
+                down_draw_downs < down_draw_ups
+            )
+            scenario = np.where(
+                scenario != 0, scenario + compensation, scenario
+            )
+
+        return scenario * 2
+
+
+class CountingCostModel(CostModel):
+    """
+    `CostModel` that counts the evaluations of every cost component. A
+    matrix term counts as one evaluation per pair of players.
+    """
+
+    def __init__(
+        self,
+        parameters: Parameters,
+        instrumentation: Instrumentation,
+        arithmetic: CostArithmetic = CostArithmetic.FLOAT,
+    ):
+        super().__init__(parameters, arithmetic)
+        self.instrumentation = instrumentation
+
+    def unique_game_cost(self, ctx: PairingContext, i: int, j: int) -> int:
+        self.instrumentation.count("unique_game_cost")
+        return super().unique_game_cost(ctx, i, j)
+
+    def balance_color_cost(self, ctx: PairingContext, i: int, j: int) -> float:
+        self.instrumentation.count("balance_color_cost")
+        return super().balance_color_cost(ctx, i, j)
+
+    def score_difference_cost(
+        self, ctx: PairingContext, i: int, j: int
+    ) -> float:
+        self.instrumentation.count("score_difference_cost")
+        return super().score_difference_cost(ctx, i, j)
+
+    def balance_seeding_cost(
+        self, ctx: PairingContext, i: int, j: int
+    ) -> float:
+        self.instrumentation.count("balance_seeding_cost")
+        return super().balance_seeding_cost(ctx, i, j)
+
+    def unique_game_cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        self._count_pairs("unique_game_cost", ctx)
+        return super().unique_game_cost_matrix(ctx)
+
+    def balance_color_cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        self._count_pairs("balance_color_cost", ctx)
+        return super().balance_color_cost_matrix(ctx)
+
+    def score_difference_cost_matrix(
+        self, ctx: PairingContext
+    ) -> "np.ndarray":
+        self._count_pairs("score_difference_cost", ctx)
+        return super().score_difference_cost_matrix(ctx)
+
+    def balance_seeding_cost_matrix(self, ctx: PairingContext) -> "np.ndarray":
+        self._count_pairs("balance_seeding_cost", ctx)
+        return super().balance_seeding_cost_matrix(ctx)
+
+    def edge_costs(
+        self, ctx: PairingContext, rows: "np.ndarray", cols: "np.ndarray"
+    ) -> "np.ndarray":
+        for name in COST_COMPONENTS:
+            self.instrumentation.count(name, len(rows))
+        return super().edge_costs(ctx, rows, cols)
+
+    def _count_pairs(self, name: str, ctx: PairingContext) -> None:
+        self.instrumentation.count(name, len(ctx) * (len(ctx) - 1) // 2)
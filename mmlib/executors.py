@@ -0,0 +1,30 @@
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_with_executor(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    executor: "Executor | None" = None,
+    workers: int | None = None,
+) -> list[R]:
+    """
+    Map `fn` over `items` in this process, on `executor`, or on a process
+    pool with `workers` processes created for this call, in item order.
+    """
+    if executor is None and workers is None:
+        return list(map(fn, items))
+    if executor is not None:
+        return list(executor.map(fn, items))
+
+    # concurrent.futures is only imported when a pool is needed
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
@@ -1,5 +1,11 @@
+from typing import TYPE_CHECKING
+
+from mmlib.compat import import_numpy
 from mmlib.constants import FloatingMode
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 def _validate_floating_arguments(place: int, group_size: int) -> None:
     if group_size < 1:
@@ -57,3 +63,125 @@ def floating_coefficient(
             return floating_middle(place, group_size)
         case _:
             raise ValueError(f"Unknown floating mode: {mode}")
+
+
+def floating_ratio(
+    mode: FloatingMode,
+    place: int,
+    group_size: int,
+) -> tuple[int, int]:
+    """`floating_coefficient` as an exact (numerator, denominator) pair."""
+    _validate_floating_arguments(place, group_size)
+
+    match mode:
+        case FloatingMode.BOTTOM if group_size >= 2:
+            return place, group_size - 1
+        case FloatingMode.TOP if group_size >= 2:
+            return group_size - 1 - place, group_size - 1
+        case FloatingMode.MIDDLE if group_size > 2:
+            mid = (group_size - 1) // 2
+            result = mid - abs(mid - place)
+            if place > mid:
+                result += 1 - group_size % 2
+            return result, mid
+        case FloatingMode.BOTTOM | FloatingMode.TOP | FloatingMode.MIDDLE:
+            return 1, 1
+        case _:
+            raise ValueError(f"Unknown floating mode: {mode}")
+
+
+def _validate_floating_arrays(
+    place: "np.ndarray", group_size: "np.ndarray"
+) -> tuple["np.ndarray", "np.ndarray"]:
+    np = import_numpy()
+    place, group_size = np.broadcast_arrays(
+        np.asarray(place), np.asarray(group_size)
+    )
+
+    if np.any(group_size < 1):
+        raise ValueError("Group size must be a positive integer.")
+
+    if np.any(place < 0):
+        raise ValueError("Place must be a non-negative integer.")
+
+    if np.any(place >= group_size):
+        raise ValueError("Place must be less than group size.")
+
+    return place, group_size
+
+
+def floating_bottom_array(
+    place: "np.ndarray", group_size: "np.ndarray"
+) -> "np.ndarray":
+    np = import_numpy()
+    place, group_size = _validate_floating_arrays(place, group_size)
+
+    denominator = np.where(group_size < 2, 1, group_size - 1)
+    return np.where(group_size < 2, 1.0, place / denominator)
+
+
+def floating_top_array(
+    place: "np.ndarray", group_size: "np.ndarray"
+) -> "np.ndarray":
+    np = import_numpy()
+    place, group_size = _validate_floating_arrays(place, group_size)
+
+    denominator = np.where(group_size < 2, 1, group_size - 1)
+    return np.where(group_size < 2, 1.0, 1 - place / denominator)
+
+
+def floating_middle_array(
+    place: "np.ndarray", group_size: "np.ndarray"
+) -> "np.ndarray":
+    np = import_numpy()
+    place, group_size = _validate_floating_arrays(place, group_size)
+
+    mid = (group_size - 1) // 2
+    result = mid - np.abs(mid - place)
+    result = np.where(place > mid, result + 1 - group_size % 2, result)
+    denominator = np.where(group_size <= 2, 1, mid)
+    return np.where(group_size <= 2, 1.0, result / denominator)
+
+
+def floating_coefficient_array(
+    mode: FloatingMode,
+    place: "np.ndarray",
+    group_size: "np.ndarray",
+) -> "np.ndarray":
+    match mode:
+        case FloatingMode.BOTTOM:
+            return floating_bottom_array(place, group_size)
+        case FloatingMode.TOP:
+            return floating_top_array(place, group_size)
+        case FloatingMode.MIDDLE:
+            return floating_middle_array(place, group_size)
+        case _:
+            raise ValueError(f"Unknown floating mode: {mode}")
+
+
+def floating_ratio_array(
+    mode: FloatingMode,
+    place: "np.ndarray",
+    group_size: "np.ndarray",
+) -> tuple["np.ndarray", "np.ndarray"]:
+    np = import_numpy()
+    place, group_size = _validate_floating_arrays(place, group_size)
+
+    match mode:
+        case FloatingMode.BOTTOM:
+            small = group_size < 2
+            numerator, denominator = place, group_size - 1
+        case FloatingMode.TOP:
+            small = group_size < 2
+            numerator, denominator = group_size - 1 - place, group_size - 1
+        case FloatingMode.MIDDLE:
+            small = group_size <= 2
+            mid = (group_size - 1) // 2
+            numerator = mid - np.abs(mid - place)
+            numerator = np.where(
+                place > mid, numerator + 1 - group_size % 2, numerator
+            )
+            denominator = mid
+        case _:
+            raise ValueError(f"Unknown floating mode: {mode}")
+    return np.where(small, 1, numerator), np.where(small, 1, denominator)
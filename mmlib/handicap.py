@@ -1,3 +1,11 @@
+from typing import TYPE_CHECKING
+
+from mmlib.compat import import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
 def calculate_handicap(
     r1: int,
     r2: int,
@@ -8,3 +16,18 @@ def calculate_handicap(
     assert r1 <= r2, "r1 should not be higher than r2"
 
     return min(max(max(r2, hd_bar) - max(r1, hd_bar) + hd_adj, 0), hd_max)
+
+
+def calculate_handicap_array(
+    r1: "np.ndarray",
+    r2: "np.ndarray",
+    hd_bar: int,
+    hd_adj: int,
+    hd_max: int,
+) -> "np.ndarray":
+    np = import_numpy()
+    r1, r2 = np.asarray(r1), np.asarray(r2)
+    assert np.all(r1 <= r2), "r1 should not be higher than r2"
+
+    handicap = np.maximum(r2, hd_bar) - np.maximum(r1, hd_bar) + hd_adj
+    return np.minimum(np.maximum(handicap, 0), hd_max)
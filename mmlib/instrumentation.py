@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager
+
+COST_COMPONENTS = (
+    "unique_game_cost",
+    "balance_color_cost",
+    "score_difference_cost",
+    "balance_seeding_cost",
+)
+
+
+@dataclass
+class PairingReport:
+    """
+    Timings in seconds per phase, the number of edges handed to matching,
+    cost evaluations per component and matching iterations (blossom stages;
+    networkx does not report them).
+    """
+
+    timings: dict[str, float] = field(default_factory=dict)
+    edges: int = 0
+    cost_calls: dict[str, int] = field(default_factory=dict)
+    matching_iterations: int = 0
+
+
+class Instrumentation:
+    """
+    Opt-in collector of timings and counters.
+
+    Pass one to `MacMahon` or `ScoresRepository` to record their work, then
+    read it back with `report()`. Without one nothing is recorded and the
+    hot paths run the plain code.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: Counter[str] = Counter()
+        self._counters: Counter[str] = Counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._timings[name] += elapsed
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    def report(self) -> PairingReport:
+        with self._lock:
+            return PairingReport(
+                timings=dict(self._timings),
+                edges=self._counters["edges"],
+                cost_calls={
+                    name: self._counters[name] for name in COST_COMPONENTS
+                },
+                matching_iterations=self._counters["matching_iterations"],
+            )
+
+
+def phase(
+    instrumentation: Instrumentation | None, name: str
+) -> ContextManager[None]:
+    if instrumentation is None:
+        return nullcontext()
+    return instrumentation.phase(name)
@@ -0,0 +1,163 @@
+import json
+import os
+from collections.abc import Iterator
+from contextlib import nullcontext
+from typing import Any, TextIO
+
+from mmlib.instrumentation import Instrumentation
+from mmlib.models import Game, Parameters, Player
+from mmlib.scoring import ScoresRepository
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+
+def load_scores(
+    source: str | os.PathLike | TextIO,
+    instrumentation: Instrumentation | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[ScoresRepository, Parameters]:
+    """
+    Read a tournament JSON file into a `ScoresRepository`.
+
+    The file has the layout of a `Tournament`. It is read in chunks and
+    every round is added to the repository as soon as it is parsed, so only
+    one round of `Game` models exists at a time instead of the whole
+    history. Rounds that come before the players in the file are kept
+    until the players are known.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        context = open(source, encoding="utf-8")
+    else:
+        context = nullcontext(source)
+
+    with context as f:
+        reader = _Reader(f, chunk_size)
+        scores = parameters = None
+        pending: list[list[Game]] = []
+
+        for key in reader.keys():
+            match key:
+                case "players":
+                    players = [
+                        Player.model_validate(item) for item in reader.items()
+                    ]
+                    scores = ScoresRepository(
+                        players, pending, instrumentation
+                    )
+                    pending = []
+                case "games":
+                    for item in reader.items():
+                        games = [Game.model_validate(game) for game in item]
+                        if scores is None:
+                            pending.append(games)
+                        else:
+                            scores.add_round(games)
+                case "parameters":
+                    parameters = Parameters.model_validate(reader.value())
+                case _:
+                    reader.value()
+        reader.end()
+
+    if scores is None or parameters is None:
+        raise ValueError("A tournament needs players and parameters.")
+    return scores, parameters
+
+
+class _Reader:
+    """
+    Incremental JSON reader over a text file.
+
+    Containers are walked one element at a time; every element is decoded
+    whole with `json.JSONDecoder.raw_decode`, reading more of the file
+    while it is incomplete.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def keys(self) -> Iterator[str]:
+        """Keys of an object; the caller reads the value of each."""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                self._error("Expecting property name")
+            self._expect(":")
+            yield key
+            if self._peek() == "}":
+                self.pos += 1
+                return
+            self._expect(",")
+
+    def items(self) -> Iterator[Any]:
+        """Decoded elements of an array."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+            if self._peek() == "]":
+                self.pos += 1
+                return
+            self._expect(",")
+
+    def value(self) -> Any:
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # a number may go on in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            # grow geometrically, so that a long value is not decoded
+            # again for every chunk
+            self._read(size)
+            size *= 2
+
+    def end(self) -> None:
+        if self._peek():
+            self._error("Extra data")
+
+    def _peek(self) -> str:
+        while True:
+            while (
+                self.pos < len(self.buffer)
+                and self.buffer[self.pos] in _WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self._read(self.chunk_size)
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            self._error(f"Expecting {char!r}")
+        self.pos += 1
+
+    def _read(self, size: int) -> None:
+        chunk = self.f.read(size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def _error(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self.buffer, self.pos)
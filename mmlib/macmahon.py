@@ -1,14 +1,42 @@
 import itertools
 import random
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import partial
+from typing import TYPE_CHECKING
+
+from mmlib.bands import make_bands, pair_band
+from mmlib.constants import (
+    ColorTieBreak,
+    CostArithmetic,
+    CostEngine,
+    MatchingBackend,
+)
+from mmlib.context import PairingContext
+from mmlib.costs import CostModel, CountingCostModel
+from mmlib.executors import map_with_executor
+from mmlib.instrumentation import Instrumentation, phase
+from mmlib.matching import (
+    BlossomState,
+    blossom_solve,
+    blossom_solve_edges,
+    max_weight_matching,
+    repair_matching,
+)
+from mmlib.models import Game, Parameters, Player, ScoredPlayer, fast_construct
+from mmlib.scoring import ScoresRepository
 
-import networkx as nx
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-from mmlib.constants import FloatingMode, Weight
-from mmlib.floating import floating_coefficient
-from mmlib.handicap import calculate_handicap
-from mmlib.models import Game, Parameters, Player, ScoredPlayer
-from mmlib.scoring import ScoresRepository
-from mmlib.seeding import seeding_coefficient
+
+@dataclass
+class _Solution:
+    ctx: PairingContext
+    state: BlossomState
+    version: int
 
 
 class MacMahon:
@@ -17,160 +45,383 @@ class MacMahon:
         players: list[Player],
         games: list[list[Game]],
         parameters: Parameters,
+        engine: CostEngine = CostEngine.PYTHON,
+        backend: MatchingBackend = MatchingBackend.NETWORKX,
+        instrumentation: Instrumentation | None = None,
+        color_tie_break: ColorTieBreak = ColorTieBreak.SEEDED,
+        arithmetic: CostArithmetic = CostArithmetic.FLOAT,
     ):
-        self.scores = ScoresRepository(players, games)
+        """
+        With `instrumentation`, scoring and every pairing record their phase
+        timings and counters into it; see `Instrumentation.report`.
+
+        `color_tie_break` chooses the colours of players with the same
+        colour balance. Neither strategy touches global state, so instances
+        can pair concurrently in threads.
+
+        With FIXED_POINT `arithmetic` the costs are fixed-point integers
+        and the matching runs on integers only; see `CostModel`.
+        """
+        self.scores = ScoresRepository(players, games, instrumentation)
         self.parameters = parameters
+        self.engine = engine
+        self.backend = backend
+        self.instrumentation = instrumentation
+        self.color_tie_break = color_tie_break
+        self.arithmetic = arithmetic
+        if instrumentation is None:
+            self.costs = CostModel(parameters, arithmetic)
+        else:
+            self.costs = CountingCostModel(
+                parameters, instrumentation, arithmetic
+            )
+        self._solution: _Solution | None = None
 
-    def make_pairing(self, to_match: list[str]) -> list[Game]:
-        assert len(to_match) % 2 == 0
-
-        graph = nx.Graph()
-
-        for p1, p2 in itertools.combinations(to_match, 2):
-            cost = self.calculate_cost(p1, p2)
-            graph.add_edge(p1, p2, weight=cost)
-
-        return sorted(
-            [
-                self.make_game(sp1=self.scores[p1_id], sp2=self.scores[p2_id])
-                for p1_id, p2_id in nx.max_weight_matching(
-                    graph, maxcardinality=True
-                )
-            ],
-            key=lambda game: game.black_id,
+    @classmethod
+    def from_scores(
+        cls,
+        scores: ScoresRepository,
+        parameters: Parameters,
+        engine: CostEngine = CostEngine.PYTHON,
+        backend: MatchingBackend = MatchingBackend.NETWORKX,
+        color_tie_break: ColorTieBreak = ColorTieBreak.SEEDED,
+        arithmetic: CostArithmetic = CostArithmetic.FLOAT,
+    ) -> "MacMahon":
+        """Pair on an existing repository, e.g. one from `load_scores`."""
+        mm = cls(
+            [],
+            [],
+            parameters,
+            engine,
+            backend,
+            scores.instrumentation,
+            color_tie_break,
+            arithmetic,
         )
+        mm.scores = scores
+        return mm
 
-    def calculate_cost(self, player1_id: str, player2_id: str) -> float:
-        sp1 = self.scores[player1_id]
-        sp2 = self.scores[player2_id]
-
-        cost = 1
-        cost += self.unique_game_cost(sp1, sp2)
-        cost += self.balance_color_cost(sp1, sp2)
-        cost += self.score_difference_cost(sp1, sp2)
-        cost += self.balance_seeding_cost(sp1, sp2)
-        return cost
+    def make_pairing(
+        self,
+        to_match: list[str],
+        band_size: int | None = None,
+        executor: "Executor | None" = None,
+        workers: int | None = None,
+        radius: int | None = None,
+        forbidden: Iterable[tuple[str, str]] = (),
+    ) -> list[Game]:
+        """
+        Pair the given players, never pairing the `forbidden` pairs.
+
+        If `radius` is set, the field is paired on a sparse graph that only
+        connects players at most `radius` score groups apart, and only the
+        costs of its edges are computed. Sparse graphs are always matched
+        with the blossom solver, whatever the backend: a perfect matching is
+        accepted once its duals prove it optimal on the complete graph too,
+        and the radius is doubled until then, up to the complete graph. The
+        pairing therefore has the same total weight as the dense one.
+
+        If `band_size` is set, the players are split into bands of adjacent
+        score groups that are paired independently. When a band cannot be
+        paired on its own the whole field is paired at once instead.
+
+        Bands are paired concurrently on `executor`, or on a process pool
+        with `workers` processes created for this call. Results are merged
+        in band order, so the pairing is the same as the serial one. Work
+        done on an executor is timed, but not counted.
+        """
+        assert len(to_match) % 2 == 0
+        instrumentation = self.instrumentation
+        self._solution = None
 
-    def unique_game_cost(self, sp1: ScoredPlayer, sp2: ScoredPlayer) -> int:
-        if not self.scores.have_played(sp1, sp2):
-            return Weight.unique_game_weight.value
-        return 0
+        with phase(instrumentation, "context"):
+            ctx = PairingContext.from_scores(self.scores, to_match, forbidden)
 
-    def balance_color_cost(
-        self, sp1: ScoredPlayer, sp2: ScoredPlayer
-    ) -> float:
-        if self.make_game(sp1, sp2).handicap:
-            return 0
+        pairs = None
+        if band_size is not None:
+            with phase(instrumentation, "bands"):
+                pairs = self._pair_bands(ctx, band_size, executor, workers)
+        if pairs is None:
+            pairs = self._pair_field(ctx, radius)
 
-        p1_cb = sp1.color_balance
-        p2_cb = sp2.color_balance
+        with phase(instrumentation, "games"):
+            return self._make_games(ctx, pairs)
 
-        if p1_cb * p2_cb < 0:
-            # color balance corrected for both players
-            k = 1
-        elif p1_cb * p2_cb == 0 and (p1_cb > 1 or p2_cb > 1):
-            # color balance corrected for one player
-            k = 0.5
+    def repair(
+        self,
+        previous_pairing: list[Game],
+        removed: Iterable[str] = (),
+        added: Iterable[str] = (),
+        forbidden: Iterable[tuple[str, str]] = (),
+    ) -> list[Game]:
+        """
+        Re-pair after a few players are withdrawn or added, or some pairs
+        are forbidden.
+
+        The result is the pairing `make_pairing` would return for the
+        previous players without `removed`, followed by `added`, and with
+        `forbidden` as its forbidden pairs. If the previous pairing was the
+        last full-field blossom solve of this instance, the solve starts
+        from it: unaffected pairs are kept and only the players around the
+        changes are re-matched. Otherwise the field is paired from scratch.
+        """
+        removed = set(removed)
+        solution = self._solution
+        previous_ids = [
+            player_id
+            for game in previous_pairing
+            for player_id in (game.black_id, game.white_id)
+        ]
+
+        if (
+            solution is None
+            or solution.version != self.scores.version
+            or set(solution.ctx.player_ids) != set(previous_ids)
+        ):
+            solution = None
         else:
-            k = 0
+            previous_ids = solution.ctx.player_ids
 
-        return k * Weight.color_weight.value
+        keep = [i for i, pid in enumerate(previous_ids) if pid not in removed]
+        to_match = [previous_ids[i] for i in keep]
+        to_match += [
+            pid for pid in dict.fromkeys(added) if pid not in to_match
+        ]
+        if solution is None:
+            return self.make_pairing(to_match, forbidden=forbidden)
 
-    def score_difference_cost(
-        self,
-        sp1: ScoredPlayer,
-        sp2: ScoredPlayer,
-    ) -> float:
-        score_groups = self.scores.score_groups
-
-        p1_group = score_groups.index(sp1.score)
-        p2_group = score_groups.index(sp2.score)
+        assert len(to_match) % 2 == 0
+        with phase(self.instrumentation, "repair"):
+            ctx = PairingContext.from_scores(self.scores, to_match, forbidden)
+            result = repair_matching(
+                solution.state,
+                keep,
+                len(to_match) - len(keep),
+                self._changed_edges(ctx, solution.ctx, keep),
+                self._mates(ctx, previous_pairing),
+                self.instrumentation,
+            )
+        if result is None:
+            return self.make_pairing(to_match, forbidden=forbidden)
 
-        x = abs(p1_group - p2_group) / len(score_groups)
-        return (1 - x) * (1 + x / 2) * Weight.score_weight.value
+        pairs, state = result
+        self._solution = _Solution(ctx, state, self.scores.version)
+        return self._make_games(ctx, pairs)
 
-    def balance_seeding_cost(
+    def _changed_edges(
         self,
-        sp1: ScoredPlayer,
-        sp2: ScoredPlayer,
-    ) -> float:
-        if sp1.score == sp2.score:
-            k = self._seeding_coefficient(sp1, sp2)
-            return k * Weight.seeding_weight.value
-
-        if abs(sp1.score - sp2.score) >= 1.5:
+        ctx: PairingContext,
+        previous_ctx: PairingContext,
+        keep: list[int],
+    ) -> dict[tuple[int, int], float]:
+        """
+        Weights of the edges of the added players, and of the pairs whose
+        forbidden status changed since the previous solve.
+        """
+        position = {k: i for i, k in enumerate(keep)}
+        changed = {}
+
+        for i, k in enumerate(keep):
+            was_forbidden = {
+                position[j] for j in previous_ctx.forbidden[k] if j in position
+            }
+            for j in ctx.forbidden[i] ^ was_forbidden:
+                edge = min(i, j), max(i, j)
+                changed[edge] = self._edge_weight(ctx, *edge)
+
+        for j in range(len(keep), len(ctx)):
+            for i in range(j):
+                changed[i, j] = self._edge_weight(ctx, i, j)
+
+        return changed
+
+    def _edge_weight(self, ctx: PairingContext, i: int, j: int) -> float:
+        if j in ctx.forbidden[i]:
             return 0
+        return self.costs.calculate_cost(ctx, i, j)
+
+    def _mates(self, ctx: PairingContext, pairing: list[Game]) -> list[int]:
+        mates = [-1] * len(ctx)
+        for game in pairing:
+            i = ctx.index.get(game.black_id)
+            j = ctx.index.get(game.white_id)
+            if i is not None and j is not None:
+                mates[i], mates[j] = j, i
+        return mates
+
+    def _make_games(
+        self, ctx: PairingContext, pairs: list[tuple[int, int]]
+    ) -> list[Game]:
+        return sorted(
+            [self._make_game(ctx, i, j) for i, j in pairs],
+            key=lambda game: game.black_id,
+        )
 
-        if sp1.score > sp2.score:
-            sp1, sp2 = sp2, sp1
+    def _pair_field(
+        self, ctx: PairingContext, radius: int | None = None
+    ) -> list[tuple[int, int]]:
+        if radius is None:
+            with phase(self.instrumentation, "weights"):
+                weights = self.costs.make_weights(ctx, self.engine)
+            with phase(self.instrumentation, "matching"):
+                if self.backend == MatchingBackend.BLOSSOM:
+                    pairs, state = blossom_solve(weights, self.instrumentation)
+                    self._solution = _Solution(ctx, state, self.scores.version)
+                    return pairs
+                return max_weight_matching(
+                    weights, self.backend, self.instrumentation
+                )
 
-        scenario_coef = self._dudd_scenario(sp1, sp2)
-        float_up_coef = self._floating_coef(sp1, self.parameters.float_up_mode)
-        float_down_coef = self._floating_coef(
-            sp2, self.parameters.float_down_mode
-        )
+        if radius < 0:
+            raise ValueError("Radius must not be negative.")
+        span = max(ctx.group, default=0) - min(ctx.group, default=0)
+
+        while True:
+            with phase(self.instrumentation, "weights"):
+                edges = self.costs.make_edges(ctx, self.engine, radius)
+            # only the blossom solver has the duals that prove optimality
+            with phase(self.instrumentation, "matching"):
+                pairs, state = blossom_solve_edges(
+                    len(ctx), edges, self.instrumentation
+                )
 
-        k = (scenario_coef + float_up_coef + float_down_coef) / 10
+            if radius >= span:
+                return pairs
+            if 2 * len(pairs) == len(ctx) and self._is_optimal(
+                ctx, state, radius
+            ):
+                return pairs
+            radius = max(2 * radius, 1)
+
+    def _is_optimal(
+        self, ctx: PairingContext, state: BlossomState, radius: int
+    ) -> bool:
+        """
+        Whether the perfect matching of a sparse solve is also optimal on
+        the complete graph.
+
+        The duals are feasible for the missing edges too if every two
+        vertices more than `radius` groups apart have doubled duals of at
+        least twice the integer weight that `cost_bound` allows them.
+        Blossom duals are non-negative and only add slack.
+        """
+        low: dict[int, int] = {}
+        for i, dual in enumerate(state.duals):
+            group = ctx.group[i]
+            low[group] = min(low.get(group, dual), dual)
+
+        for g, h in itertools.combinations(sorted(low), 2):
+            if h - g > radius:
+                bound = self.costs.cost_bound(ctx, h - g)
+                weight = Fraction(bound) * state.scale + state.offset
+                if low[g] + low[h] < 2 * weight:
+                    return False
+        return True
+
+    def _pair_bands(
+        self,
+        ctx: PairingContext,
+        band_size: int,
+        executor: "Executor | None" = None,
+        workers: int | None = None,
+    ) -> list[tuple[int, int]] | None:
+        bands = make_bands(ctx, self.costs, self.engine, band_size)
+        subsets = [ctx.subset(band) for band in bands]
+
+        if executor is None and workers is None:
+            pair = partial(
+                pair_band,
+                costs=self.costs,
+                engine=self.engine,
+                backend=self.backend,
+                instrumentation=self.instrumentation,
+            )
+        else:
+            # counters do not cross process boundaries
+            pair = partial(
+                pair_band,
+                costs=CostModel(self.parameters, self.arithmetic),
+                engine=self.engine,
+                backend=self.backend,
+            )
+        results = map_with_executor(pair, subsets, executor, workers)
 
-        return k * Weight.dudd_weight.value
+        pairs = []
+        for band, band_pairs in zip(bands, results):
+            if band_pairs is None:
+                return None
+            pairs += [(band[i], band[j]) for i, j in band_pairs]
+        return pairs
 
-    def _seeding_coefficient(self, sp1: ScoredPlayer, sp2: ScoredPlayer):
-        score_group = self.scores.score_group(sp1.score)
+    def calculate_cost(self, player1_id: str, player2_id: str) -> float:
+        ctx = PairingContext.from_scores(self.scores, [player1_id, player2_id])
+        return self.costs.calculate_cost(ctx, 0, 1)
 
-        p1_idx = score_group.index(sp1)
-        p2_idx = score_group.index(sp2)
-        group_size = len(score_group)
-        mode = self.parameters.seeding_mode
+    def unique_game_cost(self, sp1: ScoredPlayer, sp2: ScoredPlayer) -> int:
+        ctx = self._pair_context(sp1, sp2)
+        return self.costs.unique_game_cost(ctx, 0, 1)
 
-        return seeding_coefficient(p1_idx, p2_idx, group_size, mode)
+    def balance_color_cost(
+        self, sp1: ScoredPlayer, sp2: ScoredPlayer
+    ) -> float:
+        ctx = self._pair_context(sp1, sp2)
+        return self.costs.balance_color_cost(ctx, 0, 1)
 
-    def _floating_coef(self, sp: ScoredPlayer, mode: FloatingMode):
-        score_group = self.scores.score_group(sp.score)
+    def score_difference_cost(
+        self, sp1: ScoredPlayer, sp2: ScoredPlayer
+    ) -> float:
+        ctx = self._pair_context(sp1, sp2)
+        return self.costs.score_difference_cost(ctx, 0, 1)
 
-        place = score_group.index(sp)
-        size = len(score_group)
+    def balance_seeding_cost(
+        self, sp1: ScoredPlayer, sp2: ScoredPlayer
+    ) -> float:
+        ctx = self._pair_context(sp1, sp2)
+        return self.costs.balance_seeding_cost(ctx, 0, 1)
 
-        return floating_coefficient(mode, place, size)
+    def _pair_context(
+        self, sp1: ScoredPlayer, sp2: ScoredPlayer
+    ) -> PairingContext:
+        return PairingContext.from_scores(
+            self.scores, [sp1.player_id, sp2.player_id]
+        )
 
-    def _dudd_scenario(self, sp1: ScoredPlayer, sp2: ScoredPlayer) -> int:
-        scenario = 2  # normal conditions
-        if sp1.draw_ups:
-            scenario -= 1  # avoid drawing up the same player
-        if sp2.draw_downs:
-            scenario -= 1  # avoid drawing down the same player
+    def make_game(self, sp1: ScoredPlayer, sp2: ScoredPlayer) -> Game:
+        return self._make_game(self._pair_context(sp1, sp2), 0, 1)
 
-        if scenario != 0 and self.parameters.dudd_compensate:
-            if sp1.draw_ups < sp1.draw_downs:
-                scenario += 1  # correct draw-ups for sp1
-            if sp2.draw_downs < sp2.draw_ups:
-                scenario += 1  # correct draw-downs for sp2
+    def _break_color_tie(self, id1: str, id2: str) -> tuple[str, str]:
+        match self.color_tie_break:
+            case ColorTieBreak.SEEDED:
+                black_id, white_id = random.Random(id1 + id2).sample(
+                    [id1, id2], k=2
+                )
+                return black_id, white_id
+            case ColorTieBreak.HASH:
+                id1, id2 = sorted((id1, id2))
+                if zlib.crc32(f"{id1}\0{id2}".encode()) & 1:
+                    return id2, id1
+                return id1, id2
+            case _:
+                raise ValueError(
+                    f"Unknown colour tie-break: {self.color_tie_break}"
+                )
 
-        return scenario * 2
+    def _make_game(self, ctx: PairingContext, i: int, j: int) -> Game:
+        if ctx.rank[i] > ctx.rank[j]:
+            i, j = j, i
 
-    def make_game(self, sp1: ScoredPlayer, sp2: ScoredPlayer) -> Game:
-        if sp1.rank > sp2.rank:
-            sp1, sp2 = sp2, sp1
-
-        handicap = calculate_handicap(
-            r1=sp1.rank,
-            r2=sp2.rank,
-            hd_bar=self.parameters.hd_bar,
-            hd_adj=self.parameters.hd_adj,
-            hd_max=self.parameters.hd_max,
-        )
+        handicap = self.costs.handicap(ctx, i, j)
+        id1, id2 = ctx.player_ids[i], ctx.player_ids[j]
 
-        if handicap or sp1.color_balance > sp2.color_balance:
-            black_id, white_id = sp1.player_id, sp2.player_id
-        elif sp1.color_balance < sp2.color_balance:
-            black_id, white_id = sp2.player_id, sp1.player_id
+        if handicap or ctx.color_balance[i] > ctx.color_balance[j]:
+            black_id, white_id = id1, id2
+        elif ctx.color_balance[i] < ctx.color_balance[j]:
+            black_id, white_id = id2, id1
         else:
-            random.seed((sp1.player_id + sp2.player_id))
-            black_id, white_id = random.sample(
-                [sp1.player_id, sp2.player_id],
-                k=2,
-            )
+            black_id, white_id = self._break_color_tie(id1, id2)
 
-        return Game(
+        return fast_construct(
+            Game,
             black_id=black_id,
             white_id=white_id,
             handicap=handicap,
@@ -0,0 +1,879 @@
+from collections import deque
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+from mmlib.constants import MatchingBackend
+from mmlib.instrumentation import Instrumentation
+
+Weights = Sequence[Sequence[float]]
+Edges = Sequence[tuple[int, int, float]]
+
+
+def max_weight_matching(
+    weights: Weights,
+    backend: MatchingBackend,
+    instrumentation: Instrumentation | None = None,
+) -> list[tuple[int, int]]:
+    """
+    Maximum-cardinality matching of maximum weight on a dense weight matrix.
+
+    `weights` is a symmetric square matrix (nested lists or a NumPy array)
+    where a non-positive entry means that there is no edge between the two
+    vertices. Returns the matched pairs as `(i, j)` index tuples.
+    """
+    match backend:
+        case MatchingBackend.NETWORKX:
+            return networkx_matching(weights, instrumentation)
+        case MatchingBackend.BLOSSOM:
+            return blossom_matching(weights, instrumentation)
+        case _:
+            raise ValueError(f"Unknown matching backend: {backend}")
+
+
+def edge_matching(
+    n: int,
+    edges: Edges,
+    backend: MatchingBackend,
+    instrumentation: Instrumentation | None = None,
+) -> list[tuple[int, int]]:
+    """
+    `max_weight_matching` on the `n` vertices of a graph given by its
+    `(i, j, weight)` edges; pairs that are not listed have no edge.
+    """
+    match backend:
+        case MatchingBackend.NETWORKX:
+            return _networkx_edge_matching(edges, instrumentation)
+        case MatchingBackend.BLOSSOM:
+            pairs, _ = blossom_solve_edges(n, edges, instrumentation)
+            return pairs
+        case _:
+            raise ValueError(f"Unknown matching backend: {backend}")
+
+
+def networkx_matching(
+    weights: Weights, instrumentation: Instrumentation | None = None
+) -> list[tuple[int, int]]:
+    weights = _as_lists(weights)
+    edges = [
+        (i, j, row[j])
+        for i, row in enumerate(weights)
+        for j in range(i + 1, len(row))
+    ]
+    return _networkx_edge_matching(edges, instrumentation)
+
+
+def _networkx_edge_matching(
+    edges: Edges, instrumentation: Instrumentation | None
+) -> list[tuple[int, int]]:
+    # networkx takes longer to import than the rest of mmlib
+    import networkx as nx
+
+    graph = nx.Graph()
+    for i, j, w in edges:
+        if w > 0:
+            graph.add_edge(i, j, weight=w)
+
+    if instrumentation is not None:
+        instrumentation.count("edges", graph.number_of_edges())
+
+    return list(nx.max_weight_matching(graph, maxcardinality=True))
+
+
+def blossom_matching(
+    weights: Weights, instrumentation: Instrumentation | None = None
+) -> list[tuple[int, int]]:
+    pairs, _ = blossom_solve(weights, instrumentation)
+    return pairs
+
+
+@dataclass
+class BlossomState:
+    """
+    Optimal solution of a blossom solve that a later solve can start from.
+
+    `weights` are the integer weights the solver ran on: the float weights
+    times `scale`, plus `offset` on every edge. `duals` are the doubled
+    vertex duals and `mates` the partner of every vertex, or -1.
+
+    `blossoms` are the blossoms of the solution with their doubled duals,
+    every one after the blossoms it contains. A blossom lists its children
+    around its cycle, starting from its base: index `i` is vertex `i` below
+    the number of vertices, and blossom `i - n` of the list from `n` on.
+    """
+
+    weights: list[list[int]]
+    scale: int
+    offset: int
+    duals: list[int]
+    mates: list[int]
+    blossoms: list[tuple[list[int], int]]
+
+
+def blossom_solve(
+    weights: Weights, instrumentation: Instrumentation | None = None
+) -> tuple[list[tuple[int, int]], BlossomState]:
+    integer_weights, scale = _as_integer_weights(_as_lists(weights))
+    n_edges = sum(
+        w > 0 for i, row in enumerate(integer_weights) for w in row[i + 1 :]
+    )
+    return _blossom_solve(integer_weights, scale, n_edges, instrumentation)
+
+
+def blossom_solve_edges(
+    n: int, edges: Edges, instrumentation: Instrumentation | None = None
+) -> tuple[list[tuple[int, int]], BlossomState]:
+    """
+    `blossom_solve` on the `n` vertices of a graph given by its
+    `(i, j, weight)` edges. The solver scans only the listed edges, but
+    still keeps O(n²) tables.
+    """
+    integer_edges, scale = _as_integer_edges(edges)
+    weights = [[0] * n for _ in range(n)]
+    for i, j, w in integer_edges:
+        weights[i][j] = weights[j][i] = w
+    return _blossom_solve(weights, scale, len(integer_edges), instrumentation)
+
+
+def _blossom_solve(
+    weights: list[list[int]],
+    scale: int,
+    n_edges: int,
+    instrumentation: Instrumentation | None,
+) -> tuple[list[tuple[int, int]], BlossomState]:
+    solver = DenseBlossom(weights)
+    pairs = solver.solve()
+
+    if instrumentation is not None:
+        instrumentation.count("edges", n_edges)
+        instrumentation.count("matching_iterations", solver.stages)
+
+    return pairs, solver.state(scale)
+
+
+def repair_matching(
+    state: BlossomState,
+    keep: list[int],
+    n_added: int,
+    updates: dict[tuple[int, int], float],
+    mates: list[int],
+    instrumentation: Instrumentation | None = None,
+) -> tuple[list[tuple[int, int]], BlossomState] | None:
+    """
+    Re-solve a previous blossom solution after a few changes.
+
+    The new vertices are the `keep` vertices of `state` followed by
+    `n_added` new ones. `updates` sets the float weight of the edges that
+    are new or changed, 0 meaning no edge, and `mates` is the matching to
+    start from. The pairs and blossoms around the changes are undone, which
+    frees about one vertex per change, and only the free vertices are
+    re-matched.
+
+    Returns None if the new graph has no perfect matching; a full solve
+    decides then.
+    """
+    solver, scale = _repair_solver(state, keep, n_added, updates, mates)
+    pairs = solver.solve()
+
+    if instrumentation is not None:
+        instrumentation.count("matching_iterations", solver.stages)
+
+    if 2 * len(pairs) != solver.n:
+        return None
+    return pairs, solver.state(scale)
+
+
+def _repair_solver(
+    state: BlossomState,
+    keep: list[int],
+    n_added: int,
+    updates: dict[tuple[int, int], float],
+    mates: list[int],
+) -> tuple["DenseBlossom", int]:
+    """
+    A perfect matching solver primed with the previous solution, and the
+    scale of its weights.
+
+    Removed vertices, vertices whose mate differs from `state` and the ends
+    of updated edges that are matched, inside a common blossom or no longer
+    feasible are exposed (see `_BlossomForest.expose`); every other pair
+    and blossom is kept as it is.
+    """
+    ratios = {
+        edge: w.as_integer_ratio() if w > 0 else (0, 1)
+        for edge, w in updates.items()
+    }
+    scale = max([state.scale] + [d for _, d in ratios.values()])
+    factor = scale // state.scale
+    offset = state.offset * factor
+
+    n_old = len(state.duals)
+    n = len(keep) + n_added
+    position = {a: i for i, a in enumerate(keep)}
+    weights = [
+        [state.weights[a][b] * factor for b in keep] + [0] * n_added
+        for a in keep
+    ] + [[0] * n for _ in range(n_added)]
+
+    for (i, j), (numerator, denominator) in ratios.items():
+        w = numerator * (scale // denominator) + offset if numerator else 0
+        weights[i][j] = weights[j][i] = w
+
+    forest = _BlossomForest(state)
+    stale = [
+        a
+        for u, a in enumerate(keep)
+        if mates[u] != position.get(state.mates[a], -1)
+    ]
+    for a in range(n_old):
+        if a not in position:
+            forest.expose(a)
+    for a in stale:
+        forest.expose(a)
+    for i, j in updates:
+        if max(i, j) >= len(keep):
+            continue
+        a, b = keep[i], keep[j]
+        if forest.mates[a] == b or forest.share_blossom(a, b):
+            forest.expose(a)
+            forest.expose(b)
+        elif 2 * weights[i][j] > (forest.duals[a] + forest.duals[b]) * factor:
+            forest.expose(a)
+
+    # the kept blossoms, renumbered; `None` marks one dissolved below
+    ids: dict[int, int] = {}
+    blossoms: list[tuple[list[int], int] | None] = []
+    for k, (flower, dual) in enumerate(forest.blossoms()):
+        ids[k] = n + len(blossoms)
+        blossoms.append(
+            (
+                [position[x] if x < n_old else ids[x - n_old] for x in flower],
+                dual * factor,
+            )
+        )
+    parent = [-1] * (n + len(blossoms))
+    for k, (flower, _) in enumerate(blossoms):
+        for x in flower:
+            parent[x] = n + k
+
+    duals: list[int | None] = [forest.duals[a] * factor for a in keep]
+    duals += [None] * n_added
+    mates = [position.get(forest.mates[a], -1) for a in keep]
+    mates += [-1] * n_added
+
+    def ancestors(u: int) -> Iterator[int]:
+        x = parent[u]
+        while x >= 0:
+            yield x
+            x = parent[x]
+
+    def members(x: int) -> Iterator[int]:
+        if x < n:
+            yield x
+        else:
+            for y in blossoms[x - n][0]:
+                yield from members(y)
+
+    # new vertices get the smallest feasible dual
+    for v in range(len(keep), n):
+        duals[v] = max(
+            [0]
+            + [
+                2 * w - duals[u]
+                for u, w in enumerate(weights[v])
+                if w > 0 and duals[u] is not None
+            ]
+        )
+
+    # changed edges between known vertices must stay feasible; the vertex
+    # raised was exposed
+    for i, j in updates:
+        deficit = 2 * weights[i][j] - duals[i] - duals[j]
+        if weights[i][j] > 0 and deficit > 0:
+            duals[i] += deficit
+
+    # trees grown from free vertices need duals of the same parity; a free
+    # vertex is the base of its blossoms, whose vertices share its parity
+    for u in range(n):
+        while mates[u] < 0 and duals[u] % 2:
+            # parents come after their children
+            top = max(ancestors(u), default=None)
+            if top is None:
+                duals[u] += 1
+            elif blossoms[top - n][1] >= 2:
+                flower, dual = blossoms[top - n]
+                blossoms[top - n] = flower, dual - 2
+                for v in members(top):
+                    duals[v] += 1
+            else:
+                # a blossom without dual is dissolved as it is
+                for x in blossoms[top - n][0]:
+                    parent[x] = -1
+                blossoms[top - n] = None
+
+    kept = {}
+    for k, blossom in enumerate(blossoms):
+        if blossom is not None:
+            kept[n + k] = n + len(kept)
+    solver = DenseBlossom(weights, perfect=True)
+    # the weights already carry the offset of the first solve
+    solver.offset = offset
+    solver.start(
+        duals,
+        mates,
+        [
+            ([x if x < n else kept[x] for x in flower], dual)
+            for flower, dual in filter(None, blossoms)
+        ],
+    )
+    return solver, scale
+
+
+class _BlossomForest:
+    """
+    The matching, duals and blossoms of a `BlossomState`, edited in place.
+
+    Every edit keeps the duals feasible and the matched edges and the
+    cycles of the blossoms tight.
+    """
+
+    def __init__(self, state: BlossomState):
+        self.n = n = len(state.duals)
+        self.weights = state.weights
+        self.duals = list(state.duals)
+        self.mates = list(state.mates)
+        self.flowers = [list(flower) for flower, _ in state.blossoms]
+        self.blossom_duals = [dual for _, dual in state.blossoms]
+        self.parent = [-1] * (n + len(state.blossoms))
+        for k, flower in enumerate(self.flowers):
+            for x in flower:
+                self.parent[x] = n + k
+        self.dissolved = [False] * len(state.blossoms)
+
+    def blossoms(self) -> Iterator[tuple[list[int], int]]:
+        """The remaining blossoms, numbered as in `BlossomState`."""
+        ids = {}
+        for k, flower in enumerate(self.flowers):
+            if not self.dissolved[k]:
+                ids[self.n + k] = self.n + len(ids)
+                yield (
+                    [x if x < self.n else ids[x] for x in flower],
+                    self.blossom_duals[k],
+                )
+
+    def expose(self, v: int) -> None:
+        """
+        Unmatch `v` and dissolve its blossoms, freeing at most one other
+        vertex.
+
+        The top blossom of `v` is first rematched so that `v` is its base,
+        i.e. along the even side of the cycle from the old base to `v`; the
+        mate of the old base is freed. The blossoms around `v` then have
+        no matched edge leaving them, and half of their duals goes to each
+        of their vertices, which keeps every edge inside them as tight.
+        """
+        chain = list(self._ancestors(v))
+        mates = self.mates
+        if chain:
+            base = chain[-1]
+            while base >= self.n:
+                base = self.flowers[base - self.n][0]
+            if mates[base] >= 0:
+                mates[mates[base]] = -1
+            mates[base] = -1
+            self._rebase(chain[-1], v, 0)
+        elif mates[v] >= 0:
+            mates[mates[v]] = -1
+        mates[v] = -1
+
+        for x in chain:
+            half = self.blossom_duals[x - self.n] // 2
+            for u in self._members(x):
+                self.duals[u] += half
+            for y in self.flowers[x - self.n]:
+                self.parent[y] = -1
+            self.dissolved[x - self.n] = True
+
+    def share_blossom(self, a: int, b: int) -> bool:
+        return not set(self._ancestors(a)).isdisjoint(self._ancestors(b))
+
+    def _ancestors(self, u: int) -> Iterator[int]:
+        x = self.parent[u]
+        while x >= 0:
+            yield x
+            x = self.parent[x]
+
+    def _members(self, x: int) -> Iterator[int]:
+        if x < self.n:
+            yield x
+        else:
+            for y in self.flowers[x - self.n]:
+                yield from self._members(y)
+
+    def _rebase(self, x: int, v: int, outer: int) -> None:
+        # match all of `x` but `v` inside it; `outer` is the sum of the
+        # duals of the blossoms around `x`
+        if x < self.n:
+            return
+        flower = self.flowers[x - self.n]
+        inner = outer + self.blossom_duals[x - self.n]
+        child = v
+        while self.parent[child] != x:
+            child = self.parent[child]
+        k = flower.index(child)
+        self._rebase(child, v, inner)
+        if k == 0:
+            return
+
+        # the even side of the cycle from the base to `child`
+        if k % 2 == 0:
+            path = flower[: k + 1]
+            self.flowers[x - self.n] = flower[k:] + flower[:k]
+        else:
+            path = flower[:1] + flower[: k - 1 : -1]
+            self.flowers[x - self.n] = flower[k::-1] + flower[:k:-1]
+        for y, z in zip(path[:-1:2], path[1::2]):
+            a, b = self._tight_edge(y, z, inner)
+            self._rebase(y, a, inner)
+            self._rebase(z, b, inner)
+            self.mates[a], self.mates[b] = b, a
+
+    def _tight_edge(self, x: int, y: int, dual: int) -> tuple[int, int]:
+        weights, duals = self.weights, self.duals
+        for a in self._members(x):
+            for b in self._members(y):
+                w = weights[a][b]
+                if w > 0 and duals[a] + duals[b] + dual == 2 * w:
+                    return a, b
+        raise AssertionError("A blossom cycle is not tight.")
+
+
+def _as_lists(weights: Weights) -> list[list[float]]:
+    if hasattr(weights, "tolist"):
+        return weights.tolist()
+    return [list(row) for row in weights]
+
+
+def _as_integer_weights(
+    weights: list[list[float]],
+) -> tuple[list[list[int]], int]:
+    """
+    Scale the weights to integers without losing precision.
+
+    Floats are dyadic rationals, so multiplying every weight by the largest
+    denominator is exact. Non-positive weights are edges that do not exist.
+    Integer weights, e.g. fixed-point costs, are used as they are.
+    """
+    if all(type(w) is int for row in weights for w in row):
+        return [[w if w > 0 else 0 for w in row] for row in weights], 1
+
+    ratios = [
+        [w.as_integer_ratio() if w > 0 else (0, 1) for w in row]
+        for row in weights
+    ]
+    scale = max((d for row in ratios for _, d in row), default=1)
+
+    return [[n * (scale // d) for n, d in row] for row in ratios], scale
+
+
+def _as_integer_edges(
+    edges: Edges,
+) -> tuple[list[tuple[int, int, int]], int]:
+    """`_as_integer_weights` for an edge list; drops the non-edges."""
+    edges = [(i, j, w) for i, j, w in edges if w > 0]
+    if all(type(w) is int for _, _, w in edges):
+        return edges, 1
+
+    ratios = [(i, j, *w.as_integer_ratio()) for i, j, w in edges]
+    scale = max((d for *_, d in ratios), default=1)
+
+    return [(i, j, n * (scale // d)) for i, j, n, d in ratios], scale
+
+
+class DenseBlossom:
+    """
+    O(n³) primal-dual weighted blossom algorithm on a dense integer matrix.
+
+    Vertices are numbered from 1 to n and blossoms from n + 1 to 2n; index 0
+    stands for "none". `lab` holds doubled vertex duals and blossom duals,
+    so with integer weights all the arithmetic stays integral and exact.
+
+    With `perfect`, the solver looks for a maximum weight perfect matching
+    instead. Duals may then become negative, which lets a solve start from
+    any feasible duals and tight matching (see `repair_matching`).
+    """
+
+    def __init__(self, weights: list[list[int]], perfect: bool = False):
+        n = len(weights)
+        size = 2 * n + 1
+
+        # a matching of maximum weight must also have maximum cardinality
+        w_max = max((w for row in weights for w in row), default=0)
+        self.offset = 0
+        if not perfect and any(
+            weights[i][j] <= 0 for i in range(n) for j in range(n) if i != j
+        ):
+            self.offset = w_max * (n // 2) + 1
+            weights = [
+                [w + self.offset if w > 0 else 0 for w in row]
+                for row in weights
+            ]
+            w_max += self.offset
+
+        self.weights = weights
+        self.perfect = perfect
+        self.n = n
+        self.n_x = n
+        self.gu = [[0] * size for _ in range(size)]
+        self.gv = [[0] * size for _ in range(size)]
+        self.gw = [[0] * size for _ in range(size)]
+        for u in range(1, n + 1):
+            gu, gv, gw = self.gu[u], self.gv[u], self.gw[u]
+            row = weights[u - 1]
+            for v in range(1, n + 1):
+                gu[v] = u
+                gv[v] = v
+                gw[v] = row[v - 1] if u != v else 0
+        # the edges between vertices never change, so a sparse graph is
+        # scanned in O(edges)
+        self.neighbors = [[]] + [
+            [v for v in range(1, n + 1) if self.gw[u][v] > 0]
+            for u in range(1, n + 1)
+        ]
+
+        self.lab = [0] + [w_max] * n + [0] * n
+        self.match = [0] * size
+        self.slack = [0] * size
+        self.st = list(range(n + 1)) + [0] * n
+        self.pa = [0] * size
+        self.S = [0] * size
+        self.vis = [0] * size
+        self.flower_from = [[0] * (n + 1) for _ in range(size)]
+        for u in range(1, n + 1):
+            self.flower_from[u][u] = u
+        self.flower = [[] for _ in range(size)]
+        self.queue = deque()
+        self.timestamp = 0
+        self.stages = 0
+
+    def solve(self) -> list[tuple[int, int]]:
+        while self._matching():
+            self.stages += 1
+
+        return [
+            (u - 1, self.match[u] - 1)
+            for u in range(1, self.n + 1)
+            if self.match[u] > u
+        ]
+
+    def state(self, scale: int) -> BlossomState:
+        n, lab = self.n, self.lab
+        ids: dict[int, int] = {}
+        blossoms: list[tuple[list[int], int]] = []
+
+        def add(b: int) -> None:
+            for x in self.flower[b]:
+                if x > n:
+                    add(x)
+            ids[b] = n + len(blossoms)
+            flower = [x - 1 if x <= n else ids[x] for x in self.flower[b]]
+            blossoms.append((flower, lab[b]))
+
+        for b in range(n + 1, self.n_x + 1):
+            if self.st[b] == b:
+                add(b)
+
+        return BlossomState(
+            weights=self.weights,
+            scale=scale,
+            offset=self.offset,
+            duals=lab[1 : n + 1],
+            mates=[self.match[u] - 1 for u in range(1, n + 1)],
+            blossoms=blossoms,
+        )
+
+    def start(
+        self,
+        duals: list[int],
+        mates: list[int],
+        blossoms: list[tuple[list[int], int]],
+    ) -> None:
+        """
+        Start from feasible `duals` and `blossoms`, laid out as in
+        `BlossomState`, and a matching that is tight under them.
+        """
+        n, lab, match = self.n, self.lab, self.match
+        for u in range(n):
+            lab[u + 1] = duals[u]
+            match[u + 1] = mates[u] + 1
+
+        ids = []
+        for flower, dual in blossoms:
+            self.n_x += 1
+            b = self.n_x
+            ids.append(b)
+            self.flower[b] = [x + 1 if x < n else ids[x - n] for x in flower]
+            lab[b] = dual
+            match[b] = match[self.flower[b][0]]
+            self._init_blossom(b)
+
+    def _dist(self, u: int, v: int) -> int:
+        lab = self.lab
+        return lab[self.gu[u][v]] + lab[self.gv[u][v]] - self.gw[u][v] * 2
+
+    def _update_slack(self, u: int, x: int) -> None:
+        slack = self.slack
+        if not slack[x] or self._dist(u, x) < self._dist(slack[x], x):
+            slack[x] = u
+
+    def _set_slack(self, x: int) -> None:
+        st, S, gw = self.st, self.S, self.gw
+        self.slack[x] = 0
+        for u in range(1, self.n + 1):
+            if gw[u][x] > 0 and st[u] != x and S[st[u]] == 0:
+                self._update_slack(u, x)
+
+    def _q_push(self, x: int) -> None:
+        if x <= self.n:
+            self.queue.append(x)
+        else:
+            for y in self.flower[x]:
+                self._q_push(y)
+
+    def _set_st(self, x: int, b: int) -> None:
+        self.st[x] = b
+        if x > self.n:
+            for y in self.flower[x]:
+                self._set_st(y, b)
+
+    def _get_pr(self, b: int, xr: int) -> int:
+        flower = self.flower[b]
+        pr = flower.index(xr)
+        if pr % 2 == 1:
+            flower[1:] = flower[:0:-1]
+            return len(flower) - pr
+        return pr
+
+    def _set_match(self, u: int, v: int) -> None:
+        self.match[u] = self.gv[u][v]
+        if u > self.n:
+            xr = self.flower_from[u][self.gu[u][v]]
+            pr = self._get_pr(u, xr)
+            flower = self.flower[u]
+            for i in range(pr):
+                self._set_match(flower[i], flower[i ^ 1])
+            self._set_match(xr, v)
+            self.flower[u] = flower[pr:] + flower[:pr]
+
+    def _augment(self, u: int, v: int) -> None:
+        st, pa = self.st, self.pa
+        while True:
+            xnv = st[self.match[u]]
+            self._set_match(u, v)
+            if not xnv:
+                return
+            self._set_match(xnv, st[pa[xnv]])
+            u, v = st[pa[xnv]], xnv
+
+    def _get_lca(self, u: int, v: int) -> int:
+        st, pa, match, vis = self.st, self.pa, self.match, self.vis
+        self.timestamp += 1
+        t = self.timestamp
+        while u or v:
+            if u:
+                if vis[u] == t:
+                    return u
+                vis[u] = t
+                u = st[match[u]]
+                if u:
+                    u = st[pa[u]]
+            u, v = v, u
+        return 0
+
+    def _add_blossom(self, u: int, lca: int, v: int) -> None:
+        n, st, pa, match = self.n, self.st, self.pa, self.match
+
+        b = n + 1
+        while b <= self.n_x and st[b]:
+            b += 1
+        if b > self.n_x:
+            self.n_x += 1
+        self.lab[b] = 0
+        self.S[b] = 0
+        match[b] = match[lca]
+
+        flower = [lca]
+        x = u
+        while x != lca:
+            y = st[match[x]]
+            flower += [x, y]
+            self._q_push(y)
+            x = st[pa[y]]
+        flower[1:] = flower[:0:-1]
+        x = v
+        while x != lca:
+            y = st[match[x]]
+            flower += [x, y]
+            self._q_push(y)
+            x = st[pa[y]]
+        self.flower[b] = flower
+        self._init_blossom(b)
+        self._set_slack(b)
+
+    def _init_blossom(self, b: int) -> None:
+        n, gu, gv, gw = self.n, self.gu, self.gv, self.gw
+        self._set_st(b, b)
+        for x in range(1, self.n_x + 1):
+            gw[b][x] = gw[x][b] = 0
+        flower_from = self.flower_from[b]
+        for x in range(1, n + 1):
+            flower_from[x] = 0
+        for xs in self.flower[b]:
+            for x in range(1, self.n_x + 1):
+                if gw[xs][x] > 0 and (
+                    gw[b][x] == 0 or self._dist(xs, x) < self._dist(b, x)
+                ):
+                    gu[b][x], gv[b][x], gw[b][x] = (
+                        gu[xs][x],
+                        gv[xs][x],
+                        gw[xs][x],
+                    )
+                    gu[x][b], gv[x][b], gw[x][b] = (
+                        gu[x][xs],
+                        gv[x][xs],
+                        gw[x][xs],
+                    )
+            xs_flower_from = self.flower_from[xs]
+            for x in range(1, n + 1):
+                if xs_flower_from[x]:
+                    flower_from[x] = xs
+
+    def _expand_blossom(self, b: int) -> None:
+        st, pa, S, slack = self.st, self.pa, self.S, self.slack
+        for x in self.flower[b]:
+            self._set_st(x, x)
+
+        xr = self.flower_from[b][self.gu[b][pa[b]]]
+        pr = self._get_pr(b, xr)
+        flower = self.flower[b]
+        for i in range(0, pr, 2):
+            xs, xns = flower[i], flower[i + 1]
+            pa[xs] = self.gu[xns][xs]
+            S[xs] = 1
+            S[xns] = 0
+            slack[xs] = 0
+            self._set_slack(xns)
+            self._q_push(xns)
+        S[xr] = 1
+        pa[xr] = pa[b]
+        for xs in flower[pr + 1 :]:
+            S[xs] = -1
+            self._set_slack(xs)
+        st[b] = 0
+
+    def _on_found_edge(self, eu: int, ev: int) -> bool:
+        st, S = self.st, self.S
+        u, v = st[eu], st[ev]
+        if S[v] == -1:
+            self.pa[v] = eu
+            S[v] = 1
+            nu = st[self.match[v]]
+            self.slack[v] = self.slack[nu] = 0
+            S[nu] = 0
+            self._q_push(nu)
+        elif S[v] == 0:
+            lca = self._get_lca(u, v)
+            if not lca:
+                self._augment(u, v)
+                self._augment(v, u)
+                return True
+            self._add_blossom(u, lca, v)
+        return False
+
+    def _matching(self) -> bool:
+        n = self.n
+        st, S, slack, lab, pa = self.st, self.S, self.slack, self.lab, self.pa
+        for x in range(1, self.n_x + 1):
+            S[x] = -1
+            slack[x] = 0
+        self.queue = deque()
+        for x in range(1, self.n_x + 1):
+            if st[x] == x and not self.match[x]:
+                pa[x] = 0
+                S[x] = 0
+                self._q_push(x)
+        if not self.queue:
+            return False
+
+        while True:
+            queue = self.queue
+            while queue:
+                u = queue.popleft()
+                if S[st[u]] == 1:
+                    continue
+                st_u, lab_u, gw = st[u], lab[u], self.gw
+                row = gw[u]
+                for v in self.neighbors[u]:
+                    w = row[v]
+                    x = st[v]
+                    if st_u == x:
+                        continue
+                    dist = lab_u + lab[v] - w * 2
+                    if dist == 0:
+                        if self._on_found_edge(u, v):
+                            return True
+                        # u may have been shrunk into a new blossom
+                        st_u = st[u]
+                    elif x == v:
+                        # inlined `_update_slack` for edges between vertices
+                        sx = slack[v]
+                        if not sx or dist < lab[sx] + lab[v] - gw[sx][v] * 2:
+                            slack[v] = u
+                    else:
+                        self._update_slack(u, x)
+
+            d = None
+            for b in range(n + 1, self.n_x + 1):
+                if st[b] == b and S[b] == 1:
+                    d = _min(d, lab[b] // 2)
+            for x in range(1, self.n_x + 1):
+                if st[x] == x and slack[x]:
+                    if S[x] == -1:
+                        d = _min(d, self._dist(slack[x], x))
+                    elif S[x] == 0:
+                        d = _min(d, self._dist(slack[x], x) // 2)
+
+            if d is None:
+                return False
+            for u in range(1, n + 1):
+                if S[st[u]] == 0:
+                    if lab[u] <= d and not self.perfect:
+                        return False
+                    lab[u] -= d
+                elif S[st[u]] == 1:
+                    lab[u] += d
+            for b in range(n + 1, self.n_x + 1):
+                if st[b] == b:
+                    if S[b] == 0:
+                        lab[b] += d * 2
+                    elif S[b] == 1:
+                        lab[b] -= d * 2
+
+            self.queue = deque()
+            for x in range(1, self.n_x + 1):
+                if (
+                    st[x] == x
+                    and slack[x]
+                    and st[slack[x]] != x
+                    and self._dist(slack[x], x) == 0
+                ):
+                    if self._on_found_edge(
+                        self.gu[slack[x]][x], self.gv[slack[x]][x]
+                    ):
+                        return True
+            for b in range(n + 1, self.n_x + 1):
+                if st[b] == b and S[b] == 1 and lab[b] == 0:
+                    self._expand_blossom(b)
+
+
+def _min(a: int | None, b: int) -> int:
+    return b if a is None or b < a else a
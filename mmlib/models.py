@@ -1,9 +1,68 @@
-from pydantic import BaseModel, Field
+from typing import Any, TypeVar
 
-from mmlib.constants import FloatingMode, GameResult, SeedingMode
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.fields import FieldInfo
 
+from mmlib.constants import FloatingMode, GameResult, SeedingMode
 
-class Parameters(BaseModel):
+M = TypeVar("M", bound=BaseModel)
+
+
+_defaults: dict[type[BaseModel], dict[str, FieldInfo]] = {}
+
+
+def fast_construct(cls: type[M], **fields: Any) -> M:
+    """
+    Internal fast path: build a model from values that are already valid,
+    without validation. As with `model_construct`, the fields left out get
+    their defaults and only the given ones count as set.
+
+    Validation is kept for data that comes from outside. `model_construct`
+    is no faster than validation for models this small, as it resolves the
+    defaults of every field in Python; here the fields with a default are
+    looked up once per class.
+    """
+    fields_set = set(fields)
+    if len(fields) < len(cls.model_fields):
+        defaults = _defaults.get(cls)
+        if defaults is None:
+            defaults = _defaults[cls] = {
+                name: field
+                for name, field in cls.model_fields.items()
+                if not field.is_required()
+            }
+        fields = {
+            name: fields[name]
+            if name in fields
+            else defaults[name].get_default(call_default_factory=True)
+            for name in cls.model_fields
+        }
+
+    model = cls.__new__(cls)
+    object.__setattr__(model, "__dict__", fields)
+    object.__setattr__(model, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
+
+
+def fast_copy(model: M, **update: Any) -> M:
+    """Shallow copy of `model` with `update` applied, without validation."""
+    copy = fast_construct(type(model), **{**model.__dict__, **update})
+    object.__setattr__(
+        copy,
+        "__pydantic_fields_set__",
+        model.__pydantic_fields_set__ | update.keys(),
+    )
+    return copy
+
+
+class _Model(BaseModel):
+    # schemas are built on first validation, not on import
+    model_config = ConfigDict(defer_build=True)
+
+
+class Parameters(_Model):
     hd_bar: int = 0
     hd_adj: int = 0
     hd_max: int = 0
@@ -13,14 +72,14 @@ class Parameters(BaseModel):
     seeding_mode: SeedingMode = SeedingMode.CROSS
 
 
-class Player(BaseModel):
+class Player(_Model):
     player_id: str
     rank: int = 0
     smms: int = 0
     is_bye: bool = False
 
 
-class Game(BaseModel):
+class Game(_Model):
     black_id: str
     white_id: str
     handicap: int = 0
@@ -45,22 +104,23 @@ class ScoredPlayer(Player):
 
     @classmethod
     def from_player(cls, player: Player) -> "ScoredPlayer":
-        return cls(
+        return fast_construct(
+            cls,
             player_id=player.player_id,
             rank=player.rank,
             smms=player.smms,
+            is_bye=player.is_bye,
         )
 
     def add_round(self, sg: "ScoredGame | None") -> "ScoredPlayer":
         if sg is None:
-            return self.model_copy(update={"skips": self.skips + 1})
-        return self.model_copy(
-            update={
-                "draw_ups": self.draw_ups + sg.draw_ups(self),
-                "draw_downs": self.draw_downs + sg.draw_downs(self),
-                "points": self.points + sg.points(self),
-                "games": self.games + [sg],
-            },
+            return fast_copy(self, skips=self.skips + 1)
+        return fast_copy(
+            self,
+            draw_ups=self.draw_ups + sg.draw_ups(self),
+            draw_downs=self.draw_downs + sg.draw_downs(self),
+            points=self.points + sg.points(self),
+            games=self.games + [sg],
         )
 
     @property
@@ -76,7 +136,7 @@ class ScoredPlayer(Player):
         return sum(game.color_balance(self) for game in self.games)
 
 
-class ScoredGame(BaseModel):
+class ScoredGame(_Model):
     black: ScoredPlayer
     white: ScoredPlayer
     handicap: int
@@ -86,7 +146,8 @@ class ScoredGame(BaseModel):
     def from_game(
         cls, game: Game, black: ScoredPlayer, white: ScoredPlayer
     ) -> "ScoredGame":
-        return ScoredGame(
+        return fast_construct(
+            ScoredGame,
             black=black,
             white=white,
             handicap=game.handicap,
@@ -150,7 +211,7 @@ class ScoredGame(BaseModel):
         return int(player.score > self.opponent(player).score)
 
 
-class Tournament(BaseModel):
+class Tournament(_Model):
     players: list[Player]
     games: list[list[Game]]
     parameters: Parameters
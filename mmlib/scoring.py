@@ -1,4 +1,16 @@
-from mmlib.models import Game, Player, ScoredGame, ScoredPlayer
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+from mmlib.compat import import_numpy
+from mmlib.constants import Criterion
+from mmlib.instrumentation import Instrumentation, phase
+from mmlib.models import Game, Player, ScoredGame, ScoredPlayer, fast_construct
+from mmlib.store import RESULTS, ScoreStore
+from mmlib.tiebreakers import compute_tiebreakers
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def make_scored_players(
@@ -27,18 +39,14 @@ def make_scored_players(
 
         scored_players = next_scored_players
 
-    # SOS
+    # SOS and SODOS
     for player_id, sp in scored_players.items():
         for game in sp.games:
             opponent = scored_players[game.opponent(sp).player_id]
-            if opponent.is_bye:
-                sp.sos += sp.score
-                if game.points(sp) == 2:
-                    sp.sodos += sp.score
-            else:
-                sp.sos += opponent.score
-                if game.points(sp) == 2:
-                    sp.sodos += sp.score
+            score = sp.score if opponent.is_bye else opponent.score
+            sp.sos += score
+            if game.points(sp) == 1:
+                sp.sodos += score
 
     # SOSOS
     for player_id, sp in scored_players.items():
@@ -53,30 +61,355 @@ def make_scored_players(
 
 
 class ScoresRepository:
+    """
+    Scores of all players, updated incrementally as rounds are played.
+
+    The state lives in a columnar `ScoreStore`. `ScoredPlayer` and
+    `ScoredGame` models are only built when they are asked for and are
+    cached until the next update. `version` is bumped by every update.
+
+    `store.dependents[p]` lists, once per game, every player whose SOS
+    contains the score of `p`: the opponents of `p`, or `p` itself for games
+    against a bye. It lets score and SOS changes be pushed to SOS and SOSOS
+    without replaying the tournament.
+    """
+
     def __init__(
         self,
         players: list[Player],
         games: list[list[Game]],
+        instrumentation: Instrumentation | None = None,
     ):
-        self.data = make_scored_players(players, games)
-        self.score_groups = self._make_score_groups()
+        self.instrumentation = instrumentation
+        self.store = ScoreStore(players)
+        self.version = 0
+        self._groups: dict[int, list[int]] | None = None
+        self._group_numbers = array("i")
+        self._places = array("i")
+        self._snapshots: dict[tuple[int, int], ScoredPlayer] = {}
+        self._scored_games: dict[int, ScoredGame] = {}
+        self._sodos_cache: list[int] | None = None
+
+        for round_games in games:
+            self.add_round(round_games)
 
     def __getitem__(self, item: str) -> ScoredPlayer:
-        return self.data[item]
+        return self._snapshot(self.store.index[item], self.store.n_rounds)
 
-    def _make_score_groups(self) -> list[int]:
-        return sorted({sp.score for sp in self.data.values()}, reverse=True)
+    @classmethod
+    def from_store(
+        cls,
+        store: ScoreStore,
+        instrumentation: Instrumentation | None = None,
+    ) -> "ScoresRepository":
+        scores = cls([], [], instrumentation)
+        scores.store = store
+        return scores
 
-    def score_group(self, score: int) -> list[ScoredPlayer]:
-        return sorted(
-            [
-                scored_player
-                for scored_player in self.data.values()
-                if scored_player.score == score
-            ],
-            key=lambda sp: (-sp.mms, -sp.rank),
-            reverse=True,
+    @property
+    def players(self) -> list[Player]:
+        """The players, rebuilt from the store."""
+        store = self.store
+        return [
+            fast_construct(
+                Player,
+                player_id=player_id,
+                rank=store.rank[i],
+                smms=store.smms[i],
+                is_bye=bool(store.is_bye[i]),
+            )
+            for i, player_id in enumerate(store.player_ids)
+        ]
+
+    @property
+    def rounds(self) -> list[list[Game]]:
+        """The games played so far, rebuilt from the store."""
+        store = self.store
+        rounds: list[list[Game]] = [[] for _ in range(store.n_rounds)]
+        for g in range(store.n_games):
+            rounds[store.round[g]].append(self._game(g))
+        return rounds
+
+    @property
+    def data(self) -> dict[str, ScoredPlayer]:
+        return {player_id: self[player_id] for player_id in self.store.index}
+
+    def add_round(self, games: list[Game]) -> None:
+        with phase(self.instrumentation, "scoring"):
+            self._add_round(games)
+
+    def _add_round(self, games: list[Game]) -> None:
+        store = self.store
+        store.thaw()
+        old_scores = [store.score(i) for i in range(len(store))]
+
+        new_games = [store.add_game(game, store.n_rounds) for game in games]
+
+        played = bytearray(len(store))
+        new_terms = []
+        for g in new_games:
+            for i in (store.black[g], store.white[g]):
+                played[i] = 1
+                store.half_points[i] += store.game_half_points(g, i)
+                store.draw_ups[i] += store.game_draw_ups(g, i)
+                store.draw_downs[i] += store.game_draw_downs(g, i)
+                store.color_balance[i] += store.game_color_balance(g, i)
+
+                opponent = store.opponent(g, i)
+                new_terms.append(
+                    (i, i if store.is_bye[opponent] else opponent)
+                )
+
+        for i in range(len(store)):
+            if not played[i]:
+                store.skips[i] += 1
+
+        store.n_rounds += 1
+
+        self._propagate(
+            {
+                i: store.score(i) - old_score
+                for i, old_score in enumerate(old_scores)
+            },
+            new_terms,
+        )
+        self._invalidate()
+
+    def update_result(
+        self, game: Game, round_number: int | None = None
+    ) -> None:
+        """
+        Replace the result and handicap of an already added game.
+
+        The game is looked up in `round_number` (0-based), by default in the
+        latest round where its players met with the same colours. Games of
+        the last round are updated incrementally; for earlier rounds the
+        draw-ups and draw-downs of the following rounds depend on the
+        changed scores, so the repository is rebuilt.
+        """
+        store = self.store
+        store.thaw()
+        if round_number is None:
+            candidates = range(store.n_rounds - 1, -1, -1)
+        else:
+            candidates = [round_number]
+
+        black = store.index[game.black_id]
+        white = store.index[game.white_id]
+        for number in candidates:
+            games = range(
+                bisect_left(store.round, number),
+                bisect_right(store.round, number),
+            )
+            for g in games:
+                if (store.black[g], store.white[g]) == (black, white):
+                    break
+            else:
+                continue
+
+            if number == store.n_rounds - 1:
+                with phase(self.instrumentation, "scoring"):
+                    self._update_last_round_result(g, game)
+            else:
+                store.result[g] = RESULTS.index(game.result)
+                store.handicap[g] = game.handicap
+                version = self.version
+                self.__init__(self.players, self.rounds, self.instrumentation)
+                self.version = version + 1
+            return
+
+        raise ValueError(
+            f"Game {game.black_id} - {game.white_id} has not been played."
         )
 
-    def have_played(self, sp1: ScoredPlayer, sp2: ScoredPlayer):
-        return any(sg.opponent(sp1) == sp2 for sg in sp1.games)
+    def _update_last_round_result(self, g: int, game: Game) -> None:
+        store = self.store
+        players = (store.black[g], store.white[g])
+        old_scores = {i: store.score(i) for i in players}
+
+        for i in players:
+            store.half_points[i] -= store.game_half_points(g, i)
+            store.color_balance[i] -= store.game_color_balance(g, i)
+
+        store.result[g] = RESULTS.index(game.result)
+        store.handicap[g] = game.handicap
+
+        for i in players:
+            store.half_points[i] += store.game_half_points(g, i)
+            store.color_balance[i] += store.game_color_balance(g, i)
+
+        self._propagate(
+            {i: store.score(i) - old_scores[i] for i in players}, []
+        )
+        self._invalidate()
+
+    def _propagate(
+        self,
+        score_deltas: dict[int, int],
+        new_terms: list[tuple[int, int]],
+    ) -> None:
+        store = self.store
+        sos, sosos, dependents = store.sos, store.sosos, store.dependents
+        old_sos = sos[:]
+
+        for source, delta in score_deltas.items():
+            if delta:
+                for i in dependents[source]:
+                    sos[i] += delta
+        for i, source in new_terms:
+            sos[i] += store.score(source)
+
+        for source, (new, old) in enumerate(zip(sos, old_sos)):
+            if new != old:
+                for i in dependents[source]:
+                    sosos[i] += new - old
+        for i, source in new_terms:
+            sosos[i] += sos[source]
+            dependents[source].append(i)
+
+    def _invalidate(self) -> None:
+        self.version += 1
+        self._groups = None
+        self._snapshots.clear()
+        self._scored_games.clear()
+        self._sodos_cache = None
+
+    def _snapshot(self, i: int, round_number: int) -> ScoredPlayer:
+        """
+        Player `i` as it was before round `round_number`. Like in
+        `make_scored_players`, only the final state carries tiebreakers.
+        """
+        key = (i, round_number)
+        if key in self._snapshots:
+            return self._snapshots[key]
+
+        store = self.store
+        games = [
+            g for g in store.player_games[i] if store.round[g] < round_number
+        ]
+        final = round_number == store.n_rounds
+        sp = fast_construct(
+            ScoredPlayer,
+            player_id=store.player_ids[i],
+            rank=store.rank[i],
+            smms=store.smms[i],
+            is_bye=bool(store.is_bye[i]),
+            points=sum(store.game_half_points(g, i) for g in games) / 2,
+            skips=round_number - len(games),
+            draw_ups=sum(store.game_draw_ups(g, i) for g in games),
+            draw_downs=sum(store.game_draw_downs(g, i) for g in games),
+            sos=store.sos[i] if final else 0,
+            sosos=store.sosos[i] if final else 0,
+            sodos=self._sodos()[i] if final else 0,
+            games=[self._scored_game(g) for g in games],
+        )
+
+        self._snapshots[key] = sp
+        return sp
+
+    def _sodos(self) -> list[int]:
+        if self._sodos_cache is None:
+            self._sodos_cache = compute_tiebreakers(
+                self.store, [Criterion.SODOS]
+            )[Criterion.SODOS]
+        return self._sodos_cache
+
+    def _game(self, g: int) -> Game:
+        store = self.store
+        return fast_construct(
+            Game,
+            black_id=store.player_ids[store.black[g]],
+            white_id=store.player_ids[store.white[g]],
+            handicap=store.handicap[g],
+            result=store.game_result(g),
+        )
+
+    def _scored_game(self, g: int) -> ScoredGame:
+        if g not in self._scored_games:
+            store = self.store
+            self._scored_games[g] = fast_construct(
+                ScoredGame,
+                black=self._snapshot(store.black[g], store.round[g]),
+                white=self._snapshot(store.white[g], store.round[g]),
+                handicap=store.handicap[g],
+                result=store.game_result(g),
+            )
+        return self._scored_games[g]
+
+    def _rank_groups(self) -> dict[int, list[int]]:
+        """
+        Score groups from the highest score down, each with the store
+        indices of its players in group order. Cached until the next update.
+        """
+        if self._groups is not None:
+            return self._groups
+
+        store = self.store
+        members: dict[int, list[int]] = {}
+        for i in range(len(store)):
+            members.setdefault(store.score(i), []).append(i)
+
+        self._groups = {}
+        self._group_numbers = array("i", [0]) * len(store)
+        self._places = array("i", [0]) * len(store)
+        for group, score in enumerate(sorted(members, reverse=True)):
+            score_group = sorted(
+                members[score],
+                key=lambda i: (-store.mms(i), -store.rank[i]),
+                reverse=True,
+            )
+            self._groups[score] = score_group
+            for place, i in enumerate(score_group):
+                self._group_numbers[i] = group
+                self._places[i] = place
+
+        return self._groups
+
+    @property
+    def score_groups(self) -> list[int]:
+        return list(self._rank_groups())
+
+    def score_group_indices(self, score: int) -> list[int]:
+        """Store indices of the players of a score group, in group order."""
+        return self._rank_groups().get(score, [])
+
+    def group_of(self, player_id: str) -> int:
+        """Position of the player's score group in `score_groups`."""
+        self._rank_groups()
+        return self._group_numbers[self.store.index[player_id]]
+
+    def place_in_group(self, player_id: str) -> int:
+        self._rank_groups()
+        return self._places[self.store.index[player_id]]
+
+    def score_group(self, score: int) -> list[ScoredPlayer]:
+        return [
+            self._snapshot(i, self.store.n_rounds)
+            for i in self.score_group_indices(score)
+        ]
+
+    def have_played(self, sp1: ScoredPlayer, sp2: ScoredPlayer) -> bool:
+        store = self.store
+        i, j = store.index[sp1.player_id], store.index[sp2.player_id]
+        return j in store.opponents[i]
+
+    def adjacency_matrix(
+        self, player_ids: list[str] | None = None
+    ) -> "np.ndarray":
+        """
+        Boolean matrix of the games played between the given players, in
+        the given order; all players of the repository by default.
+        """
+        np = import_numpy()
+        store = self.store
+
+        black = np.frombuffer(store.black, dtype=np.intc)
+        white = np.frombuffer(store.white, dtype=np.intc)
+        played = np.zeros((len(store), len(store)), dtype=bool)
+        played[black, white] = True
+        played[white, black] = True
+
+        if player_ids is None:
+            return played
+        indices = [store.index[player_id] for player_id in player_ids]
+        return played[np.ix_(indices, indices)]
@@ -1,5 +1,11 @@
+from typing import TYPE_CHECKING
+
+from mmlib.compat import import_numpy
 from mmlib.constants import SeedingMode
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 def _sanitize_seeding_arguments(
     p1_idx: int,
@@ -61,3 +67,121 @@ def seeding_coefficient(
             return seeding_adjacent(p1_idx, p2_idx, size)
         case _:
             raise ValueError(f"Unknown seeding mode: {mode}")
+
+
+def seeding_ratio(
+    p1_idx: int,
+    p2_idx: int,
+    size: int,
+    mode: SeedingMode,
+) -> tuple[int, int]:
+    """`seeding_coefficient` as an exact (numerator, denominator) pair."""
+    p1_idx, p2_idx, size = _sanitize_seeding_arguments(p1_idx, p2_idx, size)
+    if size == 2:
+        return 1, 1
+
+    match mode:
+        case SeedingMode.CROSS:
+            distance = abs(2 * (p2_idx - p1_idx) - size)
+        case SeedingMode.FOLD:
+            distance = abs(p2_idx + p1_idx - size + 1)
+        case SeedingMode.ADJACENT:
+            distance = p2_idx - p1_idx - 1
+        case _:
+            raise ValueError(f"Unknown seeding mode: {mode}")
+    return size - 2 - distance, size - 2
+
+
+def _sanitize_seeding_arrays(
+    p1_idx: "np.ndarray",
+    p2_idx: "np.ndarray",
+    group_size: "np.ndarray",
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    np = import_numpy()
+    p1_idx, p2_idx, group_size = np.broadcast_arrays(
+        np.asarray(p1_idx), np.asarray(p2_idx), np.asarray(group_size)
+    )
+
+    if np.any(group_size < 2):
+        raise ValueError("`group_size` must be a greater or equal to 2.")
+
+    p1_idx, p2_idx = np.minimum(p1_idx, p2_idx), np.maximum(p1_idx, p2_idx)
+    group_size = group_size + group_size % 2
+
+    if np.any((p1_idx < 0) | (p1_idx >= group_size)):
+        raise ValueError("`p1_idx` must be between 0 and `group_size`-1.")
+
+    if np.any((p2_idx < 0) | (p2_idx >= group_size)):
+        raise ValueError("`p2_idx` must be between 0 and `group_size`-1.")
+
+    return p1_idx, p2_idx, group_size
+
+
+def seeding_cross_array(
+    p1_idx: "np.ndarray", p2_idx: "np.ndarray", size: "np.ndarray"
+) -> "np.ndarray":
+    np = import_numpy()
+    p1_idx, p2_idx, size = _sanitize_seeding_arrays(p1_idx, p2_idx, size)
+    denominator = np.where(size == 2, 1, size - 2)
+    result = 1 - np.abs(2 * (p2_idx - p1_idx) - size) / denominator
+    return np.where(size == 2, 1.0, result)
+
+
+def seeding_fold_array(
+    p1_idx: "np.ndarray", p2_idx: "np.ndarray", size: "np.ndarray"
+) -> "np.ndarray":
+    np = import_numpy()
+    p1_idx, p2_idx, size = _sanitize_seeding_arrays(p1_idx, p2_idx, size)
+    denominator = np.where(size == 2, 1, size - 2)
+    result = 1 - np.abs(p2_idx + p1_idx - size + 1) / denominator
+    return np.where(size == 2, 1.0, result)
+
+
+def seeding_adjacent_array(
+    p1_idx: "np.ndarray", p2_idx: "np.ndarray", size: "np.ndarray"
+) -> "np.ndarray":
+    np = import_numpy()
+    p1_idx, p2_idx, size = _sanitize_seeding_arrays(p1_idx, p2_idx, size)
+    denominator = np.where(size == 2, 1, size - 2)
+    result = 1 - (p2_idx - p1_idx - 1) / denominator
+    return np.where(size == 2, 1.0, result)
+
+
+def seeding_coefficient_array(
+    p1_idx: "np.ndarray",
+    p2_idx: "np.ndarray",
+    size: "np.ndarray",
+    mode: SeedingMode,
+) -> "np.ndarray":
+    match mode:
+        case SeedingMode.CROSS:
+            return seeding_cross_array(p1_idx, p2_idx, size)
+        case SeedingMode.FOLD:
+            return seeding_fold_array(p1_idx, p2_idx, size)
+        case SeedingMode.ADJACENT:
+            return seeding_adjacent_array(p1_idx, p2_idx, size)
+        case _:
+            raise ValueError(f"Unknown seeding mode: {mode}")
+
+
+def seeding_ratio_array(
+    p1_idx: "np.ndarray",
+    p2_idx: "np.ndarray",
+    size: "np.ndarray",
+    mode: SeedingMode,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    np = import_numpy()
+    p1_idx, p2_idx, size = _sanitize_seeding_arrays(p1_idx, p2_idx, size)
+
+    match mode:
+        case SeedingMode.CROSS:
+            distance = np.abs(2 * (p2_idx - p1_idx) - size)
+        case SeedingMode.FOLD:
+            distance = np.abs(p2_idx + p1_idx - size + 1)
+        case SeedingMode.ADJACENT:
+            distance = p2_idx - p1_idx - 1
+        case _:
+            raise ValueError(f"Unknown seeding mode: {mode}")
+    numerator = np.where(size == 2, 1, size - 2 - distance)
+    denominator = np.where(size == 2, 1, size - 2)
+    return numerator, denominator
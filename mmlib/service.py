@@ -0,0 +1,262 @@
+"""
+Pairing service speaking JSON lines on stdin and stdout.
+
+Every input line is a request:
+
+    {"id": 1, "tournament": {...}, "to_match": ["p1", "p2"]}
+
+`tournament` has the layout of a `Tournament`; `to_match` defaults to
+every player, with the bye only when the other players are odd. Every
+request gets one output line, in completion order:
+
+    {"id": 1, "games": [{"black_id": ...}, ...]}
+    {"id": 1, "error": "..."}
+
+Lines longer than `LINE_LIMIT` bytes are answered with an error. Standard
+input may be a pipe or a regular file.
+
+Run it with `python -m mmlib.service --workers 4`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+from collections.abc import AsyncIterable, AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, BinaryIO, Protocol
+
+from mmlib.batch import tournament_player_ids
+from mmlib.constants import CostEngine, MatchingBackend
+from mmlib.macmahon import MacMahon
+from mmlib.models import Tournament
+
+QUEUE_SIZE = 64
+LINE_LIMIT = 2**26
+
+
+class LineWriter(Protocol):
+    def write(self, data: bytes) -> None: ...
+
+    async def drain(self) -> None: ...
+
+
+class PairingService:
+    """
+    Serves pairing requests concurrently from one event loop.
+
+    Pairings run on `executor`, so the loop only reads, writes and
+    dispatches. Lines are read into a queue of `queue_size` requests; when
+    it is full the service stops reading until a request is taken, which
+    pushes back on the client. Identical requests in flight share one
+    pairing. Requests longer than `line_limit` bytes are not parsed.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        concurrency: int,
+        queue_size: int = QUEUE_SIZE,
+        engine: CostEngine = CostEngine.PYTHON,
+        backend: MatchingBackend = MatchingBackend.NETWORKX,
+        line_limit: int = LINE_LIMIT,
+    ):
+        self.executor = executor
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.line_limit = line_limit
+        self.engine = engine
+        self.backend = backend
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def serve(
+        self, reader: AsyncIterable[bytes], writer: LineWriter
+    ) -> None:
+        """
+        Answer every line of `reader`, e.g. a stream, until it ends.
+
+        If writing a response fails, e.g. because the client went away,
+        reading stops and the error is raised.
+        """
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(self.queue_size)
+        tasks = [
+            asyncio.create_task(self._read(reader, queue)),
+            *(
+                asyncio.create_task(self._work(queue, writer))
+                for _ in range(self.concurrency)
+            ),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def handle(self, line: bytes) -> dict[str, Any]:
+        """The response to one request line."""
+        if len(line.rstrip()) > self.line_limit:
+            return {
+                "id": None,
+                "error": f"Request longer than {self.line_limit} bytes.",
+            }
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+        except (ValueError, AttributeError):
+            return {"id": None, "error": "Malformed request."}
+
+        try:
+            games = await self.pair(
+                request["tournament"], request.get("to_match")
+            )
+        except Exception as e:
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+        return {"id": request_id, "games": games}
+
+    async def pair(
+        self, tournament: dict[str, Any], to_match: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        key = json.dumps([tournament, to_match], sort_keys=True)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                _pair,
+                key,
+                self.engine,
+                self.backend,
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key))
+        return await asyncio.shield(future)
+
+    async def _read(
+        self,
+        reader: AsyncIterable[bytes],
+        queue: "asyncio.Queue[bytes | None]",
+    ) -> None:
+        async for line in reader:
+            if line.strip():
+                await queue.put(line)
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def _work(
+        self, queue: "asyncio.Queue[bytes | None]", writer: LineWriter
+    ) -> None:
+        while (line := await queue.get()) is not None:
+            response = await self.handle(line)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+
+def _pair(
+    key: str, engine: CostEngine, backend: MatchingBackend
+) -> list[dict[str, Any]]:
+    # validation runs in the worker, not on the event loop
+    data, to_match = json.loads(key)
+    tournament = Tournament.model_validate(data)
+    if to_match is None:
+        to_match = tournament_player_ids(tournament)
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        engine=engine,
+        backend=backend,
+    )
+    return [game.model_dump(mode="json") for game in mm.make_pairing(to_match)]
+
+
+async def _read_lines(stream: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    # a line over the stream limit is cut just after the limit and the rest
+    # of it skipped, so that the service answers it with an error
+    while True:
+        try:
+            yield await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                yield e.partial
+            return
+        except asyncio.LimitOverrunError as e:
+            line = await stream.readexactly(e.consumed)
+            while True:
+                try:
+                    await stream.readuntil(b"\n")
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError as rest:
+                    await stream.readexactly(rest.consumed)
+            yield line
+
+
+async def _read_file_lines(file: BinaryIO, limit: int) -> AsyncIterator[bytes]:
+    # same as `_read_lines`, for a regular file, which cannot be watched by
+    # the event loop. Reading a file never blocks for long, so it is read
+    # in the loop: a worker forked while a thread holds the lock of stdin
+    # would deadlock closing it.
+    while line := file.readline(limit + 1):
+        rest = line
+        while len(rest) > limit and not rest.endswith(b"\n"):
+            rest = file.readline(limit + 1)
+        yield line
+
+
+async def _serve_stdio(service: PairingService) -> None:
+    loop = asyncio.get_running_loop()
+
+    lines: AsyncIterable[bytes]
+    if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        lines = _read_file_lines(sys.stdin.buffer, service.line_limit)
+    else:
+        reader = asyncio.StreamReader(service.line_limit)
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+        )
+        lines = _read_lines(reader)
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, sys.stdout
+    )
+    writer = asyncio.StreamWriter(transport, protocol, None, loop)
+
+    await service.serve(lines, writer)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--line-limit", type=int, default=LINE_LIMIT)
+    parser.add_argument(
+        "--engine",
+        type=CostEngine,
+        choices=list(CostEngine),
+        default=CostEngine.PYTHON,
+    )
+    parser.add_argument(
+        "--backend",
+        type=MatchingBackend,
+        choices=list(MatchingBackend),
+        default=MatchingBackend.NETWORKX,
+    )
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        service = PairingService(
+            executor,
+            concurrency=args.workers,
+            queue_size=args.queue_size,
+            engine=args.engine,
+            backend=args.backend,
+            line_limit=args.line_limit,
+        )
+        asyncio.run(_serve_stdio(service))
+
+
+if __name__ == "__main__":
+    main()
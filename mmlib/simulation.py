@@ -0,0 +1,194 @@
+"""
+Monte Carlo simulation of the remaining rounds of a tournament.
+
+A run resolves the pending games, i.e. the games of the last round still
+UNKNOWN but those against the bye, then plays `n_rounds` more rounds:
+each round is paired with `make_pairing`, its results are sampled with
+`win_probability` and the round is scored incrementally. The final
+standings of all runs are aggregated into a `SimulationReport`.
+"""
+
+import copy
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+
+from mmlib.batch import pending_games, tournament_player_ids
+from mmlib.constants import CostEngine, Criterion, GameResult, MatchingBackend
+from mmlib.executors import map_with_executor
+from mmlib.macmahon import MacMahon
+from mmlib.models import Game, Tournament, fast_copy
+from mmlib.scoring import ScoresRepository
+from mmlib.tiebreakers import DEFAULT_CRITERIA, standings
+
+RANK_SCALE = 1.6
+CHUNK_SIZE = 16
+
+
+def win_probability(
+    black_rank: int, white_rank: int, handicap: int, scale: float = RANK_SCALE
+) -> float:
+    """
+    Probability that black wins, logistic in the rank difference; every
+    handicap stone is worth one rank to black.
+    """
+    return 1 / (1 + math.exp((white_rank - black_rank - handicap) / scale))
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    """
+    `places[player_id][place]` counts the runs ending with the player at
+    `place`. `rounds` is the number of rounds simulated over all runs and
+    `seconds` the wall time they took.
+    """
+
+    runs: int
+    rounds: int
+    seconds: float
+    places: dict[str, Counter[int]]
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.seconds if self.seconds else math.inf
+
+    def probability(self, player_id: str, places: int = 1) -> float:
+        """Share of the runs where the player finished in the top `places`."""
+        counts = self.places[player_id]
+        top = sum(n for place, n in counts.items() if place <= places)
+        return top / self.runs
+
+    def expected_place(self, player_id: str) -> float:
+        counts = self.places[player_id]
+        return sum(place * n for place, n in counts.items()) / self.runs
+
+
+def simulate(
+    tournament: Tournament,
+    n_rounds: int,
+    runs: int,
+    seed: int = 0,
+    criteria: tuple[Criterion, ...] = DEFAULT_CRITERIA,
+    draw_probability: float = 0.0,
+    scale: float = RANK_SCALE,
+    engine: CostEngine = CostEngine.PYTHON,
+    backend: MatchingBackend = MatchingBackend.NETWORKX,
+    executor: Executor | None = None,
+    workers: int | None = None,
+    chunksize: int = CHUNK_SIZE,
+) -> SimulationReport:
+    """
+    Simulate `runs` completions of `tournament` with `n_rounds` more rounds.
+
+    Runs are split into chunks of `chunksize`; each chunk scores the
+    tournament once, copies that repository for each of its runs and
+    draws its results from its own `random.Random`, seeded from `seed`
+    and the chunk number. The report is therefore the same whether the
+    chunks run in this process, on `executor` or on a pool of `workers`
+    processes.
+    """
+    chunks = [
+        (k, min(chunksize, runs - start))
+        for k, start in enumerate(range(0, runs, chunksize))
+    ]
+    simulate_chunk = partial(
+        _simulate_chunk,
+        tournament,
+        n_rounds,
+        seed,
+        criteria,
+        draw_probability,
+        scale,
+        engine,
+        backend,
+    )
+
+    start = time.perf_counter()
+    results = map_with_executor(simulate_chunk, chunks, executor, workers)
+    seconds = time.perf_counter() - start
+
+    places: dict[str, Counter[int]] = {
+        p.player_id: Counter() for p in tournament.players if not p.is_bye
+    }
+    rounds = 0
+    for chunk_places, chunk_rounds in results:
+        rounds += chunk_rounds
+        for player_id, counts in chunk_places.items():
+            places[player_id] += counts
+    return SimulationReport(runs, rounds, seconds, places)
+
+
+def _simulate_chunk(
+    tournament: Tournament,
+    n_rounds: int,
+    seed: int,
+    criteria: tuple[Criterion, ...],
+    draw_probability: float,
+    scale: float,
+    engine: CostEngine,
+    backend: MatchingBackend,
+    chunk: tuple[int, int],
+) -> tuple[dict[str, Counter[int]], int]:
+    number, runs = chunk
+    rng = random.Random(f"{seed}:{number}")
+    base = ScoresRepository(tournament.players, tournament.games)
+    to_match = tournament_player_ids(tournament)
+    pending = pending_games(tournament.players, tournament.games)
+    last_round = len(tournament.games) - 1
+    sample = partial(
+        _sample_result,
+        base.store.rank,
+        base.store.index,
+        rng,
+        draw_probability,
+        scale,
+    )
+
+    places: dict[str, Counter[int]] = {}
+    rounds = 0
+    for _ in range(runs):
+        mm = MacMahon.from_scores(
+            copy.deepcopy(base), tournament.parameters, engine, backend
+        )
+        for game in pending:
+            mm.scores.update_result(sample(game), last_round)
+
+        for _ in range(n_rounds):
+            pairing = mm.make_pairing(to_match)
+            mm.scores.add_round([sample(game) for game in pairing])
+            rounds += 1
+
+        for standing in standings(mm.scores, criteria, engine):
+            counts = places.setdefault(standing.player_id, Counter())
+            counts[standing.place] += 1
+    return places, rounds
+
+
+def _sample_result(
+    rank: Sequence[int],
+    index: dict[str, int],
+    rng: random.Random,
+    draw_probability: float,
+    scale: float,
+    game: Game,
+) -> Game:
+    # games against a bye are scored without their result
+    p = win_probability(
+        rank[index[game.black_id]],
+        rank[index[game.white_id]],
+        game.handicap,
+        scale,
+    )
+    x = rng.random()
+    if x < draw_probability:
+        result = GameResult.DRAW
+    elif x < draw_probability + (1 - draw_probability) * p:
+        result = GameResult.BLACK_WINS
+    else:
+        result = GameResult.WHITE_WINS
+    return fast_copy(game, result=result)
@@ -0,0 +1,170 @@
+"""
+Binary snapshots of scored tournament state.
+
+A snapshot holds the columns of a `ScoreStore` as fixed-width arrays,
+including the SOS and SOSOS tiebreakers, so loading it replays nothing.
+Its layout is a header followed by aligned sections:
+
+    header      magic, format version, byte order, player, game and
+                round counts, and the byte sizes of the two blobs below
+    players     one array per player column, see `PLAYER_COLUMNS`
+    games       one array per game column, see `GAME_COLUMNS`
+    ids         offsets of the player ids in the id blob, n_players + 1
+    id blob     the player ids, UTF-8
+    parameters  the tournament parameters as JSON, possibly empty
+
+`load_snapshot` maps the file and the store columns are read-only views
+into it: nothing is copied until the repository is updated.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO
+
+from mmlib.models import Parameters, Tournament
+from mmlib.scoring import ScoresRepository
+from mmlib.store import GAME_COLUMNS, PLAYER_COLUMNS, ScoreStore
+
+MAGIC = b"MMLS"
+VERSION = 1
+HEADER = struct.Struct("<4sHcxIIIII")
+ALIGNMENT = 8
+
+_BYTE_ORDERS = {"little": b"<", "big": b">"}
+
+
+def save_snapshot(
+    scores: ScoresRepository,
+    path: str | os.PathLike,
+    parameters: Parameters | None = None,
+) -> None:
+    store = scores.store
+    ids = [player_id.encode() for player_id in store.player_ids]
+    offsets = array("i", [0])
+    for player_id in ids:
+        offsets.append(offsets[-1] + len(player_id))
+    id_blob = b"".join(ids)
+    parameters_blob = b""
+    if parameters is not None:
+        parameters_blob = parameters.model_dump_json().encode()
+
+    sections = [
+        *(getattr(store, name) for name in PLAYER_COLUMNS),
+        *(getattr(store, name) for name in GAME_COLUMNS),
+        offsets,
+        id_blob,
+        parameters_blob,
+    ]
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                _BYTE_ORDERS[sys.byteorder],
+                len(store),
+                store.n_games,
+                store.n_rounds,
+                len(id_blob),
+                len(parameters_blob),
+            )
+        )
+        _pad(f)
+        for section in sections:
+            f.write(section)
+            _pad(f)
+
+
+def load_snapshot(
+    path: str | os.PathLike,
+) -> tuple[ScoresRepository, Parameters | None]:
+    """
+    Repository and parameters saved by `save_snapshot`; the parameters
+    are None if none were saved.
+    """
+    with open(path, "rb") as f:
+        buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    if len(buffer) < HEADER.size:
+        raise ValueError("Not a snapshot: the file is too short.")
+    (
+        magic,
+        version,
+        byte_order,
+        n_players,
+        n_games,
+        n_rounds,
+        id_size,
+        parameters_size,
+    ) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a snapshot: wrong magic number.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}.")
+    swap = byte_order != _BYTE_ORDERS[sys.byteorder]
+
+    position = _aligned(HEADER.size)
+
+    def section(size: int) -> memoryview:
+        nonlocal position
+        if position + size > len(buffer):
+            raise ValueError("Truncated snapshot.")
+        view = buffer[position : position + size]
+        position = _aligned(position + size)
+        return view
+
+    def column(typecode: str, n: int) -> "memoryview | array":
+        view = section(n * array(typecode).itemsize).cast(typecode)
+        if not swap:
+            return view
+        copy = array(typecode, view)
+        copy.byteswap()
+        return copy
+
+    columns = {
+        name: column(typecode, n_players)
+        for name, typecode in PLAYER_COLUMNS.items()
+    }
+    columns |= {
+        name: column(typecode, n_games)
+        for name, typecode in GAME_COLUMNS.items()
+    }
+    offsets = column("i", n_players + 1)
+    id_blob = section(id_size)
+    player_ids = [
+        str(id_blob[start:end], "utf-8")
+        for start, end in zip(offsets, offsets[1:])
+    ]
+    parameters_blob = section(parameters_size)
+
+    store = ScoreStore.from_columns(player_ids, columns, n_rounds)
+    parameters = None
+    if parameters_size:
+        parameters = Parameters.model_validate_json(bytes(parameters_blob))
+    return ScoresRepository.from_store(store), parameters
+
+
+def save_tournament(tournament: Tournament, path: str | os.PathLike) -> None:
+    scores = ScoresRepository(tournament.players, tournament.games)
+    save_snapshot(scores, path, tournament.parameters)
+
+
+def load_tournament(path: str | os.PathLike) -> Tournament:
+    scores, parameters = load_snapshot(path)
+    if parameters is None:
+        raise ValueError("The snapshot has no tournament parameters.")
+    return Tournament(
+        players=scores.players,
+        games=scores.rounds,
+        parameters=parameters,
+    )
+
+
+def _aligned(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def _pad(f: BinaryIO) -> None:
+    f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
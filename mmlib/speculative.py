@@ -0,0 +1,149 @@
+import copy
+import itertools
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor
+from functools import partial
+
+from mmlib.batch import pending_games
+from mmlib.constants import CostEngine, GameResult, MatchingBackend
+from mmlib.executors import map_with_executor
+from mmlib.macmahon import MacMahon
+from mmlib.models import Game, Parameters, Player
+from mmlib.scoring import ScoresRepository
+
+DECISIVE = (GameResult.BLACK_WINS, GameResult.WHITE_WINS)
+MAX_SCENARIOS = 64
+CHUNK_SIZE = 4
+
+Scenario = tuple[GameResult, ...]
+
+
+class SpeculativePairing:
+    """
+    Pairings of the next round prepared before the last games end.
+
+    The games of the last round with an UNKNOWN result are pending, except
+    games against the bye, which are scored without their result. The
+    players and games are scored once into a base repository; `prepare`
+    pairs the scenarios, i.e. the first `limit` combinations of `outcomes`
+    of the pending games, on copies of it. Once the results are known,
+    `pairing` returns the cached pairing, pairing from scratch only on a
+    miss, e.g. for a draw.
+    """
+
+    def __init__(
+        self,
+        players: list[Player],
+        games: list[list[Game]],
+        parameters: Parameters,
+        to_match: list[str],
+        engine: CostEngine = CostEngine.PYTHON,
+        backend: MatchingBackend = MatchingBackend.NETWORKX,
+        outcomes: Sequence[GameResult] = DECISIVE,
+        limit: int = MAX_SCENARIOS,
+    ):
+        self.scores = ScoresRepository(players, games)
+        self.parameters = parameters
+        self.to_match = to_match
+        self.engine = engine
+        self.backend = backend
+        self.pending = [
+            (len(games) - 1, game) for game in pending_games(players, games)
+        ]
+        self.scenarios = list(
+            itertools.islice(
+                itertools.product(outcomes, repeat=len(self.pending)), limit
+            )
+        )
+        self.cache: dict[Scenario, list[Game]] = {}
+
+    def prepare(
+        self,
+        executor: Executor | None = None,
+        workers: int | None = None,
+        chunksize: int = CHUNK_SIZE,
+    ) -> None:
+        """
+        Pair every scenario and cache the pairings.
+
+        A chunk of scenarios is paired on one repository, built once:
+        consecutive scenarios differ in few results, which are updated
+        incrementally. By default all scenarios form one chunk paired in
+        this process; with `executor` or `workers` they are sent to
+        worker processes in chunks of `chunksize` scenarios.
+        """
+        if executor is None and workers is None:
+            chunks = [self.scenarios]
+        else:
+            chunks = [
+                self.scenarios[start : start + chunksize]
+                for start in range(0, len(self.scenarios), chunksize)
+            ]
+        pair_chunk = partial(
+            _pair_scenarios,
+            self.scores,
+            self.parameters,
+            self.to_match,
+            self.engine,
+            self.backend,
+            self.pending,
+        )
+
+        results = map_with_executor(pair_chunk, chunks, executor, workers)
+        for chunk, pairings in zip(chunks, results):
+            self.cache.update(zip(chunk, pairings))
+
+    def pairing(self, results: Iterable[Game]) -> list[Game]:
+        """
+        Pairing of the next round once the pending games have `results`.
+        """
+        played = {(game.black_id, game.white_id): game for game in results}
+        try:
+            final = [
+                played[game.black_id, game.white_id]
+                for _, game in self.pending
+            ]
+        except KeyError as e:
+            raise ValueError(f"No result for the pending game {e}.") from e
+
+        scenario = tuple(game.result for game in final)
+        if scenario not in self.cache:
+            self.cache[scenario] = _pair_scenarios(
+                self.scores,
+                self.parameters,
+                self.to_match,
+                self.engine,
+                self.backend,
+                self.pending,
+                [scenario],
+            )[0]
+        return self.cache[scenario]
+
+
+def _pair_scenarios(
+    scores: ScoresRepository,
+    parameters: Parameters,
+    to_match: list[str],
+    engine: CostEngine,
+    backend: MatchingBackend,
+    pending: list[tuple[int, Game]],
+    scenarios: list[Scenario],
+) -> list[list[Game]]:
+    # every chunk starts from its own copy of the base repository
+    mm = MacMahon.from_scores(
+        copy.deepcopy(scores), parameters, engine, backend
+    )
+    current = [game.result for _, game in pending]
+
+    pairings = []
+    for scenario in scenarios:
+        for k, ((round_number, game), result) in enumerate(
+            zip(pending, scenario)
+        ):
+            if current[k] != result:
+                mm.scores.update_result(
+                    game.model_copy(update={"result": result}), round_number
+                )
+                current[k] = result
+        pairings.append(mm.make_pairing(to_match))
+    return pairings
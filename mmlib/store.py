@@ -0,0 +1,191 @@
+from array import array
+from collections.abc import Sequence
+
+from mmlib.constants import GameResult
+from mmlib.models import Game, Player
+
+RESULTS = list(GameResult)
+
+# typecodes of the array columns, per player and per game
+PLAYER_COLUMNS = {
+    "rank": "i",
+    "smms": "i",
+    "is_bye": "b",
+    "half_points": "i",
+    "skips": "i",
+    "draw_ups": "i",
+    "draw_downs": "i",
+    "color_balance": "i",
+    "sos": "i",
+    "sosos": "i",
+}
+GAME_COLUMNS = {
+    "black": "i",
+    "white": "i",
+    "handicap": "i",
+    "result": "b",
+    "round": "i",
+    "black_score": "i",
+    "white_score": "i",
+}
+
+
+class ScoreStore:
+    """
+    Columnar scoring state of a tournament.
+
+    Players and games are addressed by their integer index. Each column is
+    an integer array: points are kept in half-point units, and each game
+    keeps the scores its players had before the round, so the draw-ups and
+    draw-downs of any earlier state can be recovered from the history.
+    """
+
+    def __init__(self, players: list[Player]):
+        n = len(players)
+
+        self.player_ids = [player.player_id for player in players]
+        self.index = {
+            player_id: i for i, player_id in enumerate(self.player_ids)
+        }
+        self.rank = array("i", [player.rank for player in players])
+        self.smms = array("i", [player.smms for player in players])
+        self.is_bye = array("b", [player.is_bye for player in players])
+
+        self.half_points = array("i", [0]) * n
+        self.skips = array("i", [0]) * n
+        self.draw_ups = array("i", [0]) * n
+        self.draw_downs = array("i", [0]) * n
+        self.color_balance = array("i", [0]) * n
+        self.sos = array("i", [0]) * n
+        self.sosos = array("i", [0]) * n
+        self.player_games = [array("i") for _ in range(n)]
+        self.opponents: list[set[int]] = [set() for _ in range(n)]
+        self.dependents = [array("i") for _ in range(n)]
+
+        self.black = array("i")
+        self.white = array("i")
+        self.handicap = array("i")
+        self.result = array("b")
+        self.round = array("i")
+        self.black_score = array("i")
+        self.white_score = array("i")
+        self.n_rounds = 0
+
+    @classmethod
+    def from_columns(
+        cls,
+        player_ids: list[str],
+        columns: dict[str, Sequence[int]],
+        n_rounds: int,
+    ) -> "ScoreStore":
+        """
+        Store over existing columns, e.g. read-only views of a snapshot.
+        Call `thaw` before changing it.
+        """
+        store = cls([])
+        store.player_ids = player_ids
+        store.index = {player_id: i for i, player_id in enumerate(player_ids)}
+        for name, column in columns.items():
+            setattr(store, name, column)
+        store.n_rounds = n_rounds
+
+        n = len(player_ids)
+        store.player_games = [array("i") for _ in range(n)]
+        store.opponents = [set() for _ in range(n)]
+        store.dependents = [array("i") for _ in range(n)]
+        for g, (black, white) in enumerate(zip(store.black, store.white)):
+            for i, opponent in ((black, white), (white, black)):
+                store.player_games[i].append(g)
+                store.opponents[i].add(opponent)
+                # the same terms as `ScoresRepository._add_round` adds
+                source = i if store.is_bye[opponent] else opponent
+                store.dependents[source].append(i)
+        return store
+
+    def thaw(self) -> None:
+        """Copy columns that are not arrays, e.g. views, into arrays."""
+        for name, typecode in {**PLAYER_COLUMNS, **GAME_COLUMNS}.items():
+            column = getattr(self, name)
+            if not isinstance(column, array):
+                copy = array(typecode)
+                copy.frombytes(memoryview(column).cast("B"))
+                setattr(self, name, copy)
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.black)
+
+    def score(self, i: int) -> int:
+        return self.smms[i] + (self.half_points[i] + self.skips[i]) // 2
+
+    def mms(self, i: int) -> int:
+        return self.smms[i] + self.half_points[i] // 2
+
+    def add_game(self, game: Game, round_number: int) -> int:
+        black = self.index[game.black_id]
+        white = self.index[game.white_id]
+
+        g = self.n_games
+        self.black.append(black)
+        self.white.append(white)
+        self.handicap.append(game.handicap)
+        self.result.append(RESULTS.index(game.result))
+        self.round.append(round_number)
+        self.black_score.append(self.score(black))
+        self.white_score.append(self.score(white))
+        self.player_games[black].append(g)
+        self.player_games[white].append(g)
+        self.opponents[black].add(white)
+        self.opponents[white].add(black)
+        return g
+
+    def game_result(self, g: int) -> GameResult:
+        return RESULTS[self.result[g]]
+
+    def opponent(self, g: int, i: int) -> int:
+        return self.white[g] if self.black[g] == i else self.black[g]
+
+    def game_half_points(self, g: int, i: int) -> int:
+        if self.is_bye[i]:
+            return 0
+
+        if self.is_bye[self.opponent(g, i)]:
+            return 2
+
+        match self.game_result(g):
+            case GameResult.WHITE_WINS if self.white[g] == i:
+                return 2
+            case GameResult.BLACK_WINS if self.black[g] == i:
+                return 2
+            case GameResult.DRAW:
+                return 1
+        return 0
+
+    def game_color_balance(self, g: int, i: int) -> int:
+        black, white = self.black[g], self.white[g]
+        if self.is_bye[black] or self.is_bye[white] or self.handicap[g]:
+            return 0
+
+        return -1 if black == i else 1
+
+    def game_draw_ups(self, g: int, i: int) -> int:
+        if self.is_bye[self.black[g]] or self.is_bye[self.white[g]]:
+            return 0
+
+        score, opponent_score = self._game_scores(g, i)
+        return int(score < opponent_score)
+
+    def game_draw_downs(self, g: int, i: int) -> int:
+        if self.is_bye[self.black[g]] or self.is_bye[self.white[g]]:
+            return 0
+
+        score, opponent_score = self._game_scores(g, i)
+        return int(score > opponent_score)
+
+    def _game_scores(self, g: int, i: int) -> tuple[int, int]:
+        if self.black[g] == i:
+            return self.black_score[g], self.white_score[g]
+        return self.white_score[g], self.black_score[g]
@@ -0,0 +1,357 @@
+import threading
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from mmlib.compat import import_numpy
+from mmlib.constants import CostEngine, Criterion, GameResult
+from mmlib.models import Game
+from mmlib.store import RESULTS, ScoreStore
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from mmlib.scoring import ScoresRepository
+
+DEFAULT_CRITERIA = (Criterion.MMS, Criterion.SOS, Criterion.SOSOS)
+
+_CUTS = {Criterion.SOSM1: 1, Criterion.SOSM2: 2}
+
+
+@dataclass(frozen=True)
+class Standing:
+    player_id: str
+    place: int
+    values: dict[Criterion, int]
+
+
+@dataclass(frozen=True)
+class Standings:
+    """Standings of the repository at `version`."""
+
+    version: int
+    criteria: tuple[Criterion, ...]
+    rows: tuple[Standing, ...]
+
+
+def standings(
+    scores: "ScoresRepository",
+    criteria: Iterable[Criterion] = DEFAULT_CRITERIA,
+    engine: CostEngine = CostEngine.PYTHON,
+) -> list[Standing]:
+    """
+    The field sorted by `criteria`, best first, without bye players.
+
+    Players equal on every criterion share a place. DC is computed among
+    the players tied on the criteria before it, so it may come anywhere
+    in the list.
+    """
+    criteria = list(criteria)
+    values = compute_tiebreakers(
+        scores.store, [c for c in criteria if c != Criterion.DC], engine
+    )
+    return _rank(scores.store, criteria, values)
+
+
+class StandingsBoard:
+    """
+    Standings kept up to date while results come in.
+
+    One writer applies results through the board; any number of threads
+    read `standings`, an immutable snapshot that is replaced, never
+    changed. A result of the last round only recomputes the two players,
+    the players whose SOS and SOSM contain their scores and the players
+    whose SOSOS contains those SOS; other updates recompute everything.
+    """
+
+    def __init__(
+        self,
+        scores: "ScoresRepository",
+        criteria: Iterable[Criterion] = DEFAULT_CRITERIA,
+        engine: CostEngine = CostEngine.PYTHON,
+    ):
+        self.scores = scores
+        self.criteria = tuple(criteria)
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._recompute()
+
+    @property
+    def standings(self) -> Standings:
+        return self._standings
+
+    def add_round(self, games: list[Game]) -> Standings:
+        with self._lock:
+            self.scores.add_round(games)
+            self._recompute()
+            return self._standings
+
+    def update_result(
+        self, game: Game, round_number: int | None = None
+    ) -> Standings:
+        with self._lock:
+            store = self.scores.store
+            self.scores.update_result(game, round_number)
+            if self.scores.store is not store:
+                # an earlier round: the repository was rebuilt
+                self._recompute()
+                return self._standings
+
+            players = {store.index[game.black_id], store.index[game.white_id]}
+            sos_changed = players | {
+                i for p in players for i in store.dependents[p]
+            }
+            affected = sos_changed | {
+                i for p in sos_changed for i in store.dependents[p]
+            }
+            ranked = [i for i in affected if not store.is_bye[i]]
+            for i in ranked:
+                del self._entries[bisect_left(self._entries, self._entry(i))]
+            for i in affected:
+                for criterion, value in player_tiebreakers(
+                    store, i, self._computed
+                ).items():
+                    self._values[criterion][i] = value
+            for i in ranked:
+                insort(self._entries, self._entry(i))
+
+            self._publish(affected)
+            return self._standings
+
+    @property
+    def _computed(self) -> list[Criterion]:
+        return [c for c in self.criteria if c != Criterion.DC]
+
+    def _entry(self, i: int) -> tuple[int, ...]:
+        """Sort key of player `i`: best first, then by index."""
+        return tuple(-self._values[c][i] for c in self._computed) + (i,)
+
+    def _recompute(self) -> None:
+        store = self.scores.store
+        self._values = compute_tiebreakers(store, self._computed, self.engine)
+        self._entries = sorted(
+            self._entry(i) for i in range(len(store)) if not store.is_bye[i]
+        )
+        self._rows: dict[int, Standing] = {}
+        self._publish(range(len(store)))
+
+    def _publish(self, changed: Iterable[int]) -> None:
+        """
+        Replace the snapshot. Rows of players whose values and place are
+        unchanged are reused.
+        """
+        store = self.scores.store
+        if Criterion.DC in self.criteria:
+            # DC depends on every tie, so the order is rebuilt
+            rows = _rank(store, self.criteria, self._values)
+        else:
+            changed = set(changed)
+            rows = []
+            for position, entry in enumerate(self._entries):
+                i, place = entry[-1], position + 1
+                if position and entry[:-1] == self._entries[position - 1][:-1]:
+                    place = rows[-1].place
+                row = self._rows.get(i)
+                if row is None or row.place != place or i in changed:
+                    row = self._rows[i] = Standing(
+                        player_id=store.player_ids[i],
+                        place=place,
+                        values={c: self._values[c][i] for c in self.criteria},
+                    )
+                rows.append(row)
+
+        self._standings = Standings(
+            version=self.scores.version,
+            criteria=self.criteria,
+            rows=tuple(rows),
+        )
+
+
+def compute_tiebreakers(
+    store: ScoreStore,
+    criteria: Iterable[Criterion],
+    engine: CostEngine = CostEngine.PYTHON,
+) -> dict[Criterion, list[int]]:
+    """
+    Values of `criteria` for every player, by store index.
+
+    SOS and SOSOS are kept up to date by the store. SODOS and the SOSM cuts
+    take one pass over the games, with NumPy for the NUMPY engine. DC only
+    exists within ties; see `standings`.
+    """
+    criteria = set(criteria)
+    if Criterion.DC in criteria:
+        raise ValueError("DC depends on ties; use `standings`.")
+
+    values = {}
+    if Criterion.MMS in criteria:
+        values[Criterion.MMS] = [store.mms(i) for i in range(len(store))]
+    if Criterion.SOS in criteria:
+        values[Criterion.SOS] = list(store.sos)
+    if Criterion.SOSOS in criteria:
+        values[Criterion.SOSOS] = list(store.sosos)
+
+    game_criteria = criteria & {Criterion.SODOS, *_CUTS}
+    if game_criteria:
+        match engine:
+            case CostEngine.PYTHON:
+                values |= _game_tiebreakers(store, game_criteria)
+            case CostEngine.NUMPY:
+                values |= _game_tiebreakers_numpy(store, game_criteria)
+            case _:
+                raise ValueError(f"Unknown cost engine: {engine}")
+
+    return values
+
+
+def _game_tiebreakers(
+    store: ScoreStore, criteria: set[Criterion]
+) -> dict[Criterion, list[int]]:
+    n = len(store)
+    scores = [store.score(i) for i in range(n)]
+    sodos = [0] * n
+    terms: list[list[int]] = [[] for _ in range(n)]
+
+    for g, (black, white) in enumerate(zip(store.black, store.white)):
+        for i, opponent in ((black, white), (white, black)):
+            term = scores[i if store.is_bye[opponent] else opponent]
+            terms[i].append(term)
+            if store.game_half_points(g, i) == 2:
+                sodos[i] += term
+
+    values = {}
+    if Criterion.SODOS in criteria:
+        values[Criterion.SODOS] = sodos
+    for criterion in criteria & _CUTS.keys():
+        cut = _CUTS[criterion]
+        values[criterion] = [
+            store.sos[i] - sum(sorted(terms[i])[:cut]) for i in range(n)
+        ]
+    return values
+
+
+def _game_tiebreakers_numpy(
+    store: ScoreStore, criteria: set[Criterion]
+) -> dict[Criterion, list[int]]:
+    np = import_numpy()
+    n = len(store)
+
+    def column(name: str, dtype: str) -> "np.ndarray":
+        return np.frombuffer(getattr(store, name), dtype=dtype).astype(
+            np.int64
+        )
+
+    is_bye = column("is_bye", "b").astype(bool)
+    scores = (
+        column("smms", "i")
+        + (column("half_points", "i") + column("skips", "i")) // 2
+    )
+
+    black, white = column("black", "i"), column("white", "i")
+    players = np.concatenate([black, white])
+    opponents = np.concatenate([white, black])
+    is_black = np.arange(len(players)) < len(black)
+    result = np.tile(column("result", "b"), 2)
+
+    terms = scores[np.where(is_bye[opponents], players, opponents)]
+    wins = ~is_bye[players] & (
+        is_bye[opponents]
+        | (is_black & (result == RESULTS.index(GameResult.BLACK_WINS)))
+        | (~is_black & (result == RESULTS.index(GameResult.WHITE_WINS)))
+    )
+
+    def sums(
+        mask: "np.ndarray", by: "np.ndarray", x: "np.ndarray"
+    ) -> "np.ndarray":
+        total = np.zeros(n, dtype=np.int64)
+        np.add.at(total, by[mask], x[mask])
+        return total
+
+    values = {}
+    if Criterion.SODOS in criteria:
+        values[Criterion.SODOS] = sums(wins, players, terms).tolist()
+
+    # terms sorted by player, then by value: the first ones of each player
+    # are its lowest
+    order = np.lexsort((terms, players))
+    players, terms = players[order], terms[order]
+    rank = np.arange(len(players)) - np.searchsorted(players, players)
+    sos = column("sos", "i")
+    for criterion in criteria & _CUTS.keys():
+        cut = rank < _CUTS[criterion]
+        values[criterion] = (sos - sums(cut, players, terms)).tolist()
+    return values
+
+
+def player_tiebreakers(
+    store: ScoreStore, i: int, criteria: Iterable[Criterion]
+) -> dict[Criterion, int]:
+    """Values of `criteria` for player `i` alone; DC is not supported."""
+    values = {}
+    terms = []
+    for g in store.player_games[i]:
+        opponent = store.opponent(g, i)
+        term = store.score(i if store.is_bye[opponent] else opponent)
+        terms.append((term, store.game_half_points(g, i) == 2))
+    terms.sort()
+
+    for criterion in criteria:
+        match criterion:
+            case Criterion.MMS:
+                values[criterion] = store.mms(i)
+            case Criterion.SOS:
+                values[criterion] = store.sos[i]
+            case Criterion.SOSOS:
+                values[criterion] = store.sosos[i]
+            case Criterion.SODOS:
+                values[criterion] = sum(term for term, won in terms if won)
+            case Criterion.SOSM1 | Criterion.SOSM2:
+                cut = terms[: _CUTS[criterion]]
+                values[criterion] = store.sos[i] - sum(t for t, _ in cut)
+            case _:
+                raise ValueError(f"Unsupported criterion: {criterion}")
+    return values
+
+
+def _rank(
+    store: ScoreStore,
+    criteria: Iterable[Criterion],
+    values: dict[Criterion, list[int]],
+) -> list[Standing]:
+    values = dict(values)
+    keys: list[tuple[int, ...]] = [() for _ in range(len(store))]
+    for criterion in criteria:
+        if criterion == Criterion.DC:
+            values[criterion] = _direct_confrontation(store, keys)
+        column = values[criterion]
+        keys = [key + (column[i],) for i, key in enumerate(keys)]
+
+    order = [i for i in range(len(store)) if not store.is_bye[i]]
+    order.sort(key=keys.__getitem__, reverse=True)
+
+    result = []
+    for position, i in enumerate(order):
+        place = position + 1
+        if position and keys[i] == keys[order[position - 1]]:
+            place = result[-1].place
+        result.append(
+            Standing(
+                player_id=store.player_ids[i],
+                place=place,
+                values={c: values[c][i] for c in criteria},
+            )
+        )
+    return result
+
+
+def _direct_confrontation(
+    store: ScoreStore, keys: list[tuple[int, ...]]
+) -> list[int]:
+    """Half points scored against players with the same key."""
+    dc = [0] * len(store)
+    for g, (black, white) in enumerate(zip(store.black, store.white)):
+        if keys[black] == keys[white]:
+            dc[black] += store.game_half_points(g, black)
+            dc[white] += store.game_half_points(g, white)
+    return dc
@@ -0,0 +1,46 @@
+import random
+
+from mmlib.constants import GameResult
+from mmlib.models import Game, Parameters, Player, Tournament
+
+RESULTS = [GameResult.WHITE_WINS, GameResult.BLACK_WINS, GameResult.DRAW]
+
+
+def make_tournament(
+    n_players: int,
+    n_rounds: int,
+    seed: int = 0,
+    parameters: Parameters | None = None,
+) -> Tournament:
+    rng = random.Random(seed)
+
+    players = []
+    for i in range(n_players):
+        rank = rng.randint(-20, 8)
+        players.append(
+            Player(player_id=f"p{i}", rank=rank, smms=max(rank, -10) + 10)
+        )
+    if n_players % 2:
+        players.append(Player(player_id="bye", is_bye=True))
+
+    games = []
+    player_ids = [player.player_id for player in players]
+    for _ in range(n_rounds):
+        rng.shuffle(player_ids)
+        games.append(
+            [
+                Game(
+                    black_id=player_ids[i],
+                    white_id=player_ids[i + 1],
+                    handicap=rng.choice([0, 0, 0, 2]),
+                    result=rng.choices(RESULTS, weights=[10, 10, 1])[0],
+                )
+                for i in range(0, len(player_ids), 2)
+            ]
+        )
+
+    return Tournament(
+        players=players,
+        games=games,
+        parameters=parameters or Parameters(hd_max=9),
+    )
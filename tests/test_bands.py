@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from mmlib.bands import make_bands, pair_band
+from mmlib.constants import CostEngine, GameResult, MatchingBackend
+from mmlib.context import PairingContext
+from mmlib.costs import CostModel
+from mmlib.macmahon import MacMahon
+from mmlib.models import Game, Parameters, Player
+from mmlib.scoring import ScoresRepository
+from tests.factories import make_tournament
+
+
+def make_context(tournament) -> PairingContext:
+    scores = ScoresRepository(tournament.players, tournament.games)
+    return PairingContext.from_scores(
+        scores, [p.player_id for p in tournament.players]
+    )
+
+
+@pytest.mark.parametrize("band_size", [2, 5, 16, 1000])
+@pytest.mark.parametrize("seed", range(3))
+def test_make_bands(seed, band_size):
+    tournament = make_tournament(61, 3, seed=seed)
+    ctx = make_context(tournament)
+
+    bands = make_bands(
+        ctx, CostModel(tournament.parameters), CostEngine.PYTHON, band_size
+    )
+
+    assert sorted(i for band in bands for i in band) == list(range(len(ctx)))
+    for band in bands:
+        assert len(band) % 2 == 0
+    for band, next_band in zip(bands, bands[1:]):
+        # bands only overlap by the floater of the shared score group
+        assert max(ctx.group[i] for i in band) <= min(
+            ctx.group[i] for i in next_band
+        )
+
+
+def test_make_bands_validates_band_size():
+    tournament = make_tournament(4, 0)
+
+    with pytest.raises(ValueError):
+        make_bands(
+            make_context(tournament),
+            CostModel(tournament.parameters),
+            CostEngine.PYTHON,
+            1,
+        )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_band_pairing_is_legal(seed):
+    tournament = make_tournament(120, 4, seed=seed)
+    ctx = make_context(tournament)
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+
+    pairs = mm._pair_bands(ctx, band_size=20)
+
+    assert pairs is not None
+    assert sorted(i for pair in pairs for i in pair) == list(range(len(ctx)))
+    for i, j in pairs:
+        assert j not in ctx.opponents[i]
+
+
+def test_band_falls_back_to_global_pairing():
+    players = [Player(player_id=f"p{i}", smms=10 - i // 4) for i in range(8)]
+    # the four top players have already played each other
+    games = [
+        [
+            Game(black_id="p0", white_id="p1", result=GameResult.DRAW),
+            Game(black_id="p2", white_id="p3", result=GameResult.DRAW),
+        ],
+        [
+            Game(black_id="p0", white_id="p2", result=GameResult.DRAW),
+            Game(black_id="p1", white_id="p3", result=GameResult.DRAW),
+        ],
+        [
+            Game(black_id="p0", white_id="p3", result=GameResult.DRAW),
+            Game(black_id="p1", white_id="p2", result=GameResult.DRAW),
+        ],
+    ]
+    mm = MacMahon(players, games, Parameters())
+    ctx = PairingContext.from_scores(mm.scores, [p.player_id for p in players])
+
+    top = [0, 1, 2, 3]
+    assert (
+        pair_band(
+            ctx.subset(top),
+            mm.costs,
+            CostEngine.PYTHON,
+            MatchingBackend.NETWORKX,
+        )
+        is None
+    )
+    assert mm._pair_bands(ctx, band_size=4) is None
+    assert mm.make_pairing(
+        [p.player_id for p in players], band_size=4
+    ) == mm.make_pairing([p.player_id for p in players])
+
+
+def test_band_pairing_in_process_pool():
+    tournament = make_tournament(80, 3, seed=1)
+    player_ids = [p.player_id for p in tournament.players]
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        backend=MatchingBackend.BLOSSOM,
+    )
+
+    expected = mm.make_pairing(player_ids, band_size=10)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert (
+            mm.make_pairing(player_ids, band_size=10, executor=executor)
+            == expected
+        )
+    assert mm.make_pairing(player_ids, band_size=10, workers=2) == expected
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mmlib.batch import pair_tournaments, tournament_player_ids
+from mmlib.constants import ColorTieBreak
+from mmlib.macmahon import MacMahon
+from mmlib.models import Parameters, Player, Tournament
+from tests.factories import make_tournament
+from tests.test_macmahon import get_input_paths, load_data
+
+
+def pair_one(tournament: Tournament):
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+    return mm.make_pairing(tournament_player_ids(tournament))
+
+
+@pytest.fixture
+def tournaments():
+    return [load_data(name)[0] for name in get_input_paths()] + [
+        make_tournament(n_players, 3, seed=n_players)
+        for n_players in (7, 12, 25)
+    ]
+
+
+def test_pair_tournaments(tournaments):
+    results = pair_tournaments(tournaments)
+
+    assert results == {
+        k: pair_one(tournament) for k, tournament in enumerate(tournaments)
+    }
+
+
+def test_pair_tournaments_mapping(tournaments):
+    divisions = {f"division {k}": t for k, t in enumerate(tournaments)}
+
+    results = pair_tournaments(divisions)
+
+    assert list(results) == list(divisions)
+    assert results["division 1"] == pair_one(tournaments[1])
+
+
+def test_pair_tournaments_executor(tournaments):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = pair_tournaments(tournaments, executor=executor, chunksize=2)
+
+    assert results == pair_tournaments(tournaments)
+
+
+def test_pair_tournaments_workers(tournaments):
+    results = pair_tournaments(tournaments, workers=2, chunksize=3)
+
+    assert results == pair_tournaments(tournaments)
+
+
+def test_pair_tournaments_color_tie_break(tournaments):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = pair_tournaments(
+            tournaments,
+            executor=executor,
+            color_tie_break=ColorTieBreak.HASH,
+        )
+
+    assert results == pair_tournaments(
+        tournaments, color_tie_break=ColorTieBreak.HASH
+    )
+    assert results != pair_tournaments(tournaments)
+
+
+def test_pair_tournaments_empty():
+    assert pair_tournaments([]) == {}
+
+
+def test_tournament_player_ids():
+    players = [Player(player_id=player_id) for player_id in "abc"]
+    bye = Player(player_id="bye", is_bye=True)
+
+    assert tournament_player_ids(
+        Tournament(players=players + [bye], games=[], parameters=Parameters())
+    ) == ["a", "b", "c", "bye"]
+    assert tournament_player_ids(
+        Tournament(
+            players=players[:2] + [bye], games=[], parameters=Parameters()
+        )
+    ) == ["a", "b"]
@@ -0,0 +1,85 @@
+import json
+
+from benchmarks import importtime
+from benchmarks.generator import make_tournament, present_players
+from benchmarks.run import main, run_benchmark
+from mmlib.constants import CostEngine, MatchingBackend
+from mmlib.scoring import ScoresRepository
+
+
+def test_generator_is_seeded():
+    assert make_tournament(31, 3, seed=1) == make_tournament(31, 3, seed=1)
+    assert make_tournament(31, 3, seed=1) != make_tournament(31, 3, seed=2)
+
+
+def test_generator_makes_valid_rounds():
+    tournament = make_tournament(51, 4)
+    player_ids = {player.player_id for player in tournament.players}
+
+    for round_games in tournament.games:
+        paired = [g.black_id for g in round_games]
+        paired += [g.white_id for g in round_games]
+        assert len(paired) == len(set(paired))
+        assert set(paired) <= player_ids
+
+    assert any(player.is_bye for player in tournament.players)
+    assert any(g.handicap for r in tournament.games for g in r)
+    assert len(present_players(tournament)) % 2 == 0
+    ScoresRepository(tournament.players, tournament.games)
+
+
+def test_run_benchmark():
+    result = run_benchmark(
+        20, 2, CostEngine.PYTHON, MatchingBackend.BLOSSOM, repeat=1
+    )
+
+    assert result["to_match"] == 20
+    assert result["edges"] == 190
+    assert set(result["phases"]) == {
+        "make_scored_players",
+        "scores_repository",
+        "scored_players",
+        "pairing_context",
+        "weights",
+        "matching",
+        "make_pairing",
+    }
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+
+    main(["--players", "10", "--rounds", "1", "2", "--repeat", "1"])
+    main(["--players", "10", "--repeat", "1", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert [r["players"] for r in report["results"]] == [10]
+
+
+def test_import_times():
+    times = importtime.import_times("mmlib.macmahon")
+
+    assert "mmlib.scoring" in times
+    assert times["mmlib.macmahon"][1] >= times["mmlib.scoring"][1]
+
+
+def test_macmahon_imports_lazily():
+    times = importtime.import_times("mmlib.macmahon")
+
+    assert "networkx" not in times
+    assert "numpy" not in times
+    assert "concurrent.futures" not in times
+
+
+def test_importtime_main_writes_json(tmp_path):
+    output = tmp_path / "importtime.json"
+
+    importtime.main(
+        ["--modules", "mmlib.models", "--repeat", "1", "--output", str(output)]
+    )
+
+    report = json.loads(output.read_text())
+    [result] = report["results"]
+    assert result["module"] == "mmlib.models"
+    assert result["cumulative_us"]["min"] > 0
+    assert len(result["heaviest_us"]) == importtime.HEAVIEST
@@ -0,0 +1,175 @@
+import itertools
+
+import pytest
+
+from mmlib.constants import (
+    CostArithmetic,
+    CostEngine,
+    FloatingMode,
+    SeedingMode,
+    Weight,
+)
+from mmlib.context import PairingContext
+from mmlib.costs import FIXED_POINT_SCALE, CostModel
+from mmlib.models import Parameters
+from mmlib.scoring import ScoresRepository
+from tests.factories import make_tournament
+from tests.test_macmahon import get_input_paths, load_data
+
+
+def make_context(tournament):
+    scores = ScoresRepository(tournament.players, tournament.games)
+    return PairingContext.from_scores(
+        scores, [p.player_id for p in tournament.players]
+    )
+
+
+def assert_cost_matrix_matches(
+    tournament, parameters, arithmetic=CostArithmetic.FLOAT
+):
+    np = pytest.importorskip("numpy")
+    ctx = make_context(tournament)
+    costs = CostModel(parameters, arithmetic)
+
+    matrix = costs.cost_matrix(ctx)
+
+    for i, j in itertools.combinations(range(len(ctx)), 2):
+        expected = costs.calculate_cost(ctx, i, j)
+        assert matrix[i, j] == expected
+        assert matrix[j, i] == expected
+    assert not np.diagonal(matrix).any()
+
+
+@pytest.mark.parametrize("arithmetic", list(CostArithmetic))
+@pytest.mark.parametrize("name", get_input_paths())
+def test_cost_matrix_fixtures(name, arithmetic):
+    tournament, _ = load_data(name)
+
+    assert_cost_matrix_matches(tournament, tournament.parameters, arithmetic)
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        Parameters(hd_max=9),
+        Parameters(
+            hd_bar=-5,
+            hd_adj=-1,
+            hd_max=4,
+            dudd_compensate=False,
+            float_up_mode=FloatingMode.TOP,
+            float_down_mode=FloatingMode.BOTTOM,
+            seeding_mode=SeedingMode.FOLD,
+        ),
+        Parameters(seeding_mode=SeedingMode.ADJACENT),
+    ],
+)
+def test_cost_matrix_random(seed, parameters):
+    tournament = make_tournament(41, 4, seed=seed)
+
+    assert_cost_matrix_matches(tournament, parameters)
+    assert_cost_matrix_matches(
+        tournament, parameters, CostArithmetic.FIXED_POINT
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        Parameters(hd_max=9),
+        Parameters(
+            hd_max=4,
+            dudd_compensate=False,
+            float_up_mode=FloatingMode.BOTTOM,
+            float_down_mode=FloatingMode.TOP,
+            seeding_mode=SeedingMode.FOLD,
+        ),
+    ],
+)
+def test_fixed_point_costs(seed, parameters):
+    ctx = make_context(make_tournament(41, 4, seed=seed))
+    costs = CostModel(parameters)
+    fixed = CostModel(parameters, CostArithmetic.FIXED_POINT)
+
+    for i, j in itertools.combinations(range(len(ctx)), 2):
+        cost = fixed.calculate_cost(ctx, i, j)
+        assert type(cost) is int
+        # the float costs are rounded to 1/16 at this magnitude
+        assert cost / FIXED_POINT_SCALE == pytest.approx(
+            costs.calculate_cost(ctx, i, j), abs=0.1
+        )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fixed_point_cost_matrix(seed):
+    np = pytest.importorskip("numpy")
+    ctx = make_context(make_tournament(41, 4, seed=seed))
+    fixed = CostModel(Parameters(hd_max=9), CostArithmetic.FIXED_POINT)
+
+    matrix = fixed.cost_matrix(ctx)
+
+    assert matrix.dtype == np.int64
+    assert matrix.max() < 2**59
+
+
+def test_fixed_point_rounds_to_nearest():
+    costs = CostModel(Parameters(), CostArithmetic.FIXED_POINT)
+
+    # 1/3 of the seeding weight in units of 1/1024
+    assert costs._scaled(1, 3, Weight.seeding_weight) == 1_706_666_667
+    assert costs._scaled(1, 2, Weight.color_weight) == 512_000_000
+
+
+def test_unknown_arithmetic():
+    with pytest.raises(ValueError, match="arithmetic"):
+        CostModel(Parameters(), "decimal")
+
+
+@pytest.mark.parametrize("radius", [None, 0, 1, 3])
+def test_make_edges(radius):
+    tournament = make_tournament(41, 4, seed=radius or 0)
+    ctx = make_context(tournament)
+    ctx.forbidden[3].add(17)
+    ctx.forbidden[17].add(3)
+    costs = CostModel(tournament.parameters)
+
+    dense = costs.make_weights(ctx, CostEngine.PYTHON)
+    edges = costs.make_edges(ctx, CostEngine.PYTHON, radius)
+
+    expected = [
+        (i, j, dense[i][j])
+        for i, j in itertools.combinations(range(len(ctx)), 2)
+        if j not in ctx.forbidden[i]
+        and (radius is None or abs(ctx.group[i] - ctx.group[j]) <= radius)
+    ]
+    assert edges == expected
+    assert dense[3][17] == 0
+
+
+@pytest.mark.parametrize("arithmetic", list(CostArithmetic))
+@pytest.mark.parametrize("radius", [None, 0, 1, 3])
+def test_make_edges_numpy(radius, arithmetic):
+    pytest.importorskip("numpy")
+    ctx = make_context(make_tournament(41, 4, seed=radius or 0))
+    ctx.forbidden[0].add(1)
+    ctx.forbidden[1].add(0)
+    costs = CostModel(Parameters(hd_max=4), arithmetic)
+
+    edges = costs.make_edges(ctx, CostEngine.PYTHON, radius)
+
+    assert costs.make_edges(ctx, CostEngine.NUMPY, radius) == edges
+
+
+@pytest.mark.parametrize("arithmetic", list(CostArithmetic))
+@pytest.mark.parametrize("seed", range(4))
+def test_cost_bound(seed, arithmetic):
+    ctx = make_context(make_tournament(41, 4, seed=seed))
+    costs = CostModel(Parameters(hd_max=9), arithmetic)
+
+    for i, j in itertools.combinations(range(len(ctx)), 2):
+        distance = abs(ctx.group[i] - ctx.group[j])
+        if distance:
+            bound = costs.cost_bound(ctx, distance)
+            assert costs.calculate_cost(ctx, i, j) <= bound
@@ -0,0 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from mmlib.executors import map_with_executor
+
+
+def test_map_with_executor():
+    items = list(range(10))
+    expected = [abs(-x) for x in items]
+
+    assert map_with_executor(abs, items) == expected
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert map_with_executor(abs, items, executor) == expected
+    assert map_with_executor(abs, items, workers=2) == expected
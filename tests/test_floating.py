@@ -4,7 +4,10 @@ from mmlib.constants import FloatingMode
 from mmlib.floating import (
     floating_bottom,
     floating_coefficient,
+    floating_coefficient_array,
     floating_middle,
+    floating_ratio,
+    floating_ratio_array,
     floating_top,
 )
 
@@ -97,3 +100,51 @@ def test_floating_coefficients(mode, place, group_size, expected):
         pytest.approx(floating_coefficient(mode, place, group_size), 0.01)
         == expected
     )
+
+
+@pytest.mark.parametrize("mode", list(FloatingMode))
+@pytest.mark.parametrize("group_size", range(1, 12))
+def test_floating_coefficient_array(mode, group_size):
+    np = pytest.importorskip("numpy")
+
+    places = np.arange(group_size)
+    result = floating_coefficient_array(mode, places, group_size)
+
+    for place, value in zip(places, result):
+        assert value == floating_coefficient(mode, int(place), group_size)
+
+
+def test_floating_coefficient_array_validates_arguments():
+    np = pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        floating_coefficient_array(FloatingMode.TOP, np.array([3]), 3)
+
+
+@pytest.mark.parametrize("mode", list(FloatingMode))
+@pytest.mark.parametrize("group_size", range(1, 12))
+def test_floating_ratio(mode, group_size):
+    for place in range(group_size):
+        numerator, denominator = floating_ratio(mode, place, group_size)
+        assert numerator / denominator == pytest.approx(
+            floating_coefficient(mode, place, group_size)
+        )
+
+
+@pytest.mark.parametrize("mode", list(FloatingMode))
+@pytest.mark.parametrize("group_size", range(1, 12))
+def test_floating_ratio_array(mode, group_size):
+    np = pytest.importorskip("numpy")
+
+    places = np.arange(group_size)
+    numerators, denominators = floating_ratio_array(mode, places, group_size)
+
+    for place, numerator, denominator in zip(places, numerators, denominators):
+        assert (numerator, denominator) == floating_ratio(
+            mode, int(place), group_size
+        )
+
+
+def test_floating_ratio_validates_arguments():
+    with pytest.raises(ValueError):
+        floating_ratio(FloatingMode.TOP, 3, 3)
@@ -0,0 +1,38 @@
+import pytest
+
+from mmlib.handicap import calculate_handicap, calculate_handicap_array
+
+
+@pytest.mark.parametrize(
+    "r1,r2,hd_bar,hd_adj,hd_max,expected",
+    [
+        (0, 0, 0, 0, 9, 0),
+        (0, 5, 0, 0, 9, 5),
+        (0, 5, 0, -1, 9, 4),
+        (-5, 0, 0, 0, 9, 0),
+        (-5, 0, -3, 0, 9, 3),
+        (0, 20, 0, 0, 9, 9),
+        (-1, 0, 0, -2, 9, 0),
+    ],
+)
+def test_calculate_handicap(r1, r2, hd_bar, hd_adj, hd_max, expected):
+    assert calculate_handicap(r1, r2, hd_bar, hd_adj, hd_max) == expected
+
+
+@pytest.mark.parametrize(
+    "hd_bar,hd_adj,hd_max", [(0, 0, 9), (-3, -1, 9), (2, 1, 4), (0, 0, 0)]
+)
+def test_calculate_handicap_array(hd_bar, hd_adj, hd_max):
+    np = pytest.importorskip("numpy")
+
+    ranks = np.arange(-25, 10)
+    r1, r2 = np.meshgrid(ranks, ranks, indexing="ij")
+    r1, r2 = np.minimum(r1, r2), np.maximum(r1, r2)
+
+    result = calculate_handicap_array(r1, r2, hd_bar, hd_adj, hd_max)
+
+    for (i, j), value in np.ndenumerate(result):
+        expected = calculate_handicap(
+            int(r1[i, j]), int(r2[i, j]), hd_bar, hd_adj, hd_max
+        )
+        assert value == expected
@@ -0,0 +1,103 @@
+import pytest
+
+from mmlib.constants import CostEngine, MatchingBackend
+from mmlib.costs import CostModel
+from mmlib.instrumentation import COST_COMPONENTS, Instrumentation
+from mmlib.macmahon import MacMahon
+from mmlib.scoring import ScoresRepository
+from tests.factories import make_tournament
+
+
+def make_macmahon(tournament, **kwargs) -> MacMahon:
+    return MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        **kwargs,
+    )
+
+
+def test_disabled_by_default():
+    mm = make_macmahon(make_tournament(10, 2))
+
+    assert mm.instrumentation is None
+    assert type(mm.costs) is CostModel
+
+
+@pytest.mark.parametrize("backend", list(MatchingBackend))
+def test_report(backend):
+    tournament = make_tournament(30, 3)
+    player_ids = [p.player_id for p in tournament.players]
+    instrumentation = Instrumentation()
+
+    mm = make_macmahon(
+        tournament, backend=backend, instrumentation=instrumentation
+    )
+    games = mm.make_pairing(player_ids)
+    report = instrumentation.report()
+
+    assert games == make_macmahon(tournament).make_pairing(player_ids)
+    assert set(report.timings) == {
+        "scoring",
+        "context",
+        "weights",
+        "matching",
+        "games",
+    }
+    n_pairs = len(player_ids) * (len(player_ids) - 1) // 2
+    assert report.edges == n_pairs
+    assert report.cost_calls == {name: n_pairs for name in COST_COMPONENTS}
+    if backend == MatchingBackend.BLOSSOM:
+        assert report.matching_iterations > 0
+    else:
+        assert report.matching_iterations == 0
+
+
+def test_report_numpy_engine():
+    pytest.importorskip("numpy")
+    tournament = make_tournament(30, 3)
+    player_ids = [p.player_id for p in tournament.players]
+    instrumentation = Instrumentation()
+
+    mm = make_macmahon(
+        tournament, engine=CostEngine.NUMPY, instrumentation=instrumentation
+    )
+    mm.make_pairing(player_ids)
+
+    n_pairs = len(player_ids) * (len(player_ids) - 1) // 2
+    assert instrumentation.report().cost_calls == {
+        name: n_pairs for name in COST_COMPONENTS
+    }
+
+
+def test_report_bands():
+    tournament = make_tournament(40, 3)
+    player_ids = [p.player_id for p in tournament.players]
+    instrumentation = Instrumentation()
+
+    mm = make_macmahon(
+        tournament,
+        backend=MatchingBackend.BLOSSOM,
+        instrumentation=instrumentation,
+    )
+    mm.make_pairing(player_ids, band_size=10)
+    report = instrumentation.report()
+
+    assert "bands" in report.timings
+    assert 0 < report.edges < len(player_ids) * (len(player_ids) - 1) // 2
+    assert report.matching_iterations > 0
+
+
+def test_scores_repository_and_reset():
+    tournament = make_tournament(10, 2)
+    instrumentation = Instrumentation()
+
+    scores = ScoresRepository(tournament.players, [], instrumentation)
+    scores.add_round(tournament.games[0])
+    assert set(instrumentation.report().timings) == {"scoring"}
+
+    instrumentation.reset()
+    report = instrumentation.report()
+    assert report.timings == {}
+    assert report.edges == 0
+    assert set(report.cost_calls.values()) == {0}
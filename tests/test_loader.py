@@ -0,0 +1,88 @@
+import io
+import json
+
+import pytest
+
+from mmlib.loader import load_scores
+from mmlib.macmahon import MacMahon
+from mmlib.scoring import ScoresRepository
+from tests.factories import make_tournament
+from tests.test_macmahon import (
+    assert_same_pairs,
+    get_input_paths,
+    load_data,
+    test_data_path,
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("name", get_input_paths())
+def test_load_scores(name, chunk_size):
+    tournament, _ = load_data(name)
+
+    scores, parameters = load_scores(
+        test_data_path / "input" / name, chunk_size=chunk_size
+    )
+
+    assert parameters == tournament.parameters
+    assert scores.rounds == tournament.games
+    assert scores.data == (
+        ScoresRepository(tournament.players, tournament.games).data
+    )
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_load_scores_pairing(name):
+    _, expected = load_data(name)
+    scores, parameters = load_scores(test_data_path / "input" / name)
+
+    mm = MacMahon.from_scores(scores, parameters)
+
+    assert_same_pairs(mm.make_pairing(list(scores.store.index)), expected)
+
+
+def test_load_scores_any_key_order():
+    tournament = make_tournament(15, 4, seed=2)
+    data = json.loads(tournament.model_dump_json())
+    reordered = {
+        "games": data["games"],
+        "extra": [1, {"a": 2.5}],
+        "parameters": data["parameters"],
+        "players": data["players"],
+    }
+
+    scores, parameters = load_scores(
+        io.StringIO(json.dumps(reordered, indent=2)), chunk_size=3
+    )
+
+    assert parameters == tournament.parameters
+    assert scores.data == (
+        ScoresRepository(tournament.players, tournament.games).data
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "[]",
+        '{"players": []',
+        '{"players": [], "parameters": {}} {}',
+        '{"players": [] "parameters": {}}',
+        '{"players": [{"player_id": "a"},]}',
+        '{"players": []}',
+        '{"parameters": {}}',
+    ],
+)
+def test_load_scores_invalid(text):
+    with pytest.raises(ValueError):
+        load_scores(io.StringIO(text), chunk_size=4)
+
+
+def test_load_scores_empty_tournament():
+    scores, _ = load_scores(
+        io.StringIO('{"players": [], "games": [], "parameters": {}}')
+    )
+
+    assert scores.data == {}
+    assert scores.rounds == []
@@ -1,10 +1,23 @@
+import itertools
 import json
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 from pathlib import Path
 
 import pytest
 
+from mmlib.constants import (
+    ColorTieBreak,
+    CostArithmetic,
+    CostEngine,
+    MatchingBackend,
+)
+from mmlib.context import PairingContext
 from mmlib.macmahon import MacMahon
-from mmlib.models import Game, Tournament
+from mmlib.models import Game, Parameters, Tournament
+from tests.factories import make_tournament
 
 test_data_path = Path(__file__).parent / "test_data"
 
@@ -24,6 +37,14 @@ def load_data(name: str) -> tuple[Tournament, list[Game]]:
         return tournament, games
 
 
+def assert_same_pairs(games: list[Game], expected: list[Game]) -> None:
+    # the colors of equal players depend on the orientation of the pair
+    expected_pairs = {frozenset((g.black_id, g.white_id)) for g in expected}
+    assert {frozenset((g.black_id, g.white_id)) for g in games} == (
+        expected_pairs
+    )
+
+
 @pytest.mark.parametrize("name", get_input_paths())
 def test_macmahon(name):
     tournament, expected = load_data(name)
@@ -32,3 +53,359 @@ def test_macmahon(name):
 
     for item in mm.make_pairing([p.player_id for p in tournament.players]):
         assert item in expected
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_macmahon_numpy_engine(name):
+    pytest.importorskip("numpy")
+    tournament, expected = load_data(name)
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        engine=CostEngine.NUMPY,
+    )
+
+    for item in mm.make_pairing([p.player_id for p in tournament.players]):
+        assert item in expected
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_macmahon_blossom_backend(name):
+    tournament, expected = load_data(name)
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        backend=MatchingBackend.BLOSSOM,
+    )
+
+    games = mm.make_pairing([p.player_id for p in tournament.players])
+
+    assert_same_pairs(games, expected)
+
+
+@pytest.mark.parametrize("band_size", [2, 4])
+@pytest.mark.parametrize("name", get_input_paths())
+def test_macmahon_bands(name, band_size):
+    tournament, expected = load_data(name)
+
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+    games = mm.make_pairing(
+        [p.player_id for p in tournament.players], band_size=band_size
+    )
+
+    assert_same_pairs(games, expected)
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2])
+@pytest.mark.parametrize("name", get_input_paths())
+def test_macmahon_sparse(name, radius):
+    tournament, expected = load_data(name)
+
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+    games = mm.make_pairing(
+        [p.player_id for p in tournament.players], radius=radius
+    )
+
+    assert_same_pairs(games, expected)
+
+
+@pytest.mark.parametrize("radius", [0, 1])
+def test_macmahon_sparse_widens_radius(radius):
+    tournament = make_tournament(41, 6, seed=4)
+    player_ids = [p.player_id for p in tournament.players]
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        backend=MatchingBackend.BLOSSOM,
+    )
+    games = mm.make_pairing(player_ids, radius=radius)
+
+    paired = {g.black_id for g in games} | {g.white_id for g in games}
+    assert paired == set(player_ids)
+    assert not any(
+        mm.scores.have_played(mm.scores[g.black_id], mm.scores[g.white_id])
+        for g in games
+    )
+    assert_same_pairs(games, mm.make_pairing(player_ids))
+
+
+def exact_cost(mm: MacMahon, games: list[Game]) -> Fraction:
+    player_ids = [p for g in games for p in (g.black_id, g.white_id)]
+    ctx = PairingContext.from_scores(mm.scores, player_ids)
+    return sum(
+        Fraction(mm.costs.calculate_cost(ctx, 2 * k, 2 * k + 1))
+        for k in range(len(games))
+    )
+
+
+@pytest.mark.parametrize("arithmetic", list(CostArithmetic))
+@pytest.mark.parametrize("backend", list(MatchingBackend))
+@pytest.mark.parametrize("seed", range(8))
+def test_macmahon_sparse_weight(seed, backend, arithmetic):
+    rng = random.Random(seed)
+    tournament = make_tournament(
+        rng.randrange(10, 80), rng.randint(1, 6), seed=seed
+    )
+    player_ids = [p.player_id for p in tournament.players]
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        backend=backend,
+        arithmetic=arithmetic,
+    )
+    dense = exact_cost(mm, mm.make_pairing(player_ids))
+
+    for radius in (0, 1, 2):
+        games = mm.make_pairing(player_ids, radius=radius)
+        sparse = exact_cost(mm, games)
+
+        assert 2 * len(games) == len(player_ids)
+        assert sparse == dense
+
+
+def test_macmahon_negative_radius():
+    tournament = make_tournament(10, 1)
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+
+    with pytest.raises(ValueError):
+        mm.make_pairing([p.player_id for p in tournament.players], radius=-1)
+
+
+def pairing_cost(mm: MacMahon, games: list[Game]) -> float:
+    player_ids = [p for g in games for p in (g.black_id, g.white_id)]
+    ctx = PairingContext.from_scores(mm.scores, player_ids)
+    return math.fsum(
+        mm.costs.calculate_cost(ctx, *sorted((2 * k, 2 * k + 1)))
+        for k in range(len(games))
+    )
+
+
+def test_macmahon_forbidden():
+    tournament = make_tournament(20, 3, seed=1)
+    player_ids = [p.player_id for p in tournament.players]
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+
+    game = mm.make_pairing(player_ids)[0]
+    forbidden = [(game.white_id, game.black_id)]
+    games = mm.make_pairing(player_ids, forbidden=forbidden)
+
+    assert {frozenset((g.black_id, g.white_id)) for g in games}.isdisjoint(
+        {frozenset(forbidden[0])}
+    )
+    assert len(games) == len(player_ids) // 2
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("edit", ["removed", "added", "forbidden"])
+def test_macmahon_repair(edit, seed):
+    tournament = make_tournament(40, 4, seed=seed)
+    player_ids = [p.player_id for p in tournament.players]
+    present, late = player_ids[:-2], player_ids[-2:]
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        backend=MatchingBackend.BLOSSOM,
+    )
+    previous = mm.make_pairing(present)
+    withdrawn = [previous[3].black_id, previous[3].white_id]
+    kwargs, to_match, forbidden = {}, present, []
+    match edit:
+        case "removed":
+            kwargs["removed"] = withdrawn
+            to_match = [p for p in present if p not in withdrawn]
+        case "added":
+            kwargs["added"] = late
+            to_match = present + late
+        case "forbidden":
+            forbidden = kwargs["forbidden"] = [tuple(withdrawn)]
+
+    games = mm.repair(previous, **kwargs)
+    expected = mm.make_pairing(to_match, forbidden=forbidden)
+
+    assert sorted(p for g in games for p in (g.black_id, g.white_id)) == (
+        sorted(to_match)
+    )
+    if edit != "added":
+        assert set(withdrawn) not in [{g.black_id, g.white_id} for g in games]
+    assert pairing_cost(mm, games) == pairing_cost(mm, expected)
+
+
+def test_macmahon_repair_chain():
+    tournament = make_tournament(30, 3, seed=7)
+    player_ids = [p.player_id for p in tournament.players]
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        backend=MatchingBackend.BLOSSOM,
+    )
+    games = mm.make_pairing(player_ids)
+    for game in games[:3]:
+        games = mm.repair(games, removed=[game.black_id, game.white_id])
+    forbidden = [(games[0].black_id, games[0].white_id)]
+    games = mm.repair(games, forbidden=forbidden)
+
+    to_match = [p for g in games for p in (g.black_id, g.white_id)]
+    assert pairing_cost(mm, games) == pairing_cost(
+        mm, mm.make_pairing(to_match, forbidden=forbidden)
+    )
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_macmahon_repair_from_scratch(name):
+    tournament, expected = load_data(name)
+    player_ids = [p.player_id for p in tournament.players]
+
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+
+    assert_same_pairs(mm.repair(expected), expected)
+    assert mm.repair(expected, removed=player_ids[:2]) == mm.make_pairing(
+        player_ids[2:]
+    )
+
+
+def test_color_tie_break_keeps_global_random_state():
+    tournament = make_tournament(30, 3, seed=24)
+    player_ids = [p.player_id for p in tournament.players]
+    random.seed(0)
+    state = random.getstate()
+
+    for color_tie_break in ColorTieBreak:
+        mm = MacMahon(
+            tournament.players,
+            tournament.games,
+            tournament.parameters,
+            color_tie_break=color_tie_break,
+        )
+        mm.make_pairing(player_ids)
+
+    assert random.getstate() == state
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_color_tie_break_hash(name):
+    tournament, expected = load_data(name)
+    player_ids = [p.player_id for p in tournament.players]
+
+    mm = MacMahon(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        color_tie_break=ColorTieBreak.HASH,
+    )
+    games = mm.make_pairing(player_ids)
+
+    assert_same_pairs(games, expected)
+    assert mm.make_pairing(player_ids[::-1]) == games
+
+
+def test_color_tie_break_hash_is_symmetric():
+    mm = MacMahon([], [], Parameters())
+    mm.color_tie_break = ColorTieBreak.HASH
+
+    pairs = [(f"p{i}", f"q{i}") for i in range(50)]
+    colors = [mm._break_color_tie(a, b) for a, b in pairs]
+
+    assert colors == [mm._break_color_tie(b, a) for a, b in pairs]
+    assert {black for black, _ in colors} & {a for a, _ in pairs}
+    assert {black for black, _ in colors} & {b for _, b in pairs}
+
+
+@pytest.mark.parametrize("color_tie_break", list(ColorTieBreak))
+def test_color_tie_break_in_threads(color_tie_break):
+    tournaments = [make_tournament(40, 3, seed=seed) for seed in range(8)]
+
+    def pair(tournament: Tournament) -> list[Game]:
+        mm = MacMahon(
+            tournament.players,
+            tournament.games,
+            tournament.parameters,
+            color_tie_break=color_tie_break,
+        )
+        return mm.make_pairing([p.player_id for p in tournament.players])
+
+    expected = [pair(tournament) for tournament in tournaments]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(3):
+            assert list(executor.map(pair, tournaments)) == expected
+
+
+@pytest.mark.parametrize("backend", list(MatchingBackend))
+@pytest.mark.parametrize("name", get_input_paths())
+def test_macmahon_fixed_point(name, backend):
+    tournament, _ = load_data(name)
+    player_ids = [p.player_id for p in tournament.players]
+
+    def pair(arithmetic: CostArithmetic) -> list[Game]:
+        mm = MacMahon(
+            tournament.players,
+            tournament.games,
+            tournament.parameters,
+            backend=backend,
+            arithmetic=arithmetic,
+        )
+        return mm.make_pairing(player_ids)
+
+    assert pair(CostArithmetic.FIXED_POINT) == pair(CostArithmetic.FLOAT)
+
+
+@pytest.mark.parametrize("engine", list(CostEngine))
+@pytest.mark.parametrize("seed", range(4))
+def test_macmahon_fixed_point_random(seed, engine):
+    if engine == CostEngine.NUMPY:
+        pytest.importorskip("numpy")
+    tournament = make_tournament(60, 4, seed=seed)
+    player_ids = [p.player_id for p in tournament.players]
+
+    def pair(arithmetic: CostArithmetic) -> tuple[MacMahon, list[Game]]:
+        mm = MacMahon(
+            tournament.players,
+            tournament.games,
+            tournament.parameters,
+            engine=engine,
+            backend=MatchingBackend.BLOSSOM,
+            arithmetic=arithmetic,
+        )
+        return mm, mm.make_pairing(player_ids)
+
+    fixed, games = pair(CostArithmetic.FIXED_POINT)
+    _, expected = pair(CostArithmetic.FLOAT)
+
+    assert games == expected
+    repaired = fixed.repair(games, removed=player_ids[:2])
+    assert pairing_cost(fixed, repaired) == pairing_cost(
+        fixed, fixed.make_pairing(player_ids[2:])
+    )
+
+
+@pytest.mark.parametrize(
+    "tournament",
+    [load_data(name)[0] for name in get_input_paths()]
+    + [make_tournament(25, 3, seed=seed) for seed in range(3)],
+)
+def test_macmahon_cost_terms_match_weights(tournament):
+    player_ids = [p.player_id for p in tournament.players]
+    mm = MacMahon(tournament.players, tournament.games, tournament.parameters)
+    ctx = PairingContext.from_scores(mm.scores, player_ids)
+
+    weights = mm.costs.make_weights(ctx, CostEngine.PYTHON)
+
+    for i, j in itertools.combinations(range(len(ctx)), 2):
+        sp1, sp2 = mm.scores[player_ids[i]], mm.scores[player_ids[j]]
+        cost = 1
+        cost += mm.unique_game_cost(sp1, sp2)
+        cost += mm.balance_color_cost(sp1, sp2)
+        cost += mm.score_difference_cost(sp1, sp2)
+        cost += mm.balance_seeding_cost(sp1, sp2)
+        assert weights[i][j] == cost
+        assert weights[i][j] == mm.calculate_cost(sp1.player_id, sp2.player_id)
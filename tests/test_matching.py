@@ -0,0 +1,190 @@
+import math
+import random
+
+import pytest
+
+from mmlib.constants import MatchingBackend
+from mmlib.context import PairingContext
+from mmlib.costs import CostModel
+from mmlib.matching import (
+    _repair_solver,
+    blossom_matching,
+    blossom_solve,
+    edge_matching,
+    max_weight_matching,
+    networkx_matching,
+    repair_matching,
+)
+from mmlib.scoring import ScoresRepository
+from tests.factories import make_tournament
+from tests.test_macmahon import get_input_paths, load_data
+
+
+def total_weight(weights, pairs) -> float:
+    return math.fsum(weights[i][j] for i, j in pairs)
+
+
+def assert_same_matching_weight(weights):
+    expected = networkx_matching(weights)
+    result = blossom_matching(weights)
+
+    assert len(result) == len(expected)
+    assert total_weight(weights, result) == total_weight(weights, expected)
+    matched = [v for pair in result for v in pair]
+    assert len(matched) == len(set(matched))
+
+
+def random_weights(n: int, seed: int, kind: str) -> list[list[float]]:
+    rng = random.Random(seed)
+    weights = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            match kind:
+                case "ties":
+                    w = rng.randint(1, 3)
+                case "float":
+                    w = rng.random() * 1000
+                case "sparse":
+                    w = rng.choice([0, 0, rng.randint(1, 100)])
+            weights[i][j] = weights[j][i] = w
+    return weights
+
+
+def cost_matrix(tournament):
+    scores = ScoresRepository(tournament.players, tournament.games)
+    ctx = PairingContext.from_scores(
+        scores, [p.player_id for p in tournament.players]
+    )
+    costs = CostModel(tournament.parameters)
+
+    weights = [[0] * len(ctx) for _ in range(len(ctx))]
+    for i in range(len(ctx)):
+        for j in range(i + 1, len(ctx)):
+            weights[i][j] = weights[j][i] = costs.calculate_cost(ctx, i, j)
+    return weights
+
+
+@pytest.mark.parametrize("kind", ["ties", "float", "sparse"])
+@pytest.mark.parametrize("seed", range(40))
+def test_blossom_random_weights(seed, kind):
+    n = random.Random(seed).randint(1, 30)
+
+    assert_same_matching_weight(random_weights(n, seed, kind))
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_blossom_fixtures(name):
+    tournament, _ = load_data(name)
+
+    assert_same_matching_weight(cost_matrix(tournament))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_players,n_rounds", [(20, 1), (51, 3), (80, 5)])
+def test_blossom_random_tournaments(n_players, n_rounds, seed):
+    tournament = make_tournament(n_players, n_rounds, seed=seed)
+
+    assert_same_matching_weight(cost_matrix(tournament))
+
+
+def test_blossom_numpy_weights():
+    np = pytest.importorskip("numpy")
+    weights = random_weights(12, 0, "float")
+
+    assert max_weight_matching(
+        np.array(weights), MatchingBackend.BLOSSOM
+    ) == blossom_matching(weights)
+
+
+@pytest.mark.parametrize("backend", list(MatchingBackend))
+@pytest.mark.parametrize("kind", ["float", "sparse"])
+@pytest.mark.parametrize("seed", range(10))
+def test_edge_matching(seed, kind, backend):
+    n = random.Random(seed).randint(1, 30)
+    weights = random_weights(n, seed, kind)
+    edges = [
+        (i, j, weights[i][j])
+        for i in range(n)
+        for j in range(i + 1, n)
+        if weights[i][j]
+    ]
+
+    assert edge_matching(n, edges, backend) == max_weight_matching(
+        weights, backend
+    )
+
+
+def test_blossom_edge_cases():
+    assert blossom_matching([]) == []
+    assert blossom_matching([[0]]) == []
+    assert blossom_matching([[0, 0], [0, 0]]) == []
+    assert blossom_matching([[0, 2.5], [2.5, 0]]) == [(0, 1)]
+
+
+@pytest.mark.parametrize("kind", ["ties", "float", "sparse"])
+@pytest.mark.parametrize("seed", range(20))
+def test_repair_matching(seed, kind):
+    rng = random.Random(seed)
+    n = 2 * rng.randint(2, 12)
+    weights = random_weights(n + 2, seed, kind)
+    pairs, state = blossom_solve([row[:n] for row in weights[:n]])
+
+    # drop two vertices, add the two last ones and forbid one edge
+    removed = rng.sample(range(n), 2)
+    keep = [i for i in range(n) if i not in removed]
+    new = keep + [n, n + 1]
+    new_weights = [[weights[i][j] for j in new] for i in new]
+    a, b = sorted(rng.sample(range(len(keep)), 2))
+    new_weights[a][b] = new_weights[b][a] = 0
+
+    updates = {(a, b): 0}
+    for j in range(len(keep), len(new)):
+        for i in range(j):
+            updates[i, j] = new_weights[i][j]
+    position = {k: i for i, k in enumerate(keep)}
+    mates = [-1] * len(new)
+    for i, j in pairs:
+        if i in position and j in position:
+            mates[position[i]], mates[position[j]] = position[j], position[i]
+
+    result = repair_matching(state, keep, 2, updates, mates)
+    expected = blossom_matching(new_weights)
+
+    if 2 * len(expected) != len(new):
+        assert result is None
+        return
+    repaired, new_state = result
+    assert total_weight(new_weights, repaired) == total_weight(
+        new_weights, expected
+    )
+
+    # a repaired state can be repaired again
+    result = repair_matching(
+        new_state, list(range(len(new))), 0, {}, new_state.mates
+    )
+    assert total_weight(new_weights, result[0]) == total_weight(
+        new_weights, expected
+    )
+
+
+@pytest.mark.parametrize("n_players,seed", [(98, 0), (98, 1), (198, 2)])
+def test_repair_frees_only_touched_vertices(n_players, seed):
+    weights = cost_matrix(make_tournament(n_players, 4, seed=seed))
+    pairs, state = blossom_solve(weights)
+    assert state.blossoms
+
+    # withdraw one player of each of two pairs
+    removed = [pairs[0][0], pairs[1][1]]
+    keep = [i for i in range(n_players) if i not in removed]
+    position = {k: i for i, k in enumerate(keep)}
+    mates = [position.get(state.mates[k], -1) for k in keep]
+
+    solver, _ = _repair_solver(state, keep, 0, {}, mates)
+    free = [u for u in range(1, solver.n + 1) if not solver.match[u]]
+    assert len(free) <= 2
+
+    repaired = solver.solve()
+    new_weights = [[weights[i][j] for j in keep] for i in keep]
+    assert total_weight(new_weights, repaired) == total_weight(
+        new_weights, blossom_matching(new_weights)
+    )
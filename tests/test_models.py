@@ -0,0 +1,65 @@
+from mmlib.constants import GameResult
+from mmlib.models import Game, Player, ScoredPlayer, fast_construct, fast_copy
+
+
+def test_fast_construct():
+    game = fast_construct(
+        Game,
+        black_id="a",
+        white_id="b",
+        handicap=2,
+        result=GameResult.DRAW,
+    )
+
+    assert game == Game(
+        black_id="a", white_id="b", handicap=2, result=GameResult.DRAW
+    )
+    assert game.model_dump() == {
+        "black_id": "a",
+        "white_id": "b",
+        "handicap": 2,
+        "result": GameResult.DRAW,
+    }
+
+
+def test_fast_copy():
+    sp = ScoredPlayer(player_id="a", rank=3, points=1.5)
+
+    copy = fast_copy(sp, skips=1, sos=4)
+
+    assert copy.model_dump() == {**sp.model_dump(), "skips": 1, "sos": 4}
+    assert copy.model_fields_set == {
+        "player_id",
+        "rank",
+        "points",
+        "skips",
+        "sos",
+    }
+    assert (sp.skips, sp.sos) == (0, 0)
+
+
+def test_fast_construct_fields_set():
+    game = fast_construct(Game, black_id="a", white_id="b", handicap=2)
+    validated = Game(black_id="a", white_id="b", handicap=2)
+
+    assert game == validated
+    assert game.model_dump(exclude_unset=True) == validated.model_dump(
+        exclude_unset=True
+    )
+    assert game.model_dump() == validated.model_dump()
+
+
+def test_from_player_fields_set():
+    player = Player(player_id="a", rank=3, smms=13)
+
+    sp = ScoredPlayer.from_player(player)
+    validated = ScoredPlayer(
+        player_id="a", rank=3, smms=13, is_bye=player.is_bye
+    )
+
+    assert sp.model_dump(exclude_unset=True) == validated.model_dump(
+        exclude_unset=True
+    )
+    assert sp.model_dump() == validated.model_dump()
+    # default factories give every model its own value
+    assert sp.games is not ScoredPlayer.from_player(player).games
@@ -1,8 +1,10 @@
+import pytest
 from faker import Faker
 
 from mmlib.constants import GameResult
 from mmlib.models import Game, Player
-from mmlib.scoring import make_scored_players
+from mmlib.scoring import ScoresRepository, make_scored_players
+from tests.factories import make_tournament
 
 fake = Faker()
 
@@ -107,3 +109,164 @@ def test_scoring_round_1():
     assert scored_players["p8"].color_balance == 1
     assert scored_players["p8"].draw_ups == 1
     assert scored_players["p8"].draw_downs == 0
+
+
+SCORED_FIELDS = [
+    "points",
+    "skips",
+    "score",
+    "draw_ups",
+    "draw_downs",
+    "color_balance",
+    "sos",
+    "sosos",
+    "sodos",
+]
+
+
+def test_scoring_bye():
+    players = [
+        Player(player_id="p1", rank=0, smms=6),
+        Player(player_id="p2", rank=0, smms=6),
+        Player(player_id="p3", rank=-1, smms=5),
+        Player(player_id="bye", is_bye=True),
+    ]
+    games = [
+        [
+            Game(black_id="p1", white_id="bye"),
+            Game(black_id="p2", white_id="p3", result=GameResult.BLACK_WINS),
+        ]
+    ]
+
+    scored_players = make_scored_players(players, games)
+
+    bye = scored_players["bye"]
+    assert bye.is_bye
+    assert bye.score == 0
+
+    # a game against the bye is a win without colour, counted in the SOS
+    # with the player's own score
+    p1 = scored_players["p1"]
+    assert p1.score == 7
+    assert p1.sos == 7
+    assert p1.sosos == 7
+    assert p1.color_balance == 0
+
+
+def assert_same_scores(scores: ScoresRepository, players, games):
+    expected = make_scored_players(players, games)
+
+    assert scores.data.keys() == expected.keys()
+    for player_id, sp in expected.items():
+        for field in SCORED_FIELDS:
+            assert getattr(scores[player_id], field) == getattr(sp, field)
+    assert scores.score_groups == sorted(
+        {sp.score for sp in expected.values()}, reverse=True
+    )
+
+
+@pytest.mark.parametrize("n_players", [8, 21, 50])
+def test_add_round_matches_full_recompute(n_players):
+    tournament = make_tournament(n_players, 6, seed=n_players)
+    scores = ScoresRepository(tournament.players, [])
+
+    for n_rounds, round_games in enumerate(tournament.games, 1):
+        scores.add_round(round_games)
+        assert_same_scores(
+            scores, tournament.players, tournament.games[:n_rounds]
+        )
+
+
+@pytest.mark.parametrize("round_number", [0, 3, 5])
+def test_update_result_matches_full_recompute(round_number):
+    tournament = make_tournament(21, 6, seed=round_number)
+    scores = ScoresRepository(tournament.players, tournament.games)
+
+    games = [list(round_games) for round_games in tournament.games]
+    for position, game in enumerate(games[round_number]):
+        result = (
+            GameResult.BLACK_WINS
+            if game.result != GameResult.BLACK_WINS
+            else GameResult.WHITE_WINS
+        )
+        games[round_number][position] = game.model_copy(
+            update={"result": result}
+        )
+        scores.update_result(games[round_number][position], round_number)
+
+        assert_same_scores(scores, tournament.players, games)
+
+
+def test_update_result_of_unknown_game():
+    scores = ScoresRepository(PLAYERS, [GAMES_ROUND_1])
+    game = Game(black_id="p1", white_id="p3", result=GameResult.DRAW)
+
+    with pytest.raises(ValueError):
+        scores.update_result(game)
+
+
+def test_materialized_snapshots_match_full_recompute():
+    tournament = make_tournament(21, 5, seed=1)
+    scores = ScoresRepository(tournament.players, tournament.games)
+    expected = make_scored_players(tournament.players, tournament.games)
+
+    for player_id, sp in expected.items():
+        games = scores[player_id].games
+        assert len(games) == len(sp.games)
+        for sg, expected_sg in zip(games, sp.games):
+            assert sg.handicap == expected_sg.handicap
+            assert sg.result == expected_sg.result
+            for side in ("black", "white"):
+                snapshot = getattr(sg, side)
+                expected_snapshot = getattr(expected_sg, side)
+                assert snapshot == expected_snapshot
+                for field in SCORED_FIELDS:
+                    assert getattr(snapshot, field) == getattr(
+                        expected_snapshot, field
+                    )
+
+
+def test_have_played():
+    scores = ScoresRepository(PLAYERS, [GAMES_ROUND_1])
+
+    assert scores.have_played(scores["p1"], scores["p2"])
+    assert scores.have_played(scores["p2"], scores["p1"])
+    assert not scores.have_played(scores["p1"], scores["p3"])
+
+
+def test_adjacency_matrix():
+    pytest.importorskip("numpy")
+    tournament = make_tournament(21, 5, seed=2)
+    scores = ScoresRepository(tournament.players, tournament.games)
+    player_ids = [p.player_id for p in reversed(tournament.players)]
+
+    played = scores.adjacency_matrix(player_ids)
+
+    for i, id1 in enumerate(player_ids):
+        for j, id2 in enumerate(player_ids):
+            assert played[i, j] == scores.have_played(scores[id1], scores[id2])
+    assert (scores.adjacency_matrix()[::-1, ::-1] == played).all()
+
+
+def assert_groups_match(scores: ScoresRepository):
+    for group, score in enumerate(scores.score_groups):
+        for place, sp in enumerate(scores.score_group(score)):
+            assert sp.score == score
+            assert scores.group_of(sp.player_id) == group
+            assert scores.place_in_group(sp.player_id) == place
+
+
+def test_score_groups_follow_updates():
+    tournament = make_tournament(21, 4, seed=3)
+    scores = ScoresRepository(tournament.players, tournament.games[:3])
+    assert_groups_match(scores)
+
+    scores.add_round(tournament.games[3])
+    assert_groups_match(scores)
+    assert scores.score_groups == sorted(
+        {scores[p.player_id].score for p in tournament.players}, reverse=True
+    )
+
+    game = tournament.games[3][0]
+    scores.update_result(game.model_copy(update={"result": GameResult.DRAW}))
+    assert_groups_match(scores)
@@ -1,6 +1,16 @@
 import pytest
 
-from mmlib.seeding import seeding_adjacent, seeding_cross, seeding_fold
+from mmlib.constants import SeedingMode
+from mmlib.seeding import (
+    seeding_adjacent,
+    seeding_coefficient,
+    seeding_coefficient_array,
+    seeding_cross,
+    seeding_cross_array,
+    seeding_fold,
+    seeding_ratio,
+    seeding_ratio_array,
+)
 
 
 @pytest.mark.parametrize(
@@ -115,3 +125,59 @@ def test_seeding_cross(p1_idx, p2_idx, group_size, expected):
         pytest.approx(seeding_cross(p1_idx, p2_idx, group_size), 0.01)
         == expected
     )
+
+
+@pytest.mark.parametrize("mode", list(SeedingMode))
+@pytest.mark.parametrize("group_size", range(2, 12))
+def test_seeding_coefficient_array(mode, group_size):
+    np = pytest.importorskip("numpy")
+
+    p1_idx, p2_idx = np.triu_indices(group_size, k=1)
+    result = seeding_coefficient_array(p1_idx, p2_idx, group_size, mode)
+
+    for p1, p2, value in zip(p1_idx, p2_idx, result):
+        assert value == seeding_coefficient(int(p1), int(p2), group_size, mode)
+        assert type(value.item()) is float
+
+
+def test_seeding_coefficient_array_validates_arguments():
+    np = pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        seeding_cross_array(np.array([0]), np.array([1]), np.array([1]))
+
+    with pytest.raises(ValueError):
+        seeding_cross_array(np.array([0]), np.array([6]), np.array([5]))
+
+
+@pytest.mark.parametrize("mode", list(SeedingMode))
+@pytest.mark.parametrize("group_size", range(2, 12))
+def test_seeding_ratio(mode, group_size):
+    for p1 in range(group_size):
+        for p2 in range(p1 + 1, group_size):
+            numerator, denominator = seeding_ratio(p1, p2, group_size, mode)
+            assert numerator / denominator == pytest.approx(
+                seeding_coefficient(p1, p2, group_size, mode)
+            )
+            assert seeding_ratio(p2, p1, group_size, mode) == (
+                numerator,
+                denominator,
+            )
+
+
+@pytest.mark.parametrize("mode", list(SeedingMode))
+@pytest.mark.parametrize("group_size", range(2, 12))
+def test_seeding_ratio_array(mode, group_size):
+    np = pytest.importorskip("numpy")
+
+    p1_idx, p2_idx = np.triu_indices(group_size, k=1)
+    numerators, denominators = seeding_ratio_array(
+        p1_idx, p2_idx, group_size, mode
+    )
+
+    for p1, p2, numerator, denominator in zip(
+        p1_idx, p2_idx, numerators, denominators
+    ):
+        assert (numerator, denominator) == seeding_ratio(
+            int(p1), int(p2), group_size, mode
+        )
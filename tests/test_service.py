@@ -0,0 +1,247 @@
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mmlib import service
+from mmlib.service import PairingService
+from tests.factories import make_tournament
+from tests.test_macmahon import get_input_paths, load_data
+
+
+class Writer:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data: bytes) -> None:
+        self.lines.append(json.loads(data))
+
+    async def drain(self) -> None:
+        pass
+
+
+async def lines(requests):
+    for request in requests:
+        yield json.dumps(request).encode() + b"\n"
+
+
+def request(request_id, tournament, **fields):
+    return {
+        "id": request_id,
+        "tournament": json.loads(tournament.model_dump_json()),
+        **fields,
+    }
+
+
+def serve(requests, **kwargs) -> list[dict]:
+    writer = Writer()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pairing_service = PairingService(executor, concurrency=2, **kwargs)
+        asyncio.run(pairing_service.serve(lines(requests), writer))
+    return sorted(writer.lines, key=lambda line: str(line["id"]))
+
+
+def test_service_pairs_fixtures():
+    data = {name: load_data(name) for name in get_input_paths()}
+
+    responses = serve(
+        request(
+            name,
+            tournament,
+            to_match=[p.player_id for p in tournament.players],
+        )
+        for name, (tournament, _) in data.items()
+    )
+
+    assert len(responses) == len(data)
+    for response in responses:
+        expected = data[response["id"]][1]
+        assert {
+            frozenset((g["black_id"], g["white_id"]))
+            for g in response["games"]
+        } == {frozenset((g.black_id, g.white_id)) for g in expected}
+
+
+def test_service_errors():
+    tournament = make_tournament(4, 1)
+
+    responses = serve(
+        [
+            request(1, tournament, to_match=["p0"]),
+            {"id": 2, "tournament": {"players": "nobody"}},
+            {"id": 3},
+            [1, 2],
+        ]
+    )
+
+    assert [r["id"] for r in responses] == [1, 2, 3, None]
+    assert all("error" in r and "games" not in r for r in responses)
+
+
+def test_service_deduplicates(monkeypatch):
+    calls = []
+    release = threading.Event()
+    pair = service._pair
+
+    def slow_pair(*args):
+        calls.append(args)
+        release.wait(5)
+        return pair(*args)
+
+    monkeypatch.setattr(service, "_pair", slow_pair)
+    tournament = make_tournament(10, 2)
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pairing_service = PairingService(executor, concurrency=4)
+            tasks = [
+                asyncio.create_task(
+                    pairing_service.handle(
+                        json.dumps(request(k, tournament)).encode()
+                    )
+                )
+                for k in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+    responses = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [r["id"] for r in responses] == [0, 1, 2]
+    assert responses[0]["games"] == responses[2]["games"]
+
+
+def test_service_back_pressure(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(service, "_pair", lambda *args: release.wait(5) and [])
+    read = 0
+
+    async def counting_lines():
+        nonlocal read
+        for k in range(20):
+            read += 1
+            yield json.dumps({"id": k, "tournament": {"k": k}}).encode()
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pairing_service = PairingService(
+                executor, concurrency=2, queue_size=3
+            )
+            task = asyncio.create_task(
+                pairing_service.serve(counting_lines(), Writer())
+            )
+            await asyncio.sleep(0.05)
+            blocked_at = read
+            release.set()
+            await task
+            return blocked_at
+
+    # two requests in progress, three queued and one waiting to be queued
+    assert asyncio.run(run()) == 6
+    assert read == 20
+
+
+def test_service_write_error():
+    class BrokenWriter(Writer):
+        async def drain(self) -> None:
+            raise BrokenPipeError
+
+    tournament = make_tournament(4, 1)
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pairing_service = PairingService(
+                executor, concurrency=1, queue_size=1
+            )
+            requests = [request(k, tournament) for k in range(10)]
+            await asyncio.wait_for(
+                pairing_service.serve(lines(requests), BrokenWriter()), 5
+            )
+
+    with pytest.raises(BrokenPipeError):
+        asyncio.run(run())
+
+
+def test_service_line_limit():
+    responses = serve(
+        [
+            request(1, make_tournament(4, 1)),
+            request(2, make_tournament(40, 4)),
+        ],
+        line_limit=1000,
+    )
+
+    assert responses[0]["id"] == 1
+    assert "games" in responses[0]
+    assert responses[1] == {
+        "id": None,
+        "error": "Request longer than 1000 bytes.",
+    }
+
+
+def test_service_stdio():
+    tournament = make_tournament(12, 2)
+    payload = json.dumps(request("a", tournament)) + "\n\n"
+    payload += json.dumps(request("b", tournament, to_match=["p0"])) + "\n"
+
+    result = subprocess.run(
+        [sys.executable, "-m", "mmlib.service", "--workers", "1"],
+        input=payload,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+    responses = {
+        line["id"]: line
+        for line in map(json.loads, result.stdout.splitlines())
+    }
+    assert len(responses["a"]["games"]) == 6
+    assert "error" in responses["b"]
+
+
+def test_service_stdio_long_lines(tmp_path):
+    payload = json.dumps(request("a", make_tournament(200, 10))) + "\n"
+    payload += json.dumps(request("b", make_tournament(4, 1))) + "\n"
+    # over the default limit of asyncio streams
+    assert len(payload) > 2**16
+    path = tmp_path / "requests.jsonl"
+    path.write_text(payload)
+    command = [sys.executable, "-m", "mmlib.service", "--workers", "1"]
+    command += ["--backend", "blossom"]
+
+    for limit in [[], ["--line-limit", "50000"]]:
+        # standard input as a pipe and as a regular file
+        with open(path) as file:
+            results = [
+                subprocess.run(
+                    command + limit,
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                    check=True,
+                    **stdin,
+                )
+                for stdin in [{"input": payload}, {"stdin": file}]
+            ]
+
+        for result in results:
+            responses = {
+                line["id"]: line
+                for line in map(json.loads, result.stdout.splitlines())
+            }
+            assert len(responses["b"]["games"]) == 2
+            if limit:
+                assert responses[None] == {
+                    "id": None,
+                    "error": "Request longer than 50000 bytes.",
+                }
+            else:
+                assert len(responses["a"]["games"]) == 100
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mmlib.constants import GameResult
+from mmlib.simulation import simulate, win_probability
+from tests.factories import make_tournament
+
+
+@pytest.fixture
+def tournament():
+    tournament = make_tournament(9, 2, seed=22)
+    played = [
+        game
+        for game in tournament.games[-1]
+        if "bye" not in (game.black_id, game.white_id)
+    ]
+    for game in played[:2]:
+        game.result = GameResult.UNKNOWN
+    return tournament
+
+
+def test_win_probability():
+    assert win_probability(0, 0, 0) == 0.5
+    assert win_probability(-3, 0, 3) == 0.5
+    assert win_probability(2, 0, 0) > win_probability(1, 0, 0) > 0.5
+    assert win_probability(0, 1, 0) == pytest.approx(
+        1 - win_probability(1, 0, 0)
+    )
+
+
+def test_simulate(tournament):
+    report = simulate(tournament, n_rounds=2, runs=10, chunksize=4)
+
+    assert report.runs == 10
+    assert report.rounds == 20
+    assert report.rounds_per_second > 0
+    assert set(report.places) == {f"p{i}" for i in range(9)}
+    for counts in report.places.values():
+        assert counts.total() == 10
+        assert all(1 <= place <= 9 for place in counts)
+    assert sum(report.probability(p) for p in report.places) >= 1
+    assert sum(report.probability(p, 9) for p in report.places) == 9
+    assert 1 <= report.expected_place("p0") <= 9
+
+
+def test_simulate_is_reproducible(tournament):
+    report = simulate(tournament, n_rounds=1, runs=6, seed=3, chunksize=2)
+
+    assert (
+        simulate(tournament, n_rounds=1, runs=6, seed=3, chunksize=2).places
+        == report.places
+    )
+    assert (
+        simulate(tournament, n_rounds=1, runs=6, seed=4, chunksize=2).places
+        != report.places
+    )
+
+
+def test_simulate_bye(tournament):
+    expected = simulate(tournament, n_rounds=1, runs=6, seed=5)
+    for games in tournament.games:
+        for game in games:
+            if "bye" in (game.black_id, game.white_id):
+                game.result = GameResult.UNKNOWN
+
+    # games against the bye are not resampled, so the draws are the same
+    report = simulate(tournament, n_rounds=1, runs=6, seed=5)
+
+    assert report.places == expected.places
+
+
+def test_simulate_executor(tournament):
+    expected = simulate(tournament, n_rounds=1, runs=6, chunksize=2)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = simulate(
+            tournament, n_rounds=1, runs=6, chunksize=2, executor=executor
+        )
+
+    assert report.places == expected.places
+
+
+def test_simulate_workers(tournament):
+    expected = simulate(tournament, n_rounds=1, runs=4, chunksize=2)
+
+    report = simulate(tournament, n_rounds=1, runs=4, chunksize=2, workers=2)
+
+    assert report.places == expected.places
+
+
+def test_simulate_does_not_change_input(tournament):
+    before = tournament.model_copy(deep=True)
+
+    simulate(tournament, n_rounds=1, runs=2)
+
+    assert tournament == before
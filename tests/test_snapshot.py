@@ -0,0 +1,92 @@
+import pytest
+
+from mmlib.macmahon import MacMahon
+from mmlib.scoring import ScoresRepository
+from mmlib.snapshot import (
+    load_snapshot,
+    load_tournament,
+    save_snapshot,
+    save_tournament,
+)
+from tests.factories import make_tournament
+from tests.test_macmahon import assert_same_pairs, get_input_paths, load_data
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_snapshot_round_trip(name, tmp_path):
+    tournament, expected = load_data(name)
+    scores = ScoresRepository(tournament.players, tournament.games)
+
+    save_snapshot(scores, tmp_path / "scores.bin", tournament.parameters)
+    loaded, parameters = load_snapshot(tmp_path / "scores.bin")
+
+    assert parameters == tournament.parameters
+    assert loaded.data == scores.data
+    assert loaded.players == tournament.players
+    assert loaded.rounds == tournament.games
+    assert loaded.score_groups == scores.score_groups
+
+    mm = MacMahon.from_scores(loaded, parameters)
+    assert_same_pairs(
+        mm.make_pairing([p.player_id for p in tournament.players]), expected
+    )
+
+
+@pytest.mark.parametrize("name", get_input_paths())
+def test_snapshot_tournament(name, tmp_path):
+    tournament, _ = load_data(name)
+
+    save_tournament(tournament, tmp_path / "tournament.bin")
+
+    assert load_tournament(tmp_path / "tournament.bin") == tournament
+
+
+def test_snapshot_updates(tmp_path):
+    tournament = make_tournament(30, 4, seed=3)
+    games = tournament.games
+    save_snapshot(
+        ScoresRepository(tournament.players, games[:3]), tmp_path / "s.bin"
+    )
+    loaded, parameters = load_snapshot(tmp_path / "s.bin")
+
+    assert parameters is None
+    loaded.add_round(games[3])
+    assert loaded.data == ScoresRepository(tournament.players, games).data
+
+    game = games[1][0].model_copy(update={"handicap": 5})
+    loaded.update_result(game, round_number=1)
+    assert loaded.data == (
+        ScoresRepository(
+            tournament.players,
+            [games[0], [game] + games[1][1:], *games[2:]],
+        ).data
+    )
+
+    save_snapshot(loaded, tmp_path / "again.bin")
+    assert load_snapshot(tmp_path / "again.bin")[0].data == loaded.data
+
+
+def test_snapshot_empty(tmp_path):
+    save_snapshot(ScoresRepository([], []), tmp_path / "empty.bin")
+
+    loaded, _ = load_snapshot(tmp_path / "empty.bin")
+
+    assert loaded.data == {}
+    assert loaded.rounds == []
+
+
+def test_snapshot_invalid(tmp_path):
+    tournament = make_tournament(10, 2)
+    save_tournament(tournament, tmp_path / "t.bin")
+    data = (tmp_path / "t.bin").read_bytes()
+
+    (tmp_path / "magic.bin").write_bytes(b"JSON" + data[4:])
+    (tmp_path / "truncated.bin").write_bytes(data[:-100])
+    (tmp_path / "short.bin").write_bytes(data[:10])
+    save_snapshot(ScoresRepository([], []), tmp_path / "no_parameters.bin")
+
+    for name in ("magic", "truncated", "short"):
+        with pytest.raises(ValueError):
+            load_snapshot(tmp_path / f"{name}.bin")
+    with pytest.raises(ValueError):
+        load_tournament(tmp_path / "no_parameters.bin")
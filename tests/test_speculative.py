@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mmlib.batch import tournament_player_ids
+from mmlib.constants import GameResult
+from mmlib.macmahon import MacMahon
+from mmlib.models import Tournament
+from mmlib.speculative import DECISIVE, SpeculativePairing
+from tests.factories import make_tournament
+
+
+@pytest.fixture
+def tournament():
+    tournament = make_tournament(20, 3, seed=21)
+    for game in tournament.games[-1][:3]:
+        game.result = GameResult.UNKNOWN
+    return tournament
+
+
+def speculate(tournament: Tournament, **kwargs) -> SpeculativePairing:
+    return SpeculativePairing(
+        tournament.players,
+        tournament.games,
+        tournament.parameters,
+        tournament_player_ids(tournament),
+        **kwargs,
+    )
+
+
+def finish(tournament: Tournament, scenario) -> list[list]:
+    games = [list(round_games) for round_games in tournament.games]
+    pending = [g for g in games[-1] if g.result == GameResult.UNKNOWN]
+    for game, result in zip(pending, scenario):
+        games[-1][games[-1].index(game)] = game.model_copy(
+            update={"result": result}
+        )
+    return games
+
+
+def pair(tournament: Tournament, games: list[list]):
+    mm = MacMahon(tournament.players, games, tournament.parameters)
+    return mm.make_pairing(tournament_player_ids(tournament))
+
+
+def test_speculative_scenarios(tournament):
+    speculative = speculate(tournament)
+
+    assert len(speculative.pending) == 3
+    assert len(speculative.scenarios) == 8
+    assert set(speculative.scenarios[0]) <= set(DECISIVE)
+
+
+def test_speculative_limit(tournament):
+    speculative = speculate(tournament, limit=5)
+
+    assert len(speculative.scenarios) == 5
+
+
+def test_speculative_prepare(tournament):
+    speculative = speculate(tournament)
+    speculative.prepare()
+
+    assert set(speculative.cache) == set(speculative.scenarios)
+    for scenario, pairing in speculative.cache.items():
+        assert pairing == pair(tournament, finish(tournament, scenario))
+
+
+def test_speculative_prepare_executor(tournament):
+    expected = speculate(tournament)
+    expected.prepare()
+
+    speculative = speculate(tournament)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        speculative.prepare(executor=executor, chunksize=3)
+
+    assert speculative.cache == expected.cache
+
+
+def test_speculative_prepare_workers(tournament):
+    expected = speculate(tournament, limit=4)
+    expected.prepare()
+
+    speculative = speculate(tournament, limit=4)
+    speculative.prepare(workers=2, chunksize=2)
+
+    assert speculative.cache == expected.cache
+
+
+def test_speculative_pairing(tournament):
+    speculative = speculate(tournament)
+    speculative.prepare()
+    scenario = speculative.scenarios[5]
+    games = finish(tournament, scenario)
+
+    pairing = speculative.pairing(games[-1])
+
+    assert pairing is speculative.cache[scenario]
+
+
+def test_speculative_pairing_miss(tournament):
+    speculative = speculate(tournament, limit=2)
+    speculative.prepare()
+    scenario = (GameResult.DRAW, GameResult.WHITE_WINS, GameResult.DRAW)
+    games = finish(tournament, scenario)
+
+    pairing = speculative.pairing(games[-1])
+
+    assert pairing == pair(tournament, games)
+    assert speculative.cache[scenario] is pairing
+
+
+def test_speculative_pairing_missing_result(tournament):
+    speculative = speculate(tournament)
+
+    with pytest.raises(ValueError, match="No result"):
+        speculative.pairing(tournament.games[-1][1:])
+
+
+def test_speculative_bye():
+    tournament = make_tournament(19, 3, seed=21)
+    for games in tournament.games:
+        for game in games:
+            if "bye" in (game.black_id, game.white_id):
+                game.result = GameResult.UNKNOWN
+    pending = [
+        game
+        for game in tournament.games[-1]
+        if "bye" not in (game.black_id, game.white_id)
+    ][:2]
+    for game in pending:
+        game.result = GameResult.UNKNOWN
+    speculative = speculate(tournament)
+    speculative.prepare()
+
+    assert [game for _, game in speculative.pending] == pending
+    assert len(speculative.scenarios) == 4
+
+    scenario = (GameResult.BLACK_WINS, GameResult.WHITE_WINS)
+    results = [
+        game.model_copy(update={"result": result})
+        for game, result in zip(pending, scenario)
+    ]
+    games = [list(round_games) for round_games in tournament.games]
+    for game, result in zip(pending, results):
+        games[-1][games[-1].index(game)] = result
+
+    pairing = speculative.pairing(results)
+
+    assert pairing is speculative.cache[scenario]
+    assert pairing == pair(tournament, games)
+
+
+def test_speculative_does_not_change_input(tournament):
+    before = tournament.model_copy(deep=True)
+    speculative = speculate(tournament)
+    speculative.prepare()
+
+    assert tournament == before
+    assert speculative.scores.rounds == tournament.games
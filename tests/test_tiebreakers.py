@@ -0,0 +1,204 @@
+import threading
+
+import pytest
+
+from mmlib.constants import CostEngine, Criterion, GameResult
+from mmlib.models import Game, Player
+from mmlib.scoring import ScoresRepository, make_scored_players
+from mmlib.tiebreakers import StandingsBoard, compute_tiebreakers, standings
+from tests.factories import make_tournament
+
+ALL_CRITERIA = [c for c in Criterion if c != Criterion.DC]
+
+PLAYERS = [
+    Player(player_id="a", smms=2),
+    Player(player_id="b", smms=2),
+    Player(player_id="c", smms=1),
+    Player(player_id="d", smms=0),
+    Player(player_id="e", smms=0),
+    Player(player_id="bye", is_bye=True),
+]
+GAMES = [
+    [
+        Game(black_id="a", white_id="c", result=GameResult.BLACK_WINS),
+        Game(black_id="b", white_id="d", result=GameResult.WHITE_WINS),
+        Game(black_id="e", white_id="bye"),
+    ],
+    [
+        Game(black_id="a", white_id="b", result=GameResult.WHITE_WINS),
+        Game(black_id="c", white_id="e", result=GameResult.DRAW),
+        Game(black_id="d", white_id="bye"),
+    ],
+]
+
+
+def test_compute_tiebreakers():
+    scores = ScoresRepository(PLAYERS, GAMES)
+    index = scores.store.index
+
+    values = compute_tiebreakers(scores.store, ALL_CRITERIA)
+
+    # final scores: a 3, b 3, c 1, d 2, e 1
+    assert values[Criterion.MMS][index["a"]] == 3
+    assert values[Criterion.SOS][index["a"]] == 1 + 3
+    assert values[Criterion.SODOS][index["a"]] == 1
+    assert values[Criterion.SOSM1][index["a"]] == 3
+    assert values[Criterion.SOSM2][index["a"]] == 0
+    assert values[Criterion.SOS][index["e"]] == 1 + 1
+    assert values[Criterion.SODOS][index["e"]] == 1
+    assert values[Criterion.SODOS][index["c"]] == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n_players", [9, 30])
+def test_tiebreakers_match_scored_players(n_players, seed):
+    tournament = make_tournament(n_players, 5, seed=seed)
+    scores = ScoresRepository(tournament.players, tournament.games)
+    expected = make_scored_players(tournament.players, tournament.games)
+
+    values = compute_tiebreakers(scores.store, ALL_CRITERIA)
+
+    for player_id, i in scores.store.index.items():
+        sp = expected[player_id]
+        assert values[Criterion.MMS][i] == sp.mms
+        assert values[Criterion.SOS][i] == sp.sos
+        assert values[Criterion.SOSOS][i] == sp.sosos
+        assert values[Criterion.SODOS][i] == sp.sodos
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tiebreakers_numpy_engine(seed):
+    pytest.importorskip("numpy")
+    tournament = make_tournament(40, 6, seed=seed)
+    store = ScoresRepository(tournament.players, tournament.games).store
+
+    assert compute_tiebreakers(
+        store, ALL_CRITERIA, CostEngine.NUMPY
+    ) == compute_tiebreakers(store, ALL_CRITERIA)
+
+
+def test_tiebreakers_numpy_engine_empty():
+    pytest.importorskip("numpy")
+    store = ScoresRepository(PLAYERS, []).store
+
+    assert compute_tiebreakers(
+        store, ALL_CRITERIA, CostEngine.NUMPY
+    ) == compute_tiebreakers(store, ALL_CRITERIA)
+
+
+def test_tiebreakers_dc():
+    scores = ScoresRepository(PLAYERS, GAMES)
+
+    with pytest.raises(ValueError):
+        compute_tiebreakers(scores.store, [Criterion.DC])
+
+
+def test_standings():
+    scores = ScoresRepository(PLAYERS, GAMES)
+
+    result = standings(scores, [Criterion.MMS, Criterion.DC])
+
+    assert [(s.player_id, s.place) for s in result] == [
+        ("b", 1),
+        ("a", 2),
+        ("d", 3),
+        ("c", 4),
+        ("e", 4),
+    ]
+    assert result[0].values == {Criterion.MMS: 3, Criterion.DC: 2}
+    assert result[3].values == {Criterion.MMS: 1, Criterion.DC: 1}
+
+
+def test_standings_default_criteria():
+    scores = ScoresRepository(PLAYERS, GAMES)
+
+    result = standings(scores)
+
+    # a and b are tied on MMS; b has the better SOS
+    assert [s.player_id for s in result] == ["b", "a", "d", "c", "e"]
+    assert all(
+        list(s.values) == [Criterion.MMS, Criterion.SOS, Criterion.SOSOS]
+        for s in result
+    )
+    assert "bye" not in [s.player_id for s in result]
+
+
+BOARD_CRITERIA = [
+    Criterion.MMS,
+    Criterion.SOS,
+    Criterion.SODOS,
+    Criterion.DC,
+    Criterion.SOSM1,
+    Criterion.SOSM2,
+    Criterion.SOSOS,
+]
+
+
+def flipped(game: Game) -> Game:
+    result = (
+        GameResult.BLACK_WINS
+        if game.result != GameResult.BLACK_WINS
+        else GameResult.WHITE_WINS
+    )
+    return game.model_copy(update={"result": result})
+
+
+@pytest.mark.parametrize(
+    "criteria", [BOARD_CRITERIA, [c for c in BOARD_CRITERIA if c != "dc"]]
+)
+@pytest.mark.parametrize("round_number", [2, 5])
+def test_standings_board_update_result(round_number, criteria):
+    tournament = make_tournament(25, 6, seed=round_number)
+    scores = ScoresRepository(tournament.players, tournament.games)
+    board = StandingsBoard(scores, criteria)
+
+    for game in tournament.games[round_number][:5]:
+        before = board.standings
+        after = board.update_result(flipped(game), round_number)
+
+        assert after is board.standings
+        assert after.version > before.version
+        assert list(after.rows) == standings(scores, criteria)
+
+
+def test_standings_board_add_round():
+    tournament = make_tournament(16, 3, seed=1)
+    board = StandingsBoard(
+        ScoresRepository(tournament.players, tournament.games[:2])
+    )
+    first = board.standings
+
+    board.add_round(tournament.games[2])
+
+    assert list(board.standings.rows) == standings(
+        ScoresRepository(tournament.players, tournament.games)
+    )
+    assert first.rows != board.standings.rows
+    assert first.version < board.standings.version
+
+
+def test_standings_board_concurrent_readers():
+    tournament = make_tournament(30, 4, seed=3)
+    scores = ScoresRepository(tournament.players, tournament.games)
+    board = StandingsBoard(scores, BOARD_CRITERIA)
+    expected = {board.standings.version: board.standings.rows}
+    stop = threading.Event()
+    seen = []
+
+    def read():
+        while not stop.is_set():
+            seen.append(board.standings)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for game in tournament.games[-1]:
+        result = board.update_result(flipped(game))
+        expected[result.version] = result.rows
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert seen
+    for snapshot in seen:
+        assert snapshot.rows == expected[snapshot.version]